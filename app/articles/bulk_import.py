@@ -0,0 +1,236 @@
+"""Offline bulk import of articles whose word counts are already known.
+
+Backfills go straight to the database instead of through POST /articles, so
+no page is fetched again. The input is CSV with a header row or JSON lines,
+one article per row with `url`, `word_count` and either `channel_name` or
+`channel_id`, which also reads files written by GET /articles/export:
+
+    python -m app.articles.bulk_import corpus.csv
+    python -m app.articles.bulk_import corpus.jsonl --create-channels
+
+URLs that are stored already or repeat within the input, compared in their
+canonical form, are skipped, as are rows with a missing field, a non-HTML URL
+or an unknown channel.
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+from typing import Callable, Dict, Iterator, Optional
+
+from sqlalchemy import DDL, text
+from sqlalchemy.orm.session import Session
+
+from app.articles.service import is_html_url
+from app.articles.urls import url_hash
+from app.database import Base, SessionLocal, engine
+from app.migrations import migrate
+from app.db_models import BULK_INSERT_TRIGGERS, Channel as DbChannel
+from app.schemas import ExportFormat
+from app.versions import ARTICLES, CHANNELS, bump_version
+
+IMPORT_CHUNK_SIZE = 20000
+COMMIT_EVERY_ROWS = 200000
+
+# OR IGNORE only matters when another writer stores one of the URLs while the
+# import runs, everything known before is filtered out in memory
+INSERT_ARTICLES_SQL = (
+    "INSERT OR IGNORE INTO articles (url, url_hash, word_count, channel_id) "
+    "VALUES (?, ?, ?, ?)"
+)
+INSERT_CHANNEL_SQL = "INSERT INTO channels (name) VALUES (?)"
+ARTICLE_URL_HASHES_SQL = "SELECT url_hash FROM articles WHERE url_hash IS NOT NULL"
+LAST_ARTICLE_ID_SQL = "SELECT COALESCE(MAX(id), 0) FROM articles"
+
+
+class ImportCounts:
+    __slots__ = ("read", "inserted", "existing", "invalid", "channels_created")
+
+    def __init__(self):
+        self.read = 0
+        self.inserted = 0
+        self.existing = 0
+        self.invalid = 0
+        self.channels_created = 0
+
+    def __repr__(self) -> str:
+        return ", ".join(f"{name}={getattr(self, name)}" for name in self.__slots__)
+
+
+def read_rows(path: str, import_format: ExportFormat) -> Iterator[Dict]:
+    """Stream the input file one row at a time."""
+    with open(path, newline="", encoding="utf-8") as import_file:
+        if import_format == ExportFormat.csv:
+            reader = csv.reader(import_file)
+            header = next(reader, ())
+            for row in reader:
+                yield dict(zip(header, row))
+            return
+        for line in import_file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def import_format_of(path: str) -> ExportFormat:
+    return ExportFormat.csv if path.lower().endswith(".csv") else ExportFormat.ndjson
+
+
+def bulk_import(
+    db_session: Session,
+    rows: Iterator[Dict],
+    create_channels: bool = False,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    commit_every: int = COMMIT_EVERY_ROWS,
+    progress: Optional[Callable[[ImportCounts], None]] = None,
+) -> ImportCounts:
+    """Insert `rows` as articles with `executemany`, committing periodically.
+
+    Channel names are resolved from a dict and existing URLs from a set of
+    canonical URL hashes, both loaded once, so the database only sees the
+    inserts. The per-row insert triggers of the word count bins and channel
+    summaries are dropped while a batch is written and the batch is added to
+    both in one statement each before the triggers are recreated, all in the
+    same transaction. `progress` is called with the running counts
+    after every commit.
+    """
+    counts = ImportCounts()
+    channels = dict(db_session.query(DbChannel.name, DbChannel.id))
+    channel_ids = set(channels.values())
+    known_hashes = {
+        row_hash
+        for (row_hash,) in db_session.connection().exec_driver_sql(
+            ARTICLE_URL_HASHES_SQL
+        )
+    }
+    chunk = list()
+    # ids of the articles stored before the open batch, None outside of one
+    after_id = None
+    uncommitted = 0
+
+    def begin_batch():
+        nonlocal after_id
+        # a write first, so the trigger is dropped inside the transaction
+        # and the write lock is held before the last id is read
+        bump_version(db_session, ARTICLES, CHANNELS)
+        connection = db_session.connection()
+        for trigger, _, _ in BULK_INSERT_TRIGGERS:
+            connection.exec_driver_sql(f"DROP TRIGGER {trigger}")
+        after_id = connection.exec_driver_sql(LAST_ARTICLE_ID_SQL).scalar()
+
+    def flush():
+        nonlocal uncommitted
+        if not chunk:
+            return
+        if after_id is None:
+            begin_batch()
+        result = db_session.connection().exec_driver_sql(INSERT_ARTICLES_SQL, chunk)
+        counts.inserted += result.rowcount
+        counts.existing += len(chunk) - result.rowcount
+        uncommitted += len(chunk)
+        chunk.clear()
+
+    def commit():
+        nonlocal after_id, uncommitted
+        flush()
+        if after_id is not None:
+            for _, create_trigger, catch_up in BULK_INSERT_TRIGGERS:
+                db_session.execute(text(catch_up), dict(after_id=after_id))
+                db_session.execute(DDL(create_trigger))
+        db_session.commit()
+        after_id = None
+        uncommitted = 0
+        if progress is not None:
+            progress(counts)
+
+    for row in rows:
+        counts.read += 1
+        url = row.get("url")
+        if not url or not is_html_url(url):
+            counts.invalid += 1
+            continue
+        row_hash = url_hash(url)
+        if row_hash in known_hashes:
+            counts.existing += 1
+            continue
+        try:
+            word_count = int(row["word_count"])
+            channel_name = row.get("channel_name")
+            if channel_name:
+                channel_id = channels.get(channel_name)
+                # only rows that will be inserted create channels, so the
+                # batch that stores them always bumps the versions
+                if channel_id is None and create_channels:
+                    channel_id = (
+                        db_session.connection()
+                        .exec_driver_sql(INSERT_CHANNEL_SQL, (channel_name,))
+                        .lastrowid
+                    )
+                    channels[channel_name] = channel_id
+                    channel_ids.add(channel_id)
+                    counts.channels_created += 1
+            else:
+                channel_id = int(row["channel_id"])
+        except (KeyError, TypeError, ValueError):
+            counts.invalid += 1
+            continue
+        if channel_id not in channel_ids:
+            counts.invalid += 1
+            continue
+        known_hashes.add(row_hash)
+        chunk.append((url, row_hash, word_count, channel_id))
+        if len(chunk) == chunk_size:
+            flush()
+            if uncommitted >= commit_every:
+                commit()
+    commit()
+    return counts
+
+
+def print_progress(started: float) -> Callable[[ImportCounts], None]:
+    def report(counts: ImportCounts):
+        rate = counts.read / max(time.perf_counter() - started, 1e-9)
+        print(f"{counts!r}, {rate:.0f} rows/s", file=sys.stderr, flush=True)
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="CSV or JSON lines file of articles")
+    parser.add_argument(
+        "--format",
+        choices=[import_format.value for import_format in ExportFormat],
+        help="input format, by default from the file extension",
+    )
+    parser.add_argument(
+        "--create-channels",
+        action="store_true",
+        help="create channels named in the input that do not exist yet",
+    )
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+    parser.add_argument("--commit-every", type=int, default=COMMIT_EVERY_ROWS)
+    args = parser.parse_args()
+
+    import_format = ExportFormat(args.format or import_format_of(args.path))
+    Base.metadata.create_all(bind=engine)
+    migrate(engine)
+    started = time.perf_counter()
+    db_session = SessionLocal()
+    try:
+        counts = bulk_import(
+            db_session,
+            read_rows(args.path, import_format),
+            create_channels=args.create_channels,
+            chunk_size=args.chunk_size,
+            commit_every=args.commit_every,
+            progress=print_progress(started),
+        )
+    finally:
+        db_session.close()
+    print(f"done in {time.perf_counter() - started:.1f} s: {counts!r}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
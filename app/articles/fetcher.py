@@ -0,0 +1,189 @@
+import codecs
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, NamedTuple, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.utils import get_encoding_from_headers
+
+from app import config
+from app.articles.page_cache import PageCache
+
+CHUNK_SIZE = 16 * 1024
+
+
+class FetchException(Exception):
+    pass
+
+
+class FetchedPage(NamedTuple):
+    chunks: Iterator[bytes]
+    encoding: str
+
+
+class HostLimiter:
+    """Caps concurrent requests and request rate (token bucket) for one host."""
+
+    def __init__(self, concurrency: int, rate: float, burst: int):
+        self._slots = threading.BoundedSemaphore(concurrency)
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take_token(self):
+        if self._rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._burst, self._tokens + (now - self._updated) * self._rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self._rate
+            time.sleep(wait)
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        with self._slots:
+            self._take_token()
+            yield
+
+
+class PooledFetcher:
+    """Shared HTTP client for article ingestion.
+
+    A single `requests.Session` keeps connections alive per host so that
+    repeated fetches from the same news site skip the TCP/TLS handshake, and
+    every host gets its own `HostLimiter` so one site is never hammered.
+    """
+
+    def __init__(
+        self,
+        pool_hosts: int,
+        per_host_concurrency: int,
+        per_host_rate: float,
+        per_host_burst: int,
+        connect_timeout: float,
+        read_timeout: float,
+        user_agent: str,
+        page_cache: Optional[PageCache] = None,
+    ):
+        self.page_cache = page_cache
+        self.per_host_concurrency = per_host_concurrency
+        self.per_host_rate = per_host_rate
+        self.per_host_burst = per_host_burst
+        self.timeout = (connect_timeout, read_timeout)
+        self._limiters: Dict[str, HostLimiter] = dict()
+        self._limiters_lock = threading.Lock()
+        self._session = requests.Session()
+        self._session.headers["User-Agent"] = user_agent
+        adapter = HTTPAdapter(
+            pool_connections=pool_hosts, pool_maxsize=per_host_concurrency
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    def _limiter(self, host: str) -> HostLimiter:
+        with self._limiters_lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                limiter = HostLimiter(
+                    concurrency=self.per_host_concurrency,
+                    rate=self.per_host_rate,
+                    burst=self.per_host_burst,
+                )
+                self._limiters[host] = limiter
+            return limiter
+
+    @contextmanager
+    def open(
+        self, url: str, headers: Optional[Dict[str, str]] = None
+    ) -> Iterator[requests.Response]:
+        """Streamed response, the host slot is held until the block exits."""
+        host = urlsplit(url).netloc.lower()
+        with self._limiter(host).slot():
+            try:
+                response = self._session.get(
+                    url, headers=headers, timeout=self.timeout, stream=True
+                )
+            except requests.RequestException as exc:
+                raise FetchException(str(exc)) from exc
+            try:
+                if response.status_code >= 400:
+                    raise FetchException(f"{url} answered {response.status_code}")
+                yield response
+            finally:
+                # returns the connection to the pool once the body is consumed
+                response.close()
+
+    @staticmethod
+    def iter_chunks(response: requests.Response) -> Iterator[bytes]:
+        try:
+            yield from response.iter_content(CHUNK_SIZE)
+        except requests.RequestException as exc:
+            raise FetchException(str(exc)) from exc
+
+    @staticmethod
+    def encoding(response: requests.Response) -> str:
+        # only trust an explicit charset, requests assumes latin-1 otherwise
+        if "charset" not in response.headers.get("Content-Type", "").lower():
+            return "utf-8"
+        encoding = get_encoding_from_headers(response.headers) or "utf-8"
+        try:
+            return codecs.lookup(encoding).name
+        except LookupError:
+            return "utf-8"
+
+    @contextmanager
+    def stream(self, url: str) -> Iterator[FetchedPage]:
+        """Page body as chunks, revalidated against the page cache if enabled."""
+        entry = self.page_cache.lookup(url) if self.page_cache else None
+        with self.open(url, headers=entry.validators() if entry else None) as response:
+            if entry and response.status_code == 304:
+                yield FetchedPage(self.page_cache.iter_chunks(entry), entry.encoding)
+                return
+            encoding = self.encoding(response)
+            chunks = self.iter_chunks(response)
+            if self.page_cache:
+                self.page_cache.record_miss()
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+                # without validators the copy could never be revalidated
+                if etag or last_modified:
+                    chunks = self.page_cache.store(
+                        url, chunks, etag, last_modified, encoding
+                    )
+            yield FetchedPage(chunks, encoding)
+
+    def get(self, url: str) -> bytes:
+        with self.stream(url) as page:
+            return b"".join(page.chunks)
+
+
+def _page_cache() -> Optional[PageCache]:
+    if not config.PAGE_CACHE_DIR:
+        return None
+    return PageCache(
+        directory=config.PAGE_CACHE_DIR, max_bytes=config.PAGE_CACHE_MAX_BYTES
+    )
+
+
+http_fetcher = PooledFetcher(
+    pool_hosts=config.FETCH_POOL_HOSTS,
+    per_host_concurrency=config.FETCH_PER_HOST_CONCURRENCY,
+    per_host_rate=config.FETCH_PER_HOST_RATE,
+    per_host_burst=config.FETCH_PER_HOST_BURST,
+    connect_timeout=config.FETCH_CONNECT_TIMEOUT,
+    read_timeout=config.FETCH_READ_TIMEOUT,
+    user_agent=config.FETCH_USER_AGENT,
+    page_cache=_page_cache(),
+)
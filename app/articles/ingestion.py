@@ -0,0 +1,374 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional
+from fastapi import status
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.session import Session
+
+from app import config
+from app import metrics
+from app.articles import service as ArticlesService
+from app.articles.urls import url_hash
+from app.database import SessionLocal
+from app.db_models import IngestionJob as DbIngestionJob
+from app.const import MAX_BATCH_SIZE
+from app.schemas import (
+    ArticleBatchItem,
+    ArticleCreate,
+    BatchItemStatus,
+    ExtractionMode,
+    IngestionJob as APIIngestionJob,
+    JobStatus,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionException(ArticlesService.ArticleException):
+    pass
+
+
+def _to_api_job(db_job: DbIngestionJob) -> APIIngestionJob:
+    return APIIngestionJob(
+        id=db_job.id,
+        url=db_job.url,
+        channel_id=db_job.channel_id,
+        status=db_job.status,
+        attempts=db_job.attempts,
+        last_error=db_job.last_error,
+        article_id=db_job.article_id,
+    )
+
+
+def _claimable(now: datetime):
+    # pending jobs that are due, plus running jobs whose worker died
+    # (crash, restart or another process) and never renewed the lease
+    return or_(
+        and_(
+            DbIngestionJob.status == JobStatus.pending.value,
+            DbIngestionJob.next_attempt_at <= now,
+        ),
+        and_(
+            DbIngestionJob.status == JobStatus.running.value,
+            DbIngestionJob.locked_until < now,
+        ),
+    )
+
+
+class IngestionPool:
+    """Fixed set of fetch workers consuming the durable `ingestion_jobs` table.
+
+    Jobs survive restarts because the queue is the database itself, and the
+    number of concurrent downloads is bounded by the number of workers
+    regardless of how many articles are submitted.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        max_attempts: int,
+        backoff_seconds: float,
+        poll_seconds: float,
+        lease_seconds: float,
+    ):
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+        self._threads: List[threading.Thread] = list()
+        self._stopping = threading.Event()
+        self._wakeup = threading.Condition()
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return bool(self._threads)
+
+    def start(self):
+        with self._lock:
+            if self._threads:
+                return
+            self._stopping.clear()
+            for index in range(self.workers):
+                thread = threading.Thread(
+                    target=self._run, name=f"ingestion-worker-{index}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None):
+        with self._lock:
+            self._stopping.set()
+            self.wake()
+            for thread in self._threads:
+                thread.join(timeout)
+            self._threads = list()
+
+    def wake(self):
+        with self._wakeup:
+            self._wakeup.notify_all()
+
+    def queue_depth(self) -> int:
+        db_session = SessionLocal()
+        try:
+            return (
+                db_session.query(DbIngestionJob)
+                .filter(
+                    DbIngestionJob.status.in_(
+                        (JobStatus.pending.value, JobStatus.running.value)
+                    )
+                )
+                .count()
+            )
+        finally:
+            db_session.close()
+
+    def drain(self, timeout: float = 30) -> bool:
+        """Block until every queued job is done or failed, mostly for tests."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.queue_depth() == 0:
+                return True
+            time.sleep(0.05)
+        return False
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                job_id = self._claim()
+            except Exception:
+                logger.exception("Could not claim an ingestion job")
+                job_id = None
+            if job_id is None:
+                with self._wakeup:
+                    self._wakeup.wait(self.poll_seconds)
+                continue
+            self._process(job_id)
+
+    def _claim(self) -> Optional[int]:
+        db_session = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            candidate = (
+                db_session.query(DbIngestionJob.id)
+                .filter(_claimable(now))
+                .order_by(DbIngestionJob.next_attempt_at, DbIngestionJob.id)
+                .first()
+            )
+            if candidate is None:
+                return None
+            # the conditional update is the actual lock: only one worker, in any
+            # process, sees a row count of 1 for a given job
+            claimed = (
+                db_session.query(DbIngestionJob)
+                .filter(DbIngestionJob.id == candidate.id, _claimable(now))
+                .update(
+                    {
+                        DbIngestionJob.status: JobStatus.running.value,
+                        DbIngestionJob.attempts: DbIngestionJob.attempts + 1,
+                        DbIngestionJob.locked_until: now
+                        + timedelta(seconds=self.lease_seconds),
+                        DbIngestionJob.updated_at: now,
+                    },
+                    synchronize_session=False,
+                )
+            )
+            db_session.commit()
+            return candidate.id if claimed else None
+        finally:
+            db_session.close()
+
+    def _process(self, job_id: int):
+        db_session = SessionLocal()
+        try:
+            db_job = (
+                db_session.query(DbIngestionJob)
+                .filter(DbIngestionJob.id == job_id)
+                .first()
+            )
+            started = time.perf_counter()
+            try:
+                article = ArticlesService.create_article(
+                    db_session=db_session,
+                    article_url=db_job.url,
+                    channel_id=db_job.channel_id,
+                    extraction_mode=db_job.extraction_mode,
+                )
+            except IntegrityError:
+                # duplicate URL or a channel deleted meanwhile, retrying won't help
+                db_session.rollback()
+                self._finish(
+                    db_job,
+                    JobStatus.failed,
+                    error="Article already exists or channel not found",
+                )
+            except Exception as exc:
+                db_session.rollback()
+                self._retry_or_fail(db_job, exc)
+            else:
+                self._finish(db_job, JobStatus.done, article_id=article.id)
+            outcome = (
+                "retried" if db_job.status == JobStatus.pending.value else db_job.status
+            )
+            metrics.ingestion_fetch_duration.labels(outcome).observe(
+                time.perf_counter() - started
+            )
+            metrics.ingestion_jobs.labels(outcome).inc()
+            db_session.commit()
+        except Exception:
+            db_session.rollback()
+            logger.exception("Could not process ingestion job %s", job_id)
+        finally:
+            db_session.close()
+
+    def _retry_or_fail(self, db_job: DbIngestionJob, exc: Exception):
+        error = str(getattr(exc, "detail", None) or exc)
+        if db_job.attempts >= self.max_attempts:
+            self._finish(db_job, JobStatus.failed, error=error)
+            return
+        delay = self.backoff_seconds * 2 ** (db_job.attempts - 1)
+        db_job.status = JobStatus.pending.value
+        db_job.last_error = error
+        db_job.locked_until = None
+        db_job.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
+
+    def _finish(
+        self,
+        db_job: DbIngestionJob,
+        job_status: JobStatus,
+        article_id: Optional[int] = None,
+        error: Optional[str] = None,
+    ):
+        db_job.status = job_status.value
+        db_job.article_id = article_id
+        db_job.last_error = error
+        db_job.locked_until = None
+
+
+ingestion_pool = IngestionPool(
+    workers=config.INGESTION_WORKERS,
+    max_attempts=config.INGESTION_MAX_ATTEMPTS,
+    backoff_seconds=config.INGESTION_BACKOFF_SECONDS,
+    poll_seconds=config.INGESTION_POLL_SECONDS,
+    lease_seconds=config.INGESTION_LEASE_SECONDS,
+)
+metrics.ingestion_queue_depth.set_function(ingestion_pool.queue_depth)
+
+
+def enqueue_article(
+    db_session: Session,
+    article_url: str,
+    channel_id: int,
+    extraction_mode: Optional[ExtractionMode] = None,
+) -> APIIngestionJob:
+    db_job = DbIngestionJob(
+        url=article_url,
+        channel_id=channel_id,
+        extraction_mode=extraction_mode.value if extraction_mode else None,
+    )
+    db_session.add(db_job)
+    db_session.commit()
+    db_session.refresh(db_job)
+    # started lazily so scripts and tests that never call the startup hook
+    # still get their jobs processed
+    ingestion_pool.start()
+    ingestion_pool.wake()
+    return _to_api_job(db_job)
+
+
+def enqueue_articles(
+    db_session: Session, new_articles: List[ArticleCreate]
+) -> List[ArticleBatchItem]:
+    if not new_articles or len(new_articles) > MAX_BATCH_SIZE:
+        raise IngestionException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Batch must contain between 1 and {MAX_BATCH_SIZE} articles",
+        )
+    items = [
+        ArticleBatchItem(
+            url=str(new_article.url),
+            channel_id=new_article.channel_id,
+            status=BatchItemStatus.accepted,
+        )
+        for new_article in new_articles
+    ]
+    modes = [new_article.extraction_mode for new_article in new_articles]
+    html_items = [item for item in items if ArticlesService.is_html_url(item.url)]
+    # one set-based lookup for all channels and one for all URLs,
+    # instead of two SELECTs per submitted article
+    channel_ids = ArticlesService.find_existing_channels(
+        db_session, (item.channel_id for item in html_items)
+    )
+    url_hashes = {item.url: url_hash(item.url) for item in html_items}
+    seen_hashes = ArticlesService.find_known_url_hashes(db_session, url_hashes.values())
+
+    db_jobs = list()
+    for item, mode in zip(items, modes):
+        if not ArticlesService.is_html_url(item.url):
+            item.status = BatchItemStatus.not_html
+        elif item.channel_id not in channel_ids:
+            item.status = BatchItemStatus.channel_not_found
+        elif url_hashes[item.url] in seen_hashes:
+            item.status = BatchItemStatus.duplicate
+        else:
+            seen_hashes.add(url_hashes[item.url])
+            db_jobs.append(
+                DbIngestionJob(
+                    url=item.url,
+                    url_hash=url_hashes[item.url],
+                    channel_id=item.channel_id,
+                    extraction_mode=mode.value if mode else None,
+                )
+            )
+    if db_jobs:
+        db_session.add_all(db_jobs)
+        # read the ids before committing, commit expires them
+        db_session.flush()
+        jobs_by_url = {db_job.url: db_job.id for db_job in db_jobs}
+        db_session.commit()
+        for item in items:
+            if item.status == BatchItemStatus.accepted:
+                item.job_id = jobs_by_url[item.url]
+        ingestion_pool.start()
+        ingestion_pool.wake()
+    return items
+
+
+def get_job(db_session: Session, job_id: int) -> APIIngestionJob:
+    db_job = (
+        db_session.query(DbIngestionJob).filter(DbIngestionJob.id == job_id).first()
+    )
+    if db_job is None:
+        raise IngestionException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Job not found"
+        )
+    return _to_api_job(db_job)
+
+
+async def enqueue_article_async(
+    db_session: AsyncSession,
+    article_url: str,
+    channel_id: int,
+    extraction_mode: Optional[ExtractionMode] = None,
+) -> APIIngestionJob:
+    return await db_session.run_sync(
+        enqueue_article,
+        article_url=article_url,
+        channel_id=channel_id,
+        extraction_mode=extraction_mode,
+    )
+
+
+async def enqueue_articles_async(
+    db_session: AsyncSession, new_articles: List[ArticleCreate]
+) -> List[ArticleBatchItem]:
+    return await db_session.run_sync(enqueue_articles, new_articles=new_articles)
+
+
+async def get_job_async(db_session: AsyncSession, job_id: int) -> APIIngestionJob:
+    return await db_session.run_sync(get_job, job_id=job_id)
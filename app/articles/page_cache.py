@@ -0,0 +1,197 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from typing import Dict, Iterable, Iterator, NamedTuple, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+READ_SIZE = 64 * 1024
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    # the fragment never reaches the server
+    return urlunsplit((scheme, host, parts.path or "/", parts.query, ""))
+
+
+class CacheEntry(NamedTuple):
+    key: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    encoding: str
+    size: int
+
+    def validators(self) -> Dict[str, str]:
+        headers = dict()
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class PageCache:
+    """On-disk cache of raw page bodies for the article fetch path.
+
+    Bodies are stored zlib-compressed in files named after the hash of the
+    normalized URL, with a small SQLite index holding the validators
+    (ETag/Last-Modified) and the access time used for LRU eviction once the
+    compressed bodies exceed `max_bytes`.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._index: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        # created on first use so a disabled or unused cache never touches disk
+        if self._index is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._index = sqlite3.connect(
+                os.path.join(self.directory, "index.sqlite3"),
+                check_same_thread=False,
+                isolation_level=None,
+            )
+            self._index.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, url TEXT, etag TEXT, last_modified TEXT, "
+                "encoding TEXT, size INTEGER, accessed_at REAL)"
+            )
+            self._index.execute(
+                "CREATE INDEX IF NOT EXISTS ix_entries_accessed_at "
+                "ON entries (accessed_at)"
+            )
+        return self._index
+
+    @staticmethod
+    def key(url: str) -> str:
+        return hashlib.sha256(normalize_url(url).encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.z")
+
+    def stats(self) -> Dict[str, int]:
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            stores=self.stores,
+            evictions=self.evictions,
+        )
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        key = self.key(url)
+        with self._lock:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT key, etag, last_modified, encoding, size "
+                    "FROM entries WHERE key = ?",
+                    (key,),
+                )
+                .fetchone()
+            )
+        if row is None or not os.path.exists(self._path(key)):
+            return None
+        return CacheEntry(*row)
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def iter_chunks(self, entry: CacheEntry) -> Iterator[bytes]:
+        """Decompressed body of a revalidated entry, counted as a hit."""
+        with self._lock:
+            self.hits += 1
+            self._connection().execute(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?",
+                (time.time(), entry.key),
+            )
+        decompressor = zlib.decompressobj()
+        with open(self._path(entry.key), "rb") as body:
+            for chunk in iter(lambda: body.read(READ_SIZE), b""):
+                data = decompressor.decompress(chunk)
+                if data:
+                    yield data
+        tail = decompressor.flush()
+        if tail:
+            yield tail
+
+    def store(
+        self,
+        url: str,
+        chunks: Iterable[bytes],
+        etag: Optional[str],
+        last_modified: Optional[str],
+        encoding: str,
+    ) -> Iterator[bytes]:
+        """Pass `chunks` through while compressing them into the cache.
+
+        The entry is only published once the body has been read completely,
+        an interrupted download leaves nothing behind.
+        """
+        key = self.key(url)
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = os.path.join(self.directory, f"{key}.{uuid.uuid4().hex}.tmp")
+        compressor = zlib.compressobj()
+        complete = False
+        try:
+            with open(temp_path, "wb") as body:
+                for chunk in chunks:
+                    body.write(compressor.compress(chunk))
+                    yield chunk
+                body.write(compressor.flush())
+                size = body.tell()
+            os.replace(temp_path, self._path(key))
+            complete = True
+        finally:
+            if not complete and os.path.exists(temp_path):
+                os.remove(temp_path)
+        with self._lock:
+            self.stores += 1
+            self._connection().execute(
+                "INSERT OR REPLACE INTO entries "
+                "(key, url, etag, last_modified, encoding, size, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    normalize_url(url),
+                    etag,
+                    last_modified,
+                    encoding,
+                    size,
+                    time.time(),
+                ),
+            )
+            self._evict()
+
+    def _evict(self):
+        index = self._connection()
+        (total,) = index.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+        for key, size in index.execute(
+            "SELECT key, size FROM entries ORDER BY accessed_at"
+        ).fetchall():
+            index.execute("DELETE FROM entries WHERE key = ?", (key,))
+            if os.path.exists(self._path(key)):
+                os.remove(self._path(key))
+            self.evictions += 1
+            total -= size
+            if total <= self.max_bytes:
+                return
@@ -1,20 +1,60 @@
+from http import HTTPStatus
 from typing import List, Optional
-from fastapi import APIRouter, BackgroundTasks, Depends
-from sqlalchemy.orm.session import Session
+from fastapi import APIRouter, Depends, Header, Query, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.samples import (
     sample_article,
+    sample_articles_deleted,
+    sample_articles_moved,
+    sample_batch_result,
     sample_article_list,
     sample_422,
     sample_404,
-    sample_bckgrnd,
+    sample_export_csv,
+    sample_export_ndjson,
+    sample_job,
+    sample_search_results,
+    sample_stats,
 )
-from app.schemas import Article, ArticleCreate, ArticleUpdate
+from app.schemas import (
+    Article,
+    ArticleBatchItem,
+    ArticleCreate,
+    ArticlesDeleted,
+    ArticlesMove,
+    ArticlesMoved,
+    ArticleSearchHit,
+    ArticleStats,
+    ArticleUpdate,
+    ExportFormat,
+    IngestionJob,
+)
+from app.articles import ingestion as IngestionService
 from app.articles import service as ArticlesService
-from app.database import get_db_session
+from app.database import get_async_db_session
+from app.versions import ARTICLES, etag_matches, list_etag_async
+from app.pagination import (
+    DEFAULT_PAGE_LIMIT,
+    MAX_PAGE_LIMIT,
+    NEXT_CURSOR_HEADER,
+    decode_cursor,
+    decode_search_cursor,
+    next_cursor,
+    next_search_cursor,
+)
 
 articles_router = APIRouter()
 
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_QUERY_LENGTH = 500
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
 
 @articles_router.get(
     "/",
@@ -23,17 +63,155 @@ articles_router = APIRouter()
             "model": List[Article],
             "description": "Articles retreived successfully",
             "content": {"application/json": {"example": sample_article_list}},
-        }
+            "headers": {
+                NEXT_CURSOR_HEADER: {
+                    "description": "Cursor of the next page, absent on the last page",
+                    "schema": {"type": "string"},
+                },
+                "ETag": {
+                    "description": "Weak tag of this page, send it as If-None-Match",
+                    "schema": {"type": "string"},
+                },
+            },
+        },
+        304: {"description": "Articles unchanged since the If-None-Match tag"},
+        422: {
+            "description": "Invalid input format or cursor",
+            "content": {"application/json": {"example": sample_422}},
+        },
     },
 )
-def get_articles(
+async def get_articles(
     min_words: Optional[int] = None,
     max_words: Optional[int] = None,
-    db: Session = Depends(get_db_session),
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    after: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db_session),
 ) -> List[Article]:
-    return ArticlesService.get_articles(
-        db_session=db, min_words=min_words, max_words=max_words
+    etag = await list_etag_async(
+        db,
+        (ARTICLES,),
+        min_words=min_words,
+        max_words=max_words,
+        limit=limit,
+        after=after,
+    )
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=HTTPStatus.NOT_MODIFIED, headers={"ETag": etag})
+    headers = {"ETag": etag}
+    articles = await ArticlesService.get_article_rows_async(
+        db_session=db,
+        min_words=min_words,
+        max_words=max_words,
+        limit=limit,
+        after=decode_cursor(after),
+    )
+    cursor = next_cursor(articles, limit)
+    if cursor:
+        headers[NEXT_CURSOR_HEADER] = cursor
+    # rows are already plain JSON values, skip model validation and encoding
+    return ORJSONResponse(articles, headers=headers)
+
+
+@articles_router.get(
+    "/stats",
+    responses={
+        200: {
+            "model": ArticleStats,
+            "description": "Word count statistics retreived successfully",
+            "content": {"application/json": {"example": sample_stats}},
+        }
+    },
+)
+async def get_article_stats(
+    db: AsyncSession = Depends(get_async_db_session),
+) -> ArticleStats:
+    return await ArticlesService.get_article_stats_async(db_session=db)
+
+
+@articles_router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "Articles streamed as NDJSON or CSV",
+            "content": {
+                EXPORT_MEDIA_TYPES[ExportFormat.ndjson]: {
+                    "example": sample_export_ndjson
+                },
+                EXPORT_MEDIA_TYPES[ExportFormat.csv]: {"example": sample_export_csv},
+            },
+        },
+        422: {
+            "description": "Invalid input format",
+            "content": {"application/json": {"example": sample_422}},
+        },
+    },
+)
+async def export_articles(
+    format: ExportFormat = ExportFormat.ndjson,
+    min_words: Optional[int] = None,
+    max_words: Optional[int] = None,
+    channel_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db_session),
+) -> StreamingResponse:
+    # the session dependency is only closed once the response is fully sent
+    return StreamingResponse(
+        ArticlesService.export_articles_async(
+            db_session=db,
+            export_format=format,
+            min_words=min_words,
+            max_words=max_words,
+            channel_id=channel_id,
+        ),
+        media_type=EXPORT_MEDIA_TYPES[format],
+    )
+
+
+@articles_router.get(
+    "/search",
+    responses={
+        200: {
+            "model": List[ArticleSearchHit],
+            "description": "Matching articles, best match first",
+            "content": {"application/json": {"example": sample_search_results}},
+            "headers": {
+                NEXT_CURSOR_HEADER: {
+                    "description": "Cursor of the next page, absent on the last page",
+                    "schema": {"type": "string"},
+                }
+            },
+        },
+        422: {
+            "description": "Invalid input format, query or cursor",
+            "content": {"application/json": {"example": sample_422}},
+        },
+    },
+)
+async def search_articles(
+    q: str = Query(..., min_length=1, max_length=MAX_SEARCH_QUERY_LENGTH),
+    channel_id: Optional[int] = None,
+    min_words: Optional[int] = None,
+    max_words: Optional[int] = None,
+    limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    after: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db_session),
+) -> List[ArticleSearchHit]:
+    hits = await ArticlesService.search_articles_async(
+        db_session=db,
+        text_query=q,
+        channel_id=channel_id,
+        min_words=min_words,
+        max_words=max_words,
+        limit=limit,
+        after=decode_search_cursor(after),
     )
+    headers = dict()
+    cursor = next_search_cursor(hits, limit)
+    if cursor:
+        headers[NEXT_CURSOR_HEADER] = cursor
+    return ORJSONResponse(hits, headers=headers)
 
 
 @articles_router.get(
@@ -54,17 +232,45 @@ def get_articles(
         },
     },
 )
-def get_article(article_id: int, db: Session = Depends(get_db_session)) -> Article:
-    return ArticlesService.get_article_by_id(db_session=db, article_id=article_id)
+async def get_article(
+    article_id: int, db: AsyncSession = Depends(get_async_db_session)
+) -> Article:
+    return await ArticlesService.get_article_by_id_async(
+        db_session=db, article_id=article_id
+    )
+
+
+@articles_router.get(
+    "/jobs/{job_id}",
+    responses={
+        200: {
+            "model": IngestionJob,
+            "description": "Ingestion job retreived successfully",
+            "content": {"application/json": {"example": sample_job}},
+        },
+        404: {
+            "description": "Job not found",
+            "content": {"application/json": {"example": sample_404}},
+        },
+        422: {
+            "description": "Invalid input format",
+            "content": {"application/json": {"example": sample_422}},
+        },
+    },
+)
+async def get_job(
+    job_id: int, db: AsyncSession = Depends(get_async_db_session)
+) -> IngestionJob:
+    return await IngestionService.get_job_async(db_session=db, job_id=job_id)
 
 
 @articles_router.post(
     "/",
     responses={
         200: {
-            "model": str,
-            "description": "Article will be created in background",
-            "content": {"application/json": {"example": sample_bckgrnd}},
+            "model": IngestionJob,
+            "description": "Article queued, poll the job to follow its ingestion",
+            "content": {"application/json": {"example": sample_job}},
         },
         404: {
             "description": "Channel not found",
@@ -76,25 +282,75 @@ def get_article(article_id: int, db: Session = Depends(get_db_session)) -> Artic
         },
     },
 )
-def add_article(
-    new_article: ArticleCreate,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db_session),
-) -> str:
-    resp = ArticlesService.validate_article_and_channel(
+async def add_article(
+    new_article: ArticleCreate, db: AsyncSession = Depends(get_async_db_session)
+) -> IngestionJob:
+    await ArticlesService.validate_article_and_channel_async(
         db_session=db,
         channel_id=new_article.channel_id,
         article_url=str(new_article.url),
     )
-    # this should live in service/business logic layer
-    # unless there is a very very good reason to do it here :)
-    background_tasks.add_task(
-        ArticlesService.create_article,
+    return await IngestionService.enqueue_article_async(
         db_session=db,
         channel_id=new_article.channel_id,
         article_url=str(new_article.url),
+        extraction_mode=new_article.extraction_mode,
+    )
+
+
+@articles_router.post(
+    "/batch",
+    responses={
+        200: {
+            "model": List[ArticleBatchItem],
+            "description": "Per-article outcome, accepted articles are queued",
+            "content": {"application/json": {"example": sample_batch_result}},
+        },
+        422: {
+            "description": "Invalid input format or batch size",
+            "content": {"application/json": {"example": sample_422}},
+        },
+    },
+)
+async def add_articles(
+    new_articles: List[ArticleCreate], db: AsyncSession = Depends(get_async_db_session)
+) -> List[ArticleBatchItem]:
+    return await IngestionService.enqueue_articles_async(
+        db_session=db, new_articles=new_articles
+    )
+
+
+@articles_router.post(
+    "/move",
+    responses={
+        200: {
+            "model": ArticlesMoved,
+            "description": "Number of articles moved to the target channel",
+            "content": {"application/json": {"example": sample_articles_moved}},
+        },
+        404: {
+            "description": "Target channel not found",
+            "content": {"application/json": {"example": sample_404}},
+        },
+        422: {
+            "description": "Invalid input format, no ids and no filter",
+            "content": {"application/json": {"example": sample_422}},
+        },
+    },
+)
+async def move_articles(
+    move: ArticlesMove,
+    db: AsyncSession = Depends(get_async_db_session),
+) -> ArticlesMoved:
+    moved = await ArticlesService.move_articles_async(
+        db_session=db,
+        target_channel_id=move.target_channel_id,
+        article_ids=move.ids,
+        min_words=move.min_words,
+        max_words=move.max_words,
+        channel_id=move.channel_id,
     )
-    return resp
+    return ArticlesMoved(moved=moved)
 
 
 @articles_router.put(
@@ -115,16 +371,42 @@ def add_article(
         },
     },
 )
-def update_article_channel(
-    updated_article: ArticleUpdate, db: Session = Depends(get_db_session)
+async def update_article_channel(
+    updated_article: ArticleUpdate, db: AsyncSession = Depends(get_async_db_session)
 ) -> Article:
-    return ArticlesService.update_article(
+    return await ArticlesService.update_article_async(
         db_session=db,
         article_id=updated_article.id,
         new_channel_name=updated_article.channel_name,
     )
 
 
+@articles_router.delete(
+    "/",
+    responses={
+        200: {
+            "model": ArticlesDeleted,
+            "description": "Matching articles deleted",
+            "content": {"application/json": {"example": sample_articles_deleted}},
+        },
+        422: {
+            "description": "Invalid input format or no filter",
+            "content": {"application/json": {"example": sample_422}},
+        },
+    },
+)
+async def delete_articles(
+    channel_id: Optional[int] = None,
+    min_words: Optional[int] = None,
+    max_words: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db_session),
+) -> ArticlesDeleted:
+    deleted = await ArticlesService.delete_articles_async(
+        db_session=db, min_words=min_words, max_words=max_words, channel_id=channel_id
+    )
+    return ArticlesDeleted(deleted=deleted)
+
+
 @articles_router.delete(
     "/{article_id}",
     responses={
@@ -141,8 +423,12 @@ def update_article_channel(
         },
     },
 )
-def delete_article(article_id: int, db: Session = Depends(get_db_session)) -> str:
-    ArticlesService.delete_article_by_id(db_session=db, article_id=article_id)
+async def delete_article(
+    article_id: int, db: AsyncSession = Depends(get_async_db_session)
+) -> str:
+    await ArticlesService.delete_article_by_id_async(
+        db_session=db, article_id=article_id
+    )
     # return 202 for confirmation instead of a dummy string message
     # nobody really reads that stuff
     return "Article deleted successfully"
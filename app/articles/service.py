@@ -1,78 +1,411 @@
-from typing import List, Optional
+import csv
+import json
+import re
+import sqlite3
+from io import StringIO
+from typing import (
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+from sqlalchemy import func, select, text
 from fastapi import status
 from fastapi.exceptions import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm.session import Session
 from starlette.status import HTTP_422_UNPROCESSABLE_ENTITY
 from newspaper import ArticleException as ThirdPartyArticleException
-from app.const import HTM_SUFFIX, HTML_SUFFIX
-from app.db_models import Channel as DbChannel, Article as DbArticle
-from app.schemas import Article as APIArticle
+from app import config
+from app.cache import LRUCache
+from app.const import (
+    HTM_SUFFIX,
+    HTML_SUFFIX,
+    MAX_ID_CHUNK_SIZE,
+    MAX_MOVE_IDS,
+    SEARCH_STOPWORDS,
+    WORD_COUNT_BIN_WIDTH,
+    WORD_COUNT_BUCKETS,
+    WORD_COUNT_MAX_BIN,
+)
+from app.db_models import (
+    ARTICLE_TEXTS_FTS,
+    Channel as DbChannel,
+    Article as DbArticle,
+    ArticleText as DbArticleText,
+    IngestionJob as DbIngestionJob,
+    WordCountBin as DbWordCountBin,
+)
+from app.schemas import (
+    Article as APIArticle,
+    ArticleStats,
+    ChannelArticleCount,
+    WordCountBucket,
+    ExportFormat,
+    ExtractionMode,
+    JobStatus,
+)
+from app.versions import ARTICLES, bump_version
+from app.articles.fetcher import FetchException
+from app.articles.urls import url_hash
 from app.articles.utils import fetch_article_url
 
+EXPORT_BATCH_SIZE = 1000
+ARTICLE_FIELDS = ("id", "url", "channel_id", "word_count")
+ARTICLE_COLUMNS = tuple(getattr(DbArticle, field) for field in ARTICLE_FIELDS)
+STATS_PERCENTILES = (50, 90, 95, 99)
+
+# resolves the channel by name and moves the article in one statement,
+# nothing is updated when either of them does not exist
+MOVE_ARTICLE_SQL = (
+    "UPDATE articles SET channel_id = "
+    "(SELECT id FROM channels WHERE name = :channel_name) "
+    "WHERE id = :article_id "
+    "AND EXISTS (SELECT 1 FROM channels WHERE name = :channel_name)"
+)
+# UPDATE ... RETURNING needs SQLite 3.35, older versions re-read the row
+SQLITE_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# articles deleted or moved per transaction by the bulk operations, so other
+# writers never wait for more than one chunk
+BULK_CHUNK_SIZE = 2000
+
+SEARCH_SNIPPET_TOKENS = 16
+# words of a search query, a trailing * makes the word a prefix
+SEARCH_TERM = re.compile(r"(\w+)(\*?)")
+# ranks in FTS5 and joins only the matches, which also keeps the snippet
+# work to the returned page: SQLite evaluates it after LIMIT
+SEARCH_SQL = f"""
+SELECT articles.id, articles.url, articles.channel_id, articles.word_count,
+       {ARTICLE_TEXTS_FTS}.rank AS rank,
+       snippet({ARTICLE_TEXTS_FTS}, 0, '<b>', '</b>', '…', {SEARCH_SNIPPET_TOKENS})
+           AS snippet
+FROM {ARTICLE_TEXTS_FTS} JOIN articles ON articles.id = {ARTICLE_TEXTS_FTS}.rowid
+WHERE {ARTICLE_TEXTS_FTS} MATCH :query {{filters}}
+ORDER BY {ARTICLE_TEXTS_FTS}.rank, articles.id
+LIMIT :limit
+"""
+
+
+article_cache = LRUCache(
+    max_size=config.ENTITY_CACHE_SIZE, ttl_seconds=config.ENTITY_CACHE_TTL_SECONDS
+)
+
 
 class ArticleException(HTTPException):
     pass
 
 
+def filter_articles(
+    query,
+    min_words: Optional[int] = None,
+    max_words: Optional[int] = None,
+    channel_id: Optional[int] = None,
+):
+    if min_words:
+        query = query.filter(DbArticle.word_count >= min_words)
+    if max_words:
+        query = query.filter(DbArticle.word_count <= max_words)
+    if channel_id is not None:
+        query = query.filter(DbArticle.channel_id == channel_id)
+    return query
+
+
 def get_article_by_id(db_session: Session, article_id: int) -> APIArticle:
+    cached_article = article_cache.get(article_id)
+    if cached_article is not None:
+        return cached_article
     try:
         db_article = (
             db_session.query(DbArticle).filter(DbArticle.id == article_id).first()
         )
-        return APIArticle(
+        api_article = APIArticle(
             id=db_article.id,
             url=db_article.url,
             channel_id=db_article.channel_id,
             word_count=db_article.word_count,
         )
+        article_cache.set(article_id, api_article)
+        return api_article
     except AttributeError:
         raise ArticleException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Article not found"
         )
 
 
+def get_article_rows(
+    db_session: Session,
+    min_words: Optional[int] = None,
+    max_words: Optional[int] = None,
+    limit: Optional[int] = None,
+    after: Optional[int] = None,
+) -> List[Dict]:
+    """Articles as plain dicts built from column tuples, ready for JSON.
+
+    Skips the ORM objects and the per-row pydantic models of `get_articles`,
+    the list endpoints serialize these rows directly.
+    """
+    query = filter_articles(
+        db_session.query(*ARTICLE_COLUMNS), min_words=min_words, max_words=max_words
+    )
+    # keyset pagination: seek past the last seen id, never OFFSET
+    if after is not None:
+        query = query.filter(DbArticle.id > after)
+    query = query.order_by(DbArticle.id)
+    if limit is not None:
+        query = query.limit(limit)
+    return [dict(zip(ARTICLE_FIELDS, row)) for row in query]
+
+
 def get_articles(
     db_session: Session,
     min_words: Optional[int] = None,
     max_words: Optional[int] = None,
+    limit: Optional[int] = None,
+    after: Optional[int] = None,
 ) -> List[APIArticle]:
-    query = db_session.query(DbArticle)
+    rows = get_article_rows(
+        db_session,
+        min_words=min_words,
+        max_words=max_words,
+        limit=limit,
+        after=after,
+    )
+    return [APIArticle(**row) for row in rows]
+
+
+def _export_writer(export_format: ExportFormat):
+    buffer = StringIO()
+    if export_format == ExportFormat.csv:
+        writer = csv.writer(buffer)
+        writer.writerow(ARTICLE_FIELDS)
+        return buffer, writer.writerow
+
+    def write_row(row):
+        buffer.write(json.dumps(dict(zip(ARTICLE_FIELDS, row))))
+        buffer.write("\n")
+
+    return buffer, write_row
+
+
+def _take(buffer: StringIO) -> str:
+    data = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return data
+
+
+def export_articles(
+    db_session: Session,
+    export_format: ExportFormat = ExportFormat.ndjson,
+    min_words: Optional[int] = None,
+    max_words: Optional[int] = None,
+    channel_id: Optional[int] = None,
+) -> Iterator[str]:
+    # plain column tuples streamed from the cursor in fixed-size batches,
+    # no ORM identity map and no pydantic model per row
+    query = filter_articles(
+        db_session.query(*ARTICLE_COLUMNS),
+        min_words=min_words,
+        max_words=max_words,
+        channel_id=channel_id,
+    ).order_by(DbArticle.id)
+    rows = query.yield_per(EXPORT_BATCH_SIZE)
+
+    buffer, write_row = _export_writer(export_format)
+    batch_rows = 0
+    for row in rows:
+        write_row(row)
+        batch_rows += 1
+        if batch_rows == EXPORT_BATCH_SIZE:
+            yield _take(buffer)
+            batch_rows = 0
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+async def export_articles_async(
+    db_session: AsyncSession,
+    export_format: ExportFormat = ExportFormat.ndjson,
+    min_words: Optional[int] = None,
+    max_words: Optional[int] = None,
+    channel_id: Optional[int] = None,
+) -> AsyncIterator[str]:
+    query = filter_articles(
+        select(*ARTICLE_COLUMNS),
+        min_words=min_words,
+        max_words=max_words,
+        channel_id=channel_id,
+    ).order_by(DbArticle.id)
+    result = await db_session.stream(query)
+
+    buffer, write_row = _export_writer(export_format)
+    async for rows in result.partitions(EXPORT_BATCH_SIZE):
+        for row in rows:
+            write_row(row)
+        yield _take(buffer)
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _bin_bounds(word_bin: int, max_words: int):
+    low = 0 if word_bin == 0 else word_bin * WORD_COUNT_BIN_WIDTH + 1
+    if word_bin == WORD_COUNT_MAX_BIN:
+        return low, max(low, max_words)
+    return low, (word_bin + 1) * WORD_COUNT_BIN_WIDTH
+
+
+def _percentiles(bins: Dict[int, int], count: int, min_words: int, max_words: int):
+    # linear interpolation inside the bin holding each rank,
+    # clamped to the exact minimum and maximum
+    percentiles = dict()
+    for percentile in STATS_PERCENTILES:
+        rank = percentile / 100 * count
+        seen = 0
+        for word_bin in sorted(bins):
+            if seen + bins[word_bin] >= rank:
+                low, high = _bin_bounds(word_bin, max_words)
+                value = low + (high - low) * (rank - seen) / bins[word_bin]
+                percentiles[f"p{percentile}"] = min(max(value, min_words), max_words)
+                break
+            seen += bins[word_bin]
+    return percentiles
+
+
+def get_article_stats(db_session: Session) -> ArticleStats:
+    rows = (
+        db_session.query(DbWordCountBin).filter(DbWordCountBin.article_count > 0).all()
+    )
+    bins: Dict[int, int] = dict()
+    channels: Dict[int, int] = dict()
+    count = word_total = 0
+    for row in rows:
+        bins[row.bin] = bins.get(row.bin, 0) + row.article_count
+        channels[row.channel_id] = channels.get(row.channel_id, 0) + row.article_count
+        count += row.article_count
+        word_total += row.word_total
+
+    buckets = list()
+    for min_words, max_words in WORD_COUNT_BUCKETS:
+        bucket_count = sum(
+            bin_count
+            for word_bin, bin_count in bins.items()
+            if _bin_bounds(word_bin, 0)[0] >= min_words
+            and (max_words is None or _bin_bounds(word_bin, 0)[1] <= max_words)
+        )
+        buckets.append(
+            WordCountBucket(
+                min_words=min_words, max_words=max_words, count=bucket_count
+            )
+        )
+    stats = ArticleStats(
+        count=count,
+        percentiles=dict(),
+        buckets=buckets,
+        channels=[
+            ChannelArticleCount(channel_id=channel_id, count=channel_count)
+            for channel_id, channel_count in sorted(channels.items())
+        ],
+    )
+    if count:
+        # both ends are a single seek on the word_count index
+        stats.min_words, stats.max_words = db_session.query(
+            func.min(DbArticle.word_count), func.max(DbArticle.word_count)
+        ).one()
+        stats.mean_words = word_total / count
+        stats.percentiles = _percentiles(bins, count, stats.min_words, stats.max_words)
+    return stats
+
+
+def search_query(text_query: str) -> str:
+    """FTS5 query matching articles that contain every word of `text_query`.
+
+    Words are quoted, so no input is read as FTS5 syntax, and stopwords are
+    left out as long as another word remains.
+    """
+    terms = [(word.lower(), prefix) for word, prefix in SEARCH_TERM.findall(text_query)]
+    kept = [term for term in terms if term[0] not in SEARCH_STOPWORDS] or terms
+    if not kept:
+        raise ArticleException(
+            status_code=HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Search query has no words",
+        )
+    return " ".join(f'"{word}"{prefix}' for word, prefix in kept)
+
+
+def search_articles(
+    db_session: Session,
+    text_query: str,
+    channel_id: Optional[int] = None,
+    min_words: Optional[int] = None,
+    max_words: Optional[int] = None,
+    limit: int = 20,
+    after: Optional[Tuple[float, int]] = None,
+) -> List[Dict]:
+    """Articles whose text matches `text_query`, best BM25 rank first.
+
+    Rows are plain dicts like `get_article_rows`, with the rank and a snippet
+    added. `after` is the (rank, id) of the last row of the previous page.
+    """
+    filters = list()
+    params = dict(query=search_query(text_query), limit=limit)
+    if channel_id is not None:
+        filters.append("AND articles.channel_id = :channel_id")
+        params["channel_id"] = channel_id
     if min_words:
-        query = query.filter(DbArticle.word_count >= min_words)
+        filters.append("AND articles.word_count >= :min_words")
+        params["min_words"] = min_words
     if max_words:
-        query = query.filter(DbArticle.word_count <= max_words)
-    db_articles = query.all()
-    api_articles = list()
-    for db_article in db_articles:
-        api_articles.append(
-            APIArticle(
-                id=db_article.id,
-                url=db_article.url,
-                channel_id=db_article.channel_id,
-                word_count=db_article.word_count,
-            )
+        filters.append("AND articles.word_count <= :max_words")
+        params["max_words"] = max_words
+    if after is not None:
+        filters.append(
+            f"AND ({ARTICLE_TEXTS_FTS}.rank, articles.id) > (:after_rank, :after_id)"
         )
-    return api_articles
+        params["after_rank"], params["after_id"] = after
+    rows = db_session.execute(
+        text(SEARCH_SQL.format(filters=" ".join(filters))), params
+    )
+    return [dict(row._mapping) for row in rows]
 
 
 def create_article(
-    db_session: Session, article_url: str, channel_id: int
+    db_session: Session,
+    article_url: str,
+    channel_id: int,
+    extraction_mode: Optional[ExtractionMode] = None,
 ) -> APIArticle:
     try:
-        article_word_count = fetch_article_url(article_url=article_url)
+        article_content = fetch_article_url(
+            article_url=article_url,
+            mode=ExtractionMode(extraction_mode) if extraction_mode else None,
+        )
         db_article = DbArticle(
-            url=article_url, channel_id=channel_id, word_count=article_word_count
+            url=article_url,
+            channel_id=channel_id,
+            word_count=article_content.word_count,
         )
         db_session.add(db_article)
+        if article_content.text:
+            db_session.flush()
+            db_session.add(
+                DbArticleText(article_id=db_article.id, content=article_content.text)
+            )
+        bump_version(db_session, ARTICLES)
         db_session.commit()
         db_session.refresh(db_article)
+        article_cache.invalidate(db_article.id)
         return APIArticle(
             id=db_article.id,
             url=db_article.url,
             channel_id=db_article.channel_id,
             word_count=db_article.word_count,
         )
-    except ThirdPartyArticleException:
+    except (ThirdPartyArticleException, FetchException):
         raise ArticleException(
             status_code=HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid article URL"
         )
@@ -81,30 +414,29 @@ def create_article(
 def update_article(
     db_session: Session, article_id: int, new_channel_name: str
 ) -> APIArticle:
-    try:
-        channel_id = (
-            db_session.query(DbChannel)
-            .filter(DbChannel.name == new_channel_name)
+    params = dict(article_id=article_id, channel_name=new_channel_name)
+    if SQLITE_HAS_RETURNING:
+        row = db_session.execute(
+            text(f"{MOVE_ARTICLE_SQL} RETURNING {', '.join(ARTICLE_FIELDS)}"),
+            params,
+        ).first()
+    else:
+        row = db_session.execute(text(MOVE_ARTICLE_SQL), params).rowcount and (
+            db_session.query(*ARTICLE_COLUMNS)
+            .filter(DbArticle.id == article_id)
             .first()
-            .id
-        )
-        db_article = (
-            db_session.query(DbArticle).filter(DbArticle.id == article_id).first()
-        )
-        db_article.channel_id = channel_id
-        db_session.commit()
-        db_session.refresh(db_article)
-        return APIArticle(
-            id=db_article.id,
-            url=db_article.url,
-            channel_id=db_article.channel_id,
-            word_count=db_article.word_count,
         )
-    except AttributeError:
+    if not row:
+        # the UPDATE took the write lock even though it matched nothing
+        db_session.rollback()
         raise ArticleException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Channel name or article not found",
         )
+    bump_version(db_session, ARTICLES)
+    db_session.commit()
+    article_cache.invalidate(article_id)
+    return APIArticle(**dict(zip(ARTICLE_FIELDS, row)))
 
 
 def delete_article_by_id(db_session: Session, article_id: int):
@@ -112,25 +444,195 @@ def delete_article_by_id(db_session: Session, article_id: int):
         db_session.query(DbArticle).filter(DbArticle.id == article_id).delete()
     )
     if rows_deleted == 0:
+        db_session.rollback()
         raise ArticleException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Article not found"
         )
+    bump_version(db_session, ARTICLES)
     db_session.commit()
+    article_cache.invalidate(article_id)
+
+
+def article_chunk(
+    db_session: Session,
+    after: int,
+    chunk_size: int,
+    min_words: Optional[int] = None,
+    max_words: Optional[int] = None,
+    channel_id: Optional[int] = None,
+):
+    """The next `chunk_size` matching articles with ids above `after`.
+
+    Returns a query of the chunk, ready for one set-based UPDATE or DELETE,
+    and the last id of the chunk, None when it holds the last matches.
+    """
+    query = filter_articles(
+        db_session.query(DbArticle),
+        min_words=min_words,
+        max_words=max_words,
+        channel_id=channel_id,
+    ).filter(DbArticle.id > after)
+    last_id = (
+        query.with_entities(DbArticle.id)
+        .order_by(DbArticle.id)
+        .offset(chunk_size - 1)
+        .limit(1)
+        .scalar()
+    )
+    if last_id is not None:
+        query = query.filter(DbArticle.id <= last_id)
+    return query, last_id
+
+
+def delete_articles(
+    db_session: Session,
+    min_words: Optional[int] = None,
+    max_words: Optional[int] = None,
+    channel_id: Optional[int] = None,
+    chunk_size: int = BULK_CHUNK_SIZE,
+) -> int:
+    """Delete the matching articles a chunk per transaction, return the count."""
+    if not (min_words or max_words or channel_id is not None):
+        raise ArticleException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="At least one filter is required",
+        )
+    deleted = 0
+    after = 0
+    while after is not None:
+        # a write first, so the transaction holds the write lock before it
+        # reads the chunk bounds
+        bump_version(db_session, ARTICLES)
+        chunk, after = article_chunk(
+            db_session,
+            after,
+            chunk_size,
+            min_words=min_words,
+            max_words=max_words,
+            channel_id=channel_id,
+        )
+        rows_deleted = chunk.delete(synchronize_session=False)
+        if rows_deleted == 0:
+            db_session.rollback()
+            continue
+        db_session.commit()
+        # ids of the chunk are unknown, drop every cached article
+        article_cache.clear()
+        deleted += rows_deleted
+    return deleted
+
+
+def move_articles(
+    db_session: Session,
+    target_channel_id: int,
+    article_ids: Optional[List[int]] = None,
+    min_words: Optional[int] = None,
+    max_words: Optional[int] = None,
+    channel_id: Optional[int] = None,
+    chunk_size: int = BULK_CHUNK_SIZE,
+) -> int:
+    """Move the articles with `article_ids`, or the matching ones, to the
+    target channel in one transaction, return how many changed channel.
+    """
+    if article_ids is not None:
+        if len(article_ids) > MAX_MOVE_IDS:
+            raise ArticleException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"At most {MAX_MOVE_IDS} article ids can be moved at once",
+            )
+    elif not (min_words or max_words or channel_id is not None):
+        raise ArticleException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Article ids or at least one filter are required",
+        )
+    # a write first, the target channel cannot be deleted once it is checked
+    bump_version(db_session, ARTICLES)
+    target_exists = (
+        db_session.query(DbChannel.id).filter(DbChannel.id == target_channel_id).first()
+    )
+    if not target_exists:
+        db_session.rollback()
+        raise ArticleException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Channel not found"
+        )
+    moved = 0
+    move = {DbArticle.channel_id: target_channel_id}
+    not_moved_yet = DbArticle.channel_id != target_channel_id
+    if article_ids is not None:
+        for start in range(0, len(article_ids), MAX_ID_CHUNK_SIZE):
+            moved += (
+                db_session.query(DbArticle)
+                .filter(
+                    DbArticle.id.in_(article_ids[start : start + MAX_ID_CHUNK_SIZE]),
+                    not_moved_yet,
+                )
+                .update(move, synchronize_session=False)
+            )
+    else:
+        after = 0
+        while after is not None:
+            chunk, after = article_chunk(
+                db_session,
+                after,
+                chunk_size,
+                min_words=min_words,
+                max_words=max_words,
+                channel_id=channel_id,
+            )
+            moved += chunk.filter(not_moved_yet).update(move, synchronize_session=False)
+    if moved == 0:
+        db_session.rollback()
+        return 0
+    db_session.commit()
+    if article_ids is not None:
+        for article_id in article_ids:
+            article_cache.invalidate(article_id)
+    else:
+        article_cache.clear()
+    return moved
+
+
+def is_html_url(article_url: str) -> bool:
+    # the page is named by the path, a query or fragment may follow it
+    path = article_url.partition("#")[0].partition("?")[0]
+    return path.lower().endswith((HTML_SUFFIX, HTM_SUFFIX))
+
+
+def find_existing_channels(db_session: Session, channel_ids: Iterable[int]) -> Set[int]:
+    rows = db_session.query(DbChannel.id).filter(DbChannel.id.in_(set(channel_ids)))
+    return {row.id for row in rows}
+
+
+def find_known_url_hashes(db_session: Session, url_hashes: Iterable[int]) -> Set[int]:
+    # canonical URLs that are either stored already or still waiting to be
+    # fetched, both lookups are seeks on the integer hash indexes
+    url_hashes = set(url_hashes)
+    stored = db_session.query(DbArticle.url_hash).filter(
+        DbArticle.url_hash.in_(url_hashes)
+    )
+    queued = db_session.query(DbIngestionJob.url_hash).filter(
+        DbIngestionJob.status.in_((JobStatus.pending.value, JobStatus.running.value)),
+        DbIngestionJob.url_hash.in_(url_hashes),
+    )
+    return {row[0] for row in stored.union(queued)}
 
 
 def validate_article_and_channel(
     db_session: Session, article_url: str, channel_id: int
 ) -> str:
-    if not article_url.lower().endswith(
-        HTML_SUFFIX
-    ) and not article_url.lower().endswith(HTM_SUFFIX):
+    if not is_html_url(article_url):
         raise ArticleException(
             status_code=HTTP_422_UNPROCESSABLE_ENTITY,
             detail="Article must be a .html page",
         )
 
-    channel = db_session.query(DbChannel).filter(DbChannel.id == channel_id).first()
-    article = db_session.query(DbArticle).filter(DbArticle.url.is_(article_url)).first()
+    # both checks in one statement, each EXISTS is a seek on a unique index
+    channel, article = db_session.query(
+        select(DbChannel.id).where(DbChannel.id == channel_id).exists(),
+        select(DbArticle.id)
+        .where(DbArticle.url_hash == url_hash(article_url))
+        .exists(),
+    ).one()
     if not channel:
         raise ArticleException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Channel not found"
@@ -141,3 +643,106 @@ def validate_article_and_channel(
             detail="Article URL already exists",
         )
     return "Article will be fetched and created in the background"
+
+
+# Async versions for the request path. They run the functions above on an
+# AsyncSession through run_sync, database calls are awaited on the event loop
+# instead of blocking a threadpool slot for the whole request.
+
+
+async def get_article_by_id_async(
+    db_session: AsyncSession, article_id: int
+) -> APIArticle:
+    return await db_session.run_sync(get_article_by_id, article_id=article_id)
+
+
+async def get_article_rows_async(
+    db_session: AsyncSession,
+    min_words: Optional[int] = None,
+    max_words: Optional[int] = None,
+    limit: Optional[int] = None,
+    after: Optional[int] = None,
+) -> List[Dict]:
+    return await db_session.run_sync(
+        get_article_rows,
+        min_words=min_words,
+        max_words=max_words,
+        limit=limit,
+        after=after,
+    )
+
+
+async def search_articles_async(
+    db_session: AsyncSession,
+    text_query: str,
+    channel_id: Optional[int] = None,
+    min_words: Optional[int] = None,
+    max_words: Optional[int] = None,
+    limit: int = 20,
+    after: Optional[Tuple[float, int]] = None,
+) -> List[Dict]:
+    return await db_session.run_sync(
+        search_articles,
+        text_query=text_query,
+        channel_id=channel_id,
+        min_words=min_words,
+        max_words=max_words,
+        limit=limit,
+        after=after,
+    )
+
+
+async def get_article_stats_async(db_session: AsyncSession) -> ArticleStats:
+    return await db_session.run_sync(get_article_stats)
+
+
+async def update_article_async(
+    db_session: AsyncSession, article_id: int, new_channel_name: str
+) -> APIArticle:
+    return await db_session.run_sync(
+        update_article, article_id=article_id, new_channel_name=new_channel_name
+    )
+
+
+async def delete_article_by_id_async(db_session: AsyncSession, article_id: int):
+    await db_session.run_sync(delete_article_by_id, article_id=article_id)
+
+
+async def delete_articles_async(
+    db_session: AsyncSession,
+    min_words: Optional[int] = None,
+    max_words: Optional[int] = None,
+    channel_id: Optional[int] = None,
+) -> int:
+    return await db_session.run_sync(
+        delete_articles,
+        min_words=min_words,
+        max_words=max_words,
+        channel_id=channel_id,
+    )
+
+
+async def move_articles_async(
+    db_session: AsyncSession,
+    target_channel_id: int,
+    article_ids: Optional[List[int]] = None,
+    min_words: Optional[int] = None,
+    max_words: Optional[int] = None,
+    channel_id: Optional[int] = None,
+) -> int:
+    return await db_session.run_sync(
+        move_articles,
+        target_channel_id=target_channel_id,
+        article_ids=article_ids,
+        min_words=min_words,
+        max_words=max_words,
+        channel_id=channel_id,
+    )
+
+
+async def validate_article_and_channel_async(
+    db_session: AsyncSession, article_url: str, channel_id: int
+) -> str:
+    return await db_session.run_sync(
+        validate_article_and_channel, article_url=article_url, channel_id=channel_id
+    )
@@ -0,0 +1,63 @@
+import hashlib
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+# query parameters that only record where a reader came from
+TRACKING_PARAMS = frozenset(
+    (
+        "_ga",
+        "cmpid",
+        "dclid",
+        "fbclid",
+        "gclid",
+        "igshid",
+        "mc_cid",
+        "mc_eid",
+        "msclkid",
+        "ocid",
+        "ref",
+        "ref_src",
+        "yclid",
+    )
+)
+TRACKING_PREFIXES = ("utm_",)
+
+
+def canonical_url(url: str) -> str:
+    """The form of `url` shared by every variant of the same article.
+
+    Drops the scheme, a leading `www.`, default ports, the fragment, trailing
+    slashes and tracking parameters, sorts the remaining parameters and
+    lowercases the result. The article keeps the URL it was submitted with,
+    this form is only compared.
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.rpartition("@")[2].lower()
+    # only a netloc with a port needs the slower parsing
+    if ":" in host:
+        try:
+            port = parts.port
+        except ValueError:
+            port = None
+        host = parts.hostname or ""
+        if port and port != DEFAULT_PORTS.get(parts.scheme.lower()):
+            host = f"{host}:{port}"
+    if host.startswith("www."):
+        host = host[4:]
+    query = ""
+    if parts.query:
+        params = sorted(
+            (key, value)
+            for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if key.lower() not in TRACKING_PARAMS
+            and not key.lower().startswith(TRACKING_PREFIXES)
+        )
+        query = f"?{urlencode(params)}" if params else ""
+    return f"//{host}{parts.path.rstrip('/') or '/'}{query}".lower()
+
+
+def url_hash(url: str) -> int:
+    # 64 bits of the canonical URL as a signed integer, the largest integer
+    # SQLite stores, so the unique index holds 8 bytes per article
+    digest = hashlib.blake2b(canonical_url(url).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
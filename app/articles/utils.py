@@ -1,9 +1,21 @@
 # Retreived from: https://stackoverflow.com/questions/753052/strip-html-from-strings-in-python
 
+import codecs
 from io import StringIO
 from html.parser import HTMLParser
+from typing import Iterable, NamedTuple, Optional, Union
 from newspaper import Article as NewspaperArticle
 
+from app import config
+from app.articles.fetcher import http_fetcher
+from app.schemas import ExtractionMode
+
+
+class ArticleContent(NamedTuple):
+    word_count: int
+    # stripped main text, stored for full-text search
+    text: str
+
 
 class StripHTML(HTMLParser):
     def __init__(self):
@@ -26,9 +38,138 @@ def strip_tags(html) -> str:
     return s.get_data()
 
 
-def fetch_article_url(article_url: str) -> int:
+class StreamingWordCounter(HTMLParser):
+    """Counts words of the main content while the page is still being fed.
+
+    Only text inside paragraphs is counted, and everything under page chrome
+    (navigation, headers, footers, scripts...) is ignored. No DOM and no
+    stripped copy of the document are built, the parser keeps a handful of
+    counters and whatever partial tag is left at the end of a chunk. With
+    `keep_text` the counted paragraph text is collected as well.
+    """
+
+    SKIPPED_TAGS = {
+        "aside",
+        "button",
+        "figcaption",
+        "figure",
+        "footer",
+        "form",
+        "header",
+        "iframe",
+        "nav",
+        "noscript",
+        "script",
+        "select",
+        "style",
+        "svg",
+        "template",
+    }
+    # block elements end the current word and implicitly close an open <p>
+    BLOCK_TAGS = {
+        "article",
+        "blockquote",
+        "div",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "hr",
+        "li",
+        "ol",
+        "p",
+        "section",
+        "table",
+        "td",
+        "tr",
+        "ul",
+    }
+
+    def __init__(self, keep_text: bool = False):
+        super().__init__(convert_charrefs=True)
+        self.words = 0
+        self.text = StringIO() if keep_text else None
+        self._skip_depth = 0
+        self._in_paragraph = False
+        self._in_word = False
+
+    def handle_starttag(self, tag: str, attrs):
+        if tag in self.SKIPPED_TAGS:
+            self._skip_depth += 1
+        if tag == "br":
+            self._in_word = False
+        elif tag in self.BLOCK_TAGS:
+            self._in_word = False
+            self._in_paragraph = tag == "p"
+        else:
+            return
+        if self.text is not None and self.text.tell():
+            self.text.write("\n")
+
+    def handle_endtag(self, tag: str):
+        if tag in self.SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        if tag in self.BLOCK_TAGS:
+            self._in_word = False
+            if tag == "p":
+                self._in_paragraph = False
+
+    def handle_data(self, data: str):
+        if self._skip_depth or not self._in_paragraph or not data:
+            return
+        tokens = len(data.split())
+        # text can reach us in pieces, a word cut by a chunk or an inline tag
+        # boundary is only counted once
+        if tokens and self._in_word and not data[0].isspace():
+            tokens -= 1
+        self.words += tokens
+        self._in_word = not data[-1].isspace()
+        if self.text is not None:
+            self.text.write(data)
+
+
+def _feed_streaming(
+    counter: StreamingWordCounter, chunks: Iterable[bytes], encoding: str
+) -> StreamingWordCounter:
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    for chunk in chunks:
+        counter.feed(decoder.decode(chunk))
+    counter.feed(decoder.decode(b"", final=True))
+    counter.close()
+    return counter
+
+
+def extract_streaming(
+    chunks: Iterable[bytes], encoding: str = "utf-8"
+) -> ArticleContent:
+    counter = _feed_streaming(StreamingWordCounter(keep_text=True), chunks, encoding)
+    return ArticleContent(counter.words, counter.text.getvalue().strip())
+
+
+def count_words_streaming(chunks: Iterable[bytes], encoding: str = "utf-8") -> int:
+    return _feed_streaming(StreamingWordCounter(), chunks, encoding).words
+
+
+def extract_newspaper(article_url: str, html: Union[bytes, str]) -> ArticleContent:
     news_article = NewspaperArticle(article_url, keep_article_html=True)
-    news_article.download()
+    news_article.download(input_html=html)
     news_article.parse()
-    striped_article = strip_tags(news_article.article_html)
-    return len(striped_article.strip().split(" "))
+    striped_article = strip_tags(news_article.article_html).strip()
+    return ArticleContent(len(striped_article.split(" ")), striped_article)
+
+
+def count_words_newspaper(article_url: str, html: Union[bytes, str]) -> int:
+    return extract_newspaper(article_url, html).word_count
+
+
+def fetch_article_url(
+    article_url: str, mode: Optional[ExtractionMode] = None
+) -> ArticleContent:
+    # the download goes through the shared pooled client in both modes
+    mode = mode or ExtractionMode(config.WORD_COUNT_MODE)
+    if mode == ExtractionMode.streaming:
+        with http_fetcher.stream(article_url) as page:
+            return extract_streaming(page.chunks, encoding=page.encoding)
+    return extract_newspaper(article_url, http_fetcher.get(article_url))
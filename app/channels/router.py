@@ -1,6 +1,8 @@
-from typing import List
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm.session import Session
+from http import HTTPStatus
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, Query, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.channels import service as ChannelsService
 from app.samples import (
@@ -9,10 +11,19 @@ from app.samples import (
     sample_article_list,
     sample_channel,
     sample_channel_list,
+    sample_channel_summaries,
+    sample_channel_summary,
+)
+from app.schemas import Article, Channel, ChannelCreate, ChannelSummary
+from app.database import get_async_db_session
+from app.versions import ARTICLES, CHANNELS, etag_matches, list_etag_async
+from app.pagination import (
+    DEFAULT_PAGE_LIMIT,
+    MAX_PAGE_LIMIT,
+    NEXT_CURSOR_HEADER,
+    decode_cursor,
+    next_cursor,
 )
-from app.schemas import Article, Channel, ChannelCreate
-from app.database import get_db_session
-
 
 channels_router = APIRouter()
 
@@ -24,20 +35,62 @@ channels_router = APIRouter()
             "model": List[Channel],
             "description": "Channels retreived successfully",
             "content": {"application/json": {"example": sample_channel_list}},
-        }
+            "headers": {
+                "ETag": {
+                    "description": "Weak tag of the list, send it as If-None-Match",
+                    "schema": {"type": "string"},
+                }
+            },
+        },
+        304: {"description": "Channels unchanged since the If-None-Match tag"},
+    },
+)
+async def get_channels(
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db_session),
+) -> List[Channel]:
+    etag = await list_etag_async(db, (CHANNELS,))
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=HTTPStatus.NOT_MODIFIED, headers={"ETag": etag})
+    channels = await ChannelsService.get_channel_rows_async(db_session=db)
+    return ORJSONResponse(channels, headers={"ETag": etag})
+
+
+@channels_router.get(
+    "/summary",
+    responses={
+        200: {
+            "model": List[ChannelSummary],
+            "description": "Article counts and word counts of every channel",
+            "content": {"application/json": {"example": sample_channel_summaries}},
+            "headers": {
+                "ETag": {
+                    "description": "Weak tag of the list, send it as If-None-Match",
+                    "schema": {"type": "string"},
+                }
+            },
+        },
+        304: {"description": "Summaries unchanged since the If-None-Match tag"},
     },
 )
-def get_channels(db: Session = Depends(get_db_session)) -> List[Channel]:
-    return ChannelsService.get_all_channels(db_session=db)
+async def get_channel_summaries(
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db_session),
+) -> List[ChannelSummary]:
+    etag = await list_etag_async(db, (CHANNELS, ARTICLES))
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=HTTPStatus.NOT_MODIFIED, headers={"ETag": etag})
+    summaries = await ChannelsService.get_channel_summary_rows_async(db_session=db)
+    return ORJSONResponse(summaries, headers={"ETag": etag})
 
 
 @channels_router.get(
     "/{channel_id}",
     responses={
         200: {
-            "model": Channel,
+            "model": ChannelSummary,
             "description": "Channel retreived successfully",
-            "content": {"application/json": {"example": sample_channel}},
+            "content": {"application/json": {"example": sample_channel_summary}},
         },
         404: {
             "description": "Channel not found",
@@ -49,8 +102,12 @@ def get_channels(db: Session = Depends(get_db_session)) -> List[Channel]:
         },
     },
 )
-def get_channel(channel_id: int, db: Session = Depends(get_db_session)) -> Channel:
-    return ChannelsService.get_channel_by_id(db_session=db, channel_id=channel_id)
+async def get_channel(
+    channel_id: int, db: AsyncSession = Depends(get_async_db_session)
+) -> ChannelSummary:
+    return await ChannelsService.get_channel_summary_async(
+        db_session=db, channel_id=channel_id
+    )
 
 
 @channels_router.get(
@@ -60,7 +117,18 @@ def get_channel(channel_id: int, db: Session = Depends(get_db_session)) -> Chann
             "model": List[Article],
             "description": "Channel Articles retreived successfully",
             "content": {"application/json": {"example": sample_article_list}},
+            "headers": {
+                NEXT_CURSOR_HEADER: {
+                    "description": "Cursor of the next page, absent on the last page",
+                    "schema": {"type": "string"},
+                },
+                "ETag": {
+                    "description": "Weak tag of this page, send it as If-None-Match",
+                    "schema": {"type": "string"},
+                },
+            },
         },
+        304: {"description": "Articles unchanged since the If-None-Match tag"},
         404: {
             "description": "Channel not found",
             "content": {"application/json": {"example": sample_404}},
@@ -71,10 +139,26 @@ def get_channel(channel_id: int, db: Session = Depends(get_db_session)) -> Chann
         },
     },
 )
-def get_channel_articles(
-    channel_id: int, db: Session = Depends(get_db_session)
+async def get_channel_articles(
+    channel_id: int,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    after: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db_session),
 ) -> List[Article]:
-    return ChannelsService.get_channel_articles(db_session=db, channel_id=channel_id)
+    etag = await list_etag_async(
+        db, (CHANNELS, ARTICLES), channel_id=channel_id, limit=limit, after=after
+    )
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=HTTPStatus.NOT_MODIFIED, headers={"ETag": etag})
+    headers = {"ETag": etag}
+    articles = await ChannelsService.get_channel_article_rows_async(
+        db_session=db, channel_id=channel_id, limit=limit, after=decode_cursor(after)
+    )
+    cursor = next_cursor(articles, limit)
+    if cursor:
+        headers[NEXT_CURSOR_HEADER] = cursor
+    return ORJSONResponse(articles, headers=headers)
 
 
 @channels_router.post(
@@ -91,10 +175,10 @@ def get_channel_articles(
         },
     },
 )
-def add_channel(
-    new_channel: ChannelCreate, db: Session = Depends(get_db_session)
+async def add_channel(
+    new_channel: ChannelCreate, db: AsyncSession = Depends(get_async_db_session)
 ) -> Channel:
-    return ChannelsService.create_channel(
+    return await ChannelsService.create_channel_async(
         db_session=db, new_channel_name=new_channel.name
     )
 
@@ -117,10 +201,10 @@ def add_channel(
         },
     },
 )
-def update_channel(
-    updated_channel: Channel, db: Session = Depends(get_db_session)
+async def update_channel(
+    updated_channel: Channel, db: AsyncSession = Depends(get_async_db_session)
 ) -> Channel:
-    return ChannelsService.update_channel_name(
+    return await ChannelsService.update_channel_name_async(
         db_session=db,
         channel_id=updated_channel.id,
         new_channel_name=updated_channel.name,
@@ -131,10 +215,11 @@ def update_channel(
     "/{channel_id}",
     responses={
         200: {
-            "description": "Channel deleted successfully",
+            "description": "Channel deleted with its articles, or after moving "
+            "them to the move_to channel",
         },
         404: {
-            "description": "Channel not found",
+            "description": "Channel or move_to channel not found",
             "content": {"application/json": {"example": sample_404}},
         },
         422: {
@@ -143,6 +228,12 @@ def update_channel(
         },
     },
 )
-def delete_channel(channel_id: int, db: Session = Depends(get_db_session)) -> str:
-    ChannelsService.delete_channel_by_id(db_session=db, channel_id=channel_id)
+async def delete_channel(
+    channel_id: int,
+    move_to: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db_session),
+) -> str:
+    await ChannelsService.delete_channel_by_id_async(
+        db_session=db, channel_id=channel_id, move_to=move_to
+    )
     return "Channel deleted successfully"
@@ -1,10 +1,42 @@
-from typing import List
+from typing import Dict, List, Optional
 from fastapi import status
 from fastapi.exceptions import HTTPException
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm.session import Session
-from app.db_models import Channel as DbChannel
-from app.schemas import Article as APIArticle, Channel as APIChannel
+from app import config
+from app.articles.service import (
+    ARTICLE_COLUMNS,
+    ARTICLE_FIELDS,
+    BULK_CHUNK_SIZE,
+    article_cache,
+    article_chunk,
+)
+from app.cache import LRUCache
+from app.db_models import (
+    Channel as DbChannel,
+    Article as DbArticle,
+    ChannelSummary as DbChannelSummary,
+)
+from app.schemas import (
+    Article as APIArticle,
+    Channel as APIChannel,
+    ChannelSummary as APIChannelSummary,
+)
+from app.versions import ARTICLES, CHANNELS, bump_version
+
+SUMMARY_COLUMNS = (
+    DbChannelSummary.article_count,
+    DbChannelSummary.word_total,
+    DbChannelSummary.min_words,
+    DbChannelSummary.max_words,
+    DbChannelSummary.last_added_at,
+)
+
+
+channel_cache = LRUCache(
+    max_size=config.ENTITY_CACHE_SIZE, ttl_seconds=config.ENTITY_CACHE_TTL_SECONDS
+)
 
 
 class ChannelException(HTTPException):
@@ -12,31 +44,78 @@ class ChannelException(HTTPException):
 
 
 def get_channel_by_id(db_session: Session, channel_id: int) -> APIChannel:
+    cached_channel = channel_cache.get(channel_id)
+    if cached_channel is not None:
+        return cached_channel
     try:
         db_channel = (
             db_session.query(DbChannel).filter(DbChannel.id == channel_id).first()
         )
-        return APIChannel(id=db_channel.id, name=db_channel.name)
+        api_channel = APIChannel(id=db_channel.id, name=db_channel.name)
+        channel_cache.set(channel_id, api_channel)
+        return api_channel
     except AttributeError:
         raise ChannelException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Channel not found"
         )
 
 
+def get_channel_rows(db_session: Session) -> List[Dict]:
+    # plain dicts from column tuples, serialized directly by the list endpoint
+    rows = db_session.query(DbChannel.id, DbChannel.name)
+    return [dict(id=row.id, name=row.name) for row in rows]
+
+
 def get_all_channels(db_session: Session) -> List[APIChannel]:
-    db_channels = db_session.query(DbChannel).all()
-    api_channels = list()
-    for db_channel in db_channels:
-        api_channels.append(APIChannel(id=db_channel.id, name=db_channel.name))
-    return api_channels
+    return [APIChannel(**row) for row in get_channel_rows(db_session)]
+
+
+def _summary_fields(
+    article_count, word_total, min_words, max_words, last_added_at
+) -> Dict:
+    article_count = article_count or 0
+    return dict(
+        article_count=article_count,
+        total_words=word_total or 0,
+        avg_words=word_total / article_count if article_count else None,
+        min_words=min_words,
+        max_words=max_words,
+        last_added_at=last_added_at,
+    )
+
+
+def get_channel_summary_rows(db_session: Session) -> List[Dict]:
+    # one row per channel from the summary table, articles are never read
+    rows = (
+        db_session.query(DbChannel.id, DbChannel.name, *SUMMARY_COLUMNS)
+        .outerjoin(DbChannelSummary, DbChannelSummary.channel_id == DbChannel.id)
+        .order_by(DbChannel.id)
+    )
+    return [dict(id=row[0], name=row[1], **_summary_fields(*row[2:])) for row in rows]
+
+
+def get_channel_summary(db_session: Session, channel_id: int) -> APIChannelSummary:
+    # the name comes from the channel cache, the counts change with every
+    # article write and are read from their row each time
+    channel = get_channel_by_id(db_session, channel_id=channel_id)
+    row = (
+        db_session.query(*SUMMARY_COLUMNS)
+        .filter(DbChannelSummary.channel_id == channel_id)
+        .first()
+    )
+    return APIChannelSummary(
+        id=channel.id, name=channel.name, **_summary_fields(*(row or (None,) * 5))
+    )
 
 
 def create_channel(db_session: Session, new_channel_name: str) -> APIChannel:
     try:
         db_channel = DbChannel(name=new_channel_name)
         db_session.add(db_channel)
+        bump_version(db_session, CHANNELS)
         db_session.commit()
         db_session.refresh(db_channel)
+        channel_cache.invalidate(db_channel.id)
         return APIChannel(id=db_channel.id, name=db_channel.name)
     except IntegrityError:
         raise ChannelException(
@@ -53,7 +132,9 @@ def update_channel_name(
             db_session.query(DbChannel).filter(DbChannel.id == channel_id).first()
         )
         db_channel.name = new_channel_name
+        bump_version(db_session, CHANNELS)
         db_session.commit()
+        channel_cache.invalidate(channel_id)
         db_session.refresh(db_channel)
         return APIChannel(id=db_channel.id, name=db_channel.name)
     except AttributeError:
@@ -67,37 +148,163 @@ def update_channel_name(
         )
 
 
-def delete_channel_by_id(db_session: Session, channel_id: int):
-    rows_deleted = (
-        db_session.query(DbChannel).filter(DbChannel.id == channel_id).delete()
+def _channel_exists(db_session: Session, channel_id: int) -> bool:
+    return (
+        db_session.query(DbChannel.id).filter(DbChannel.id == channel_id).first()
+        is not None
     )
-    if rows_deleted == 0:
+
+
+def delete_channel_by_id(
+    db_session: Session,
+    channel_id: int,
+    move_to: Optional[int] = None,
+    chunk_size: int = BULK_CHUNK_SIZE,
+):
+    """Delete the channel with its articles, or after moving them to `move_to`.
+
+    The articles are deleted or moved a chunk per transaction, so the write
+    lock is released in between. The channel is deleted in the transaction
+    of the last chunk, no article can be added to it after that chunk.
+    """
+    if not _channel_exists(db_session, channel_id):
         raise ChannelException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Channel not found"
         )
-    db_session.commit()
-
-
-def get_channel_articles(db_session: Session, channel_id: int) -> List[APIArticle]:
-    try:
-        db_articles = (
-            db_session.query(DbChannel)
-            .filter(DbChannel.id == channel_id)
-            .first()
-            .articles
+    if move_to is not None:
+        if move_to == channel_id:
+            raise ChannelException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Articles cannot be moved to the deleted channel",
+            )
+        if not _channel_exists(db_session, move_to):
+            raise ChannelException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Target channel not found",
+            )
+    after = 0
+    while after is not None:
+        # a write first, so the transaction holds the write lock before it
+        # reads the chunk bounds
+        bump_version(db_session, ARTICLES, CHANNELS)
+        chunk, after = article_chunk(
+            db_session, after, chunk_size, channel_id=channel_id
         )
-        api_articles = list()
-        for db_article in db_articles:
-            api_articles.append(
-                APIArticle(
-                    id=db_article.id,
-                    url=db_article.url,
-                    channel_id=db_article.channel_id,
-                    word_count=db_article.word_count,
-                )
+        try:
+            if move_to is None:
+                chunk.delete(synchronize_session=False)
+            else:
+                chunk.update({DbArticle.channel_id: move_to}, synchronize_session=False)
+        except IntegrityError:
+            # the target channel was deleted in the meantime
+            db_session.rollback()
+            raise ChannelException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Target channel not found",
             )
-        return api_articles
-    except AttributeError:
+        if after is None:
+            rows_deleted = (
+                db_session.query(DbChannel).filter(DbChannel.id == channel_id).delete()
+            )
+            if rows_deleted == 0:
+                db_session.rollback()
+                raise ChannelException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Channel not found"
+                )
+        db_session.commit()
+        article_cache.clear()
+    channel_cache.invalidate(channel_id)
+
+
+def get_channel_article_rows(
+    db_session: Session,
+    channel_id: int,
+    limit: Optional[int] = None,
+    after: Optional[int] = None,
+) -> List[Dict]:
+    channel_exists = (
+        db_session.query(DbChannel.id).filter(DbChannel.id == channel_id).first()
+    )
+    if not channel_exists:
         raise ChannelException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Channel not found"
         )
+    # query articles directly instead of loading the whole relationship,
+    # the (channel_id, id) index keeps every page a short range scan
+    query = db_session.query(*ARTICLE_COLUMNS).filter(
+        DbArticle.channel_id == channel_id
+    )
+    if after is not None:
+        query = query.filter(DbArticle.id > after)
+    query = query.order_by(DbArticle.id)
+    if limit is not None:
+        query = query.limit(limit)
+    return [dict(zip(ARTICLE_FIELDS, row)) for row in query]
+
+
+def get_channel_articles(
+    db_session: Session,
+    channel_id: int,
+    limit: Optional[int] = None,
+    after: Optional[int] = None,
+) -> List[APIArticle]:
+    rows = get_channel_article_rows(
+        db_session, channel_id=channel_id, limit=limit, after=after
+    )
+    return [APIArticle(**row) for row in rows]
+
+
+# Async versions for the request path, see app/articles/service.py.
+
+
+async def get_channel_by_id_async(
+    db_session: AsyncSession, channel_id: int
+) -> APIChannel:
+    return await db_session.run_sync(get_channel_by_id, channel_id=channel_id)
+
+
+async def get_channel_rows_async(db_session: AsyncSession) -> List[Dict]:
+    return await db_session.run_sync(get_channel_rows)
+
+
+async def get_channel_summary_rows_async(db_session: AsyncSession) -> List[Dict]:
+    return await db_session.run_sync(get_channel_summary_rows)
+
+
+async def get_channel_summary_async(
+    db_session: AsyncSession, channel_id: int
+) -> APIChannelSummary:
+    return await db_session.run_sync(get_channel_summary, channel_id=channel_id)
+
+
+async def create_channel_async(
+    db_session: AsyncSession, new_channel_name: str
+) -> APIChannel:
+    return await db_session.run_sync(create_channel, new_channel_name=new_channel_name)
+
+
+async def update_channel_name_async(
+    db_session: AsyncSession, channel_id: int, new_channel_name: str
+) -> APIChannel:
+    return await db_session.run_sync(
+        update_channel_name, channel_id=channel_id, new_channel_name=new_channel_name
+    )
+
+
+async def delete_channel_by_id_async(
+    db_session: AsyncSession, channel_id: int, move_to: Optional[int] = None
+):
+    await db_session.run_sync(
+        delete_channel_by_id, channel_id=channel_id, move_to=move_to
+    )
+
+
+async def get_channel_article_rows_async(
+    db_session: AsyncSession,
+    channel_id: int,
+    limit: Optional[int] = None,
+    after: Optional[int] = None,
+) -> List[Dict]:
+    return await db_session.run_sync(
+        get_channel_article_rows, channel_id=channel_id, limit=limit, after=after
+    )
@@ -0,0 +1,56 @@
+import os
+
+# Deployment settings, all overridable through environment variables.
+
+INGESTION_WORKERS = int(os.getenv("INGESTION_WORKERS", "4"))
+INGESTION_MAX_ATTEMPTS = int(os.getenv("INGESTION_MAX_ATTEMPTS", "3"))
+INGESTION_BACKOFF_SECONDS = float(os.getenv("INGESTION_BACKOFF_SECONDS", "2"))
+INGESTION_POLL_SECONDS = float(os.getenv("INGESTION_POLL_SECONDS", "1"))
+INGESTION_LEASE_SECONDS = float(os.getenv("INGESTION_LEASE_SECONDS", "300"))
+
+FETCH_POOL_HOSTS = int(os.getenv("FETCH_POOL_HOSTS", "32"))
+FETCH_PER_HOST_CONCURRENCY = int(os.getenv("FETCH_PER_HOST_CONCURRENCY", "4"))
+# requests per second allowed to a single host, 0 disables rate limiting
+FETCH_PER_HOST_RATE = float(os.getenv("FETCH_PER_HOST_RATE", "5"))
+FETCH_PER_HOST_BURST = int(os.getenv("FETCH_PER_HOST_BURST", "5"))
+FETCH_CONNECT_TIMEOUT = float(os.getenv("FETCH_CONNECT_TIMEOUT", "3.05"))
+FETCH_READ_TIMEOUT = float(os.getenv("FETCH_READ_TIMEOUT", "10"))
+FETCH_USER_AGENT = os.getenv("FETCH_USER_AGENT", "newspaper/0.2.8")
+
+# "newspaper" runs the full newspaper parse, "streaming" counts paragraph words
+# while the body is downloaded, articles can override it per request
+WORD_COUNT_MODE = os.getenv("WORD_COUNT_MODE", "newspaper")
+
+# raw page bodies are kept here to revalidate with conditional requests,
+# an empty value disables the cache
+PAGE_CACHE_DIR = os.getenv("PAGE_CACHE_DIR", "./page_cache")
+PAGE_CACHE_MAX_BYTES = int(os.getenv("PAGE_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# read-through cache of single article/channel lookups, 0 disables it
+ENTITY_CACHE_SIZE = int(os.getenv("ENTITY_CACHE_SIZE", "10000"))
+ENTITY_CACHE_TTL_SECONDS = float(os.getenv("ENTITY_CACHE_TTL_SECONDS", "60"))
+
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./sql_app.db")
+# "performance" (WAL, relaxed fsync, bigger cache, mmap) or "default", which
+# keeps SQLite's own settings; single SQLITE_* variables override the profile
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "performance")
+SQLITE_PRAGMA_OVERRIDES = {
+    pragma: os.environ[f"SQLITE_{pragma.upper()}"]
+    for pragma in (
+        "journal_mode",
+        "synchronous",
+        "cache_size",
+        "mmap_size",
+        "temp_store",
+        "busy_timeout",
+    )
+    if f"SQLITE_{pragma.upper()}" in os.environ
+}
+# connections kept open per process, 0 opens one per session (no pooling)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "8"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "16"))
+
+# development aid: aggregates statement timings for GET /debug/sql and logs
+# statements slower than SLOW_QUERY_MS with their EXPLAIN QUERY PLAN
+SQL_DIAGNOSTICS = os.getenv("SQL_DIAGNOSTICS", "false").lower() in ("1", "true", "yes")
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
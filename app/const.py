@@ -2,3 +2,24 @@ ARTICLE_PREFIX = "/articles"
 CHANNEL_PREFIX = "/channels"
 HTML_SUFFIX = ".html"
 HTM_SUFFIX = ".htm"
+# each URL is bound twice when checking for duplicates, this keeps a full
+# batch under SQLite's historical limit of 999 host parameters per statement
+MAX_BATCH_SIZE = 400
+# article ids accepted by one bulk move, they are bound in chunks of
+# MAX_ID_CHUNK_SIZE to stay under the same limit
+MAX_MOVE_IDS = 50000
+MAX_ID_CHUNK_SIZE = 900
+# word counts are aggregated in fixed-width bins: bin 0 holds 0-50 words,
+# bin 1 holds 51-100 and so on, the last bin collects every longer article
+WORD_COUNT_BIN_WIDTH = 50
+WORD_COUNT_MAX_BIN = 200
+# README buckets, their bounds fall on bin edges: (min_words, max_words)
+WORD_COUNT_BUCKETS = ((0, 100), (101, 500), (501, None))
+# dropped from search queries unless nothing else is left, they match most
+# articles, add almost nothing to BM25 and make FTS5 read huge posting lists
+SEARCH_STOPWORDS = frozenset(
+    (
+        "a an and are as at be but by for if in into is it no not of on or such "
+        "that the their then there these they this to was will with"
+    ).split()
+)
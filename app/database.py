@@ -1,17 +1,155 @@
+import time
+from typing import AsyncIterator, Dict, Optional
 from sqlalchemy import create_engine
+from sqlalchemy.engine.url import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm.session import Session
 from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 from sqlalchemy import event
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./sql_app.db"
+from app import config
+from app.diagnostics import SQLDiagnostics
+from app.metrics import record_sql
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+SQLALCHEMY_DATABASE_URL = config.DATABASE_URL
+
+SQLITE_PROFILES: Dict[str, Dict[str, str]] = {
+    "default": dict(),
+    "performance": dict(
+        # readers no longer block the writer and vice versa
+        journal_mode="WAL",
+        # in WAL mode NORMAL only risks the last commits on power loss
+        synchronous="NORMAL",
+        # negative values are KiB, 64 MiB of page cache per connection
+        cache_size="-65536",
+        mmap_size=str(256 * 1024 * 1024),
+        temp_store="MEMORY",
+        # wait for the write lock instead of failing with "database is locked"
+        busy_timeout="5000",
+    ),
+}
+
+
+def sqlite_pragmas(
+    profile: str, overrides: Optional[Dict[str, str]] = None
+) -> Dict[str, str]:
+    pragmas = dict(SQLITE_PROFILES[profile])
+    pragmas.update(overrides or dict())
+    return pragmas
+
+
+def apply_sqlite_profile(sync_engine: Engine, pragmas: Dict[str, str]):
+    @event.listens_for(sync_engine, "connect")
+    def set_sqlite_pragma(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        for pragma, value in pragmas.items():
+            cursor.execute(f"PRAGMA {pragma}={value}")
+        cursor.close()
+
+
+sql_diagnostics = SQLDiagnostics(
+    enabled=config.SQL_DIAGNOSTICS, slow_query_seconds=config.SLOW_QUERY_MS / 1000
+)
+
+
+def instrument_engine(sync_engine: Engine):
+    # a stack per connection, statements never overlap on one connection
+    # but a failed one never reaches after_cursor_execute
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def start_timer(connection, cursor, statement, parameters, context, executemany):
+        connection.info.setdefault("statement_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def stop_timer(connection, cursor, statement, parameters, context, executemany):
+        seconds = time.perf_counter() - connection.info["statement_started"].pop()
+        record_sql(seconds)
+        if sql_diagnostics.enabled:
+            sql_diagnostics.observe(
+                connection, statement, parameters, executemany, seconds
+            )
+
+    @event.listens_for(sync_engine, "handle_error")
+    def drop_timer(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("statement_started"):
+            connection.info["statement_started"].pop()
+
+
+def create_db_engine(
+    url: str,
+    profile: str = "default",
+    pool_size: int = 0,
+    max_overflow: int = 0,
+    pragma_overrides: Optional[Dict[str, str]] = None,
+) -> Engine:
+    pool_args = dict(poolclass=NullPool)
+    if pool_size:
+        pool_args = dict(
+            poolclass=QueuePool, pool_size=pool_size, max_overflow=max_overflow
+        )
+    new_engine = create_engine(
+        url, connect_args={"check_same_thread": False}, **pool_args
+    )
+    apply_sqlite_profile(new_engine, sqlite_pragmas(profile, pragma_overrides))
+    instrument_engine(new_engine)
+    return new_engine
+
+
+def async_url(url: str) -> str:
+    # same database through the aiosqlite driver
+    return str(make_url(url).set(drivername="sqlite+aiosqlite"))
+
+
+def create_async_db_engine(
+    url: str,
+    profile: str = "default",
+    pool_size: int = 0,
+    max_overflow: int = 0,
+    pragma_overrides: Optional[Dict[str, str]] = None,
+) -> AsyncEngine:
+    pool_args = dict(poolclass=NullPool)
+    if pool_size:
+        pool_args = dict(
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+        )
+    new_engine = create_async_engine(async_url(url), **pool_args)
+    apply_sqlite_profile(
+        new_engine.sync_engine, sqlite_pragmas(profile, pragma_overrides)
+    )
+    instrument_engine(new_engine.sync_engine)
+    return new_engine
+
+
+engine = create_db_engine(
+    SQLALCHEMY_DATABASE_URL,
+    profile=config.SQLITE_PROFILE,
+    pool_size=config.DB_POOL_SIZE,
+    max_overflow=config.DB_MAX_OVERFLOW,
+    pragma_overrides=config.SQLITE_PRAGMA_OVERRIDES,
+)
+async_engine = create_async_db_engine(
+    SQLALCHEMY_DATABASE_URL,
+    profile=config.SQLITE_PROFILE,
+    pool_size=config.DB_POOL_SIZE,
+    max_overflow=config.DB_MAX_OVERFLOW,
+    pragma_overrides=config.SQLITE_PRAGMA_OVERRIDES,
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# committed objects stay readable outside run_sync, where no lazy load can run
+AsyncSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+    bind=async_engine,
+    class_=AsyncSession,
+)
 Base = declarative_base()
 
 
@@ -23,8 +161,6 @@ def get_db_session() -> Session:
         db_session.close()
 
 
-@event.listens_for(Engine, "connect")
-def set_sqlite_pragma(dbapi_connection, connection_record):
-    cursor = dbapi_connection.cursor()
-    cursor.execute("PRAGMA foreign_keys=ON")
-    cursor.close()
+async def get_async_db_session() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db_session:
+        yield db_session
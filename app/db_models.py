@@ -1,5 +1,9 @@
-from sqlalchemy import Column, ForeignKey, Integer, String
+from datetime import datetime
+from sqlalchemy import DDL, Column, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy import event
 from sqlalchemy.orm import relationship
+from app.articles.urls import url_hash
+from app.const import WORD_COUNT_BIN_WIDTH, WORD_COUNT_MAX_BIN
 from app.database import Base
 
 
@@ -12,12 +16,353 @@ class Channel(Base):
     articles = relationship("Article", back_populates="parent_channel")
 
 
+def _url_hash_default(context) -> int:
+    return url_hash(context.get_current_parameters()["url"])
+
+
 class Article(Base):
     __tablename__ = "articles"
 
     id = Column(Integer, primary_key=True, index=True)
-    url = Column(String, index=True, unique=True)
+    url = Column(String)
+    # duplicates are detected on the hash of the canonical URL, NULL only for
+    # rows that already were duplicates when the hash was introduced
+    url_hash = Column(Integer, index=True, unique=True, default=_url_hash_default)
     word_count = Column(Integer, index=True)
-    channel_id = Column(Integer, ForeignKey("channels.id"))
+    channel_id = Column(Integer, ForeignKey("channels.id"), index=True)
 
     parent_channel = relationship("Channel", back_populates="articles")
+
+    # the channel summary triggers find a channel's shortest and longest
+    # article with one seek each
+    __table_args__ = (
+        Index("ix_articles_channel_word_count", "channel_id", "word_count"),
+    )
+
+
+class ArticleText(Base):
+    """Stripped main text of an article, indexed by `article_texts_fts`.
+
+    Kept apart from `articles` so listing and counting articles never reads
+    the text. Rows are removed together with their article by a trigger.
+    """
+
+    __tablename__ = "article_texts"
+
+    article_id = Column(Integer, primary_key=True)
+    content = Column(String, nullable=False)
+
+
+class IngestionJob(Base):
+    __tablename__ = "ingestion_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    url = Column(String, nullable=False)
+    url_hash = Column(Integer, index=True, default=_url_hash_default)
+    # no foreign key: a pending job must not block deleting its channel
+    channel_id = Column(Integer, nullable=False)
+    extraction_mode = Column(String, nullable=True)
+    status = Column(String, nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(String, nullable=True)
+    article_id = Column(Integer, nullable=True)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    locked_until = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = Column(
+        DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+    __table_args__ = (Index("ix_ingestion_jobs_claim", "status", "next_attempt_at"),)
+
+
+class DataVersion(Base):
+    __tablename__ = "data_versions"
+
+    # bumped in the same transaction as every write to `table_name`
+    table_name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+class WordCountBin(Base):
+    """Article count and word total per channel and word count bin.
+
+    Maintained by triggers on `articles`, so every write path keeps it exact
+    and statistics never need to scan the articles table.
+    """
+
+    __tablename__ = "article_word_count_bins"
+
+    channel_id = Column(Integer, primary_key=True)
+    bin = Column(Integer, primary_key=True)
+    article_count = Column(Integer, nullable=False, default=0)
+    word_total = Column(Integer, nullable=False, default=0)
+
+
+class ChannelSummary(Base):
+    """Article count and word count totals of a channel.
+
+    Maintained by triggers on `articles` like the word count bins, so the
+    channel summaries are read without scanning the articles table.
+    """
+
+    __tablename__ = "channel_summaries"
+
+    channel_id = Column(Integer, primary_key=True)
+    article_count = Column(Integer, nullable=False, default=0)
+    word_total = Column(Integer, nullable=False, default=0)
+    min_words = Column(Integer, nullable=True)
+    max_words = Column(Integer, nullable=True)
+    # when an article was last stored in or moved to the channel, NULL for
+    # channels whose articles predate the summary table
+    last_added_at = Column(DateTime, nullable=True)
+
+
+def _bin_sql(row: str) -> str:
+    return (
+        f"MIN((MAX(COALESCE({row}.word_count, 0), 1) - 1) / {WORD_COUNT_BIN_WIDTH}, "
+        f"{WORD_COUNT_MAX_BIN})"
+    )
+
+
+def _add_to_bin_sql(row: str) -> str:
+    return f"""
+    INSERT INTO article_word_count_bins (channel_id, bin, article_count, word_total)
+    VALUES (COALESCE({row}.channel_id, 0), {_bin_sql(row)}, 1,
+            COALESCE({row}.word_count, 0))
+    ON CONFLICT (channel_id, bin) DO UPDATE SET
+        article_count = article_count + 1,
+        word_total = word_total + excluded.word_total;
+    """
+
+
+def _remove_from_bin_sql(row: str) -> str:
+    return f"""
+    UPDATE article_word_count_bins SET
+        article_count = article_count - 1,
+        word_total = word_total - COALESCE({row}.word_count, 0)
+    WHERE channel_id = COALESCE({row}.channel_id, 0) AND bin = {_bin_sql(row)};
+    """
+
+
+WORD_COUNT_BIN_INSERT_TRIGGER = "articles_word_count_bins_insert"
+WORD_COUNT_BIN_TRIGGERS = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {WORD_COUNT_BIN_INSERT_TRIGGER}
+    AFTER INSERT ON articles BEGIN {_add_to_bin_sql("NEW")} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS articles_word_count_bins_delete
+    AFTER DELETE ON articles BEGIN {_remove_from_bin_sql("OLD")} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS articles_word_count_bins_update
+    AFTER UPDATE OF channel_id, word_count ON articles BEGIN
+    {_remove_from_bin_sql("OLD")} {_add_to_bin_sql("NEW")} END
+    """,
+)
+
+# fills the bins of a database whose articles predate the summary table
+BACKFILL_WORD_COUNT_BINS = f"""
+INSERT INTO article_word_count_bins (channel_id, bin, article_count, word_total)
+SELECT COALESCE(channel_id, 0), {_bin_sql("articles")}, COUNT(*),
+       COALESCE(SUM(word_count), 0)
+FROM articles
+WHERE NOT EXISTS (SELECT 1 FROM article_word_count_bins)
+GROUP BY 1, 2
+"""
+
+# adds the articles with ids above :after_id to the bins in one statement, for
+# bulk inserts that run without the insert trigger
+ADD_NEW_ARTICLES_TO_WORD_COUNT_BINS = f"""
+INSERT INTO article_word_count_bins (channel_id, bin, article_count, word_total)
+SELECT COALESCE(channel_id, 0), {_bin_sql("articles")}, COUNT(*),
+       COALESCE(SUM(word_count), 0)
+FROM articles
+WHERE id > :after_id
+GROUP BY 1, 2
+ON CONFLICT (channel_id, bin) DO UPDATE SET
+    article_count = article_count + excluded.article_count,
+    word_total = word_total + excluded.word_total
+"""
+
+
+@event.listens_for(Base.metadata, "after_create")
+def create_word_count_bin_triggers(target, connection, **kw):
+    for trigger in WORD_COUNT_BIN_TRIGGERS:
+        connection.execute(DDL(trigger))
+    connection.execute(DDL(BACKFILL_WORD_COUNT_BINS))
+
+
+# UTC like the datetime.utcnow defaults, in the format of DateTime columns
+SQLITE_UTC_NOW = "datetime('now')"
+# a moved article counts as added to its new channel
+MOVED_AT = f"CASE WHEN OLD.channel_id IS NOT NEW.channel_id THEN {SQLITE_UTC_NOW} END"
+
+
+def _add_to_summary_sql(row: str, added_at: str) -> str:
+    # an empty summary has NULL bounds, which the CASEs replace
+    return f"""
+    INSERT INTO channel_summaries (channel_id, article_count, word_total,
+                                   min_words, max_words, last_added_at)
+    SELECT {row}.channel_id, 1, COALESCE({row}.word_count, 0), {row}.word_count,
+           {row}.word_count, {added_at}
+    WHERE {row}.channel_id IS NOT NULL
+    ON CONFLICT (channel_id) DO UPDATE SET
+        article_count = article_count + 1,
+        word_total = word_total + excluded.word_total,
+        min_words = CASE WHEN min_words IS NULL OR excluded.min_words < min_words
+                    THEN excluded.min_words ELSE min_words END,
+        max_words = CASE WHEN max_words IS NULL OR excluded.max_words > max_words
+                    THEN excluded.max_words ELSE max_words END,
+        last_added_at = COALESCE(excluded.last_added_at, last_added_at);
+    """
+
+
+def _remove_from_summary_sql(row: str) -> str:
+    # the bounds are only read again when the removed article was one of them
+    return f"""
+    UPDATE channel_summaries SET
+        article_count = article_count - 1,
+        word_total = word_total - COALESCE({row}.word_count, 0)
+    WHERE channel_id = {row}.channel_id;
+    UPDATE channel_summaries SET
+        min_words = (SELECT MIN(word_count) FROM articles
+                     WHERE channel_id = {row}.channel_id),
+        max_words = (SELECT MAX(word_count) FROM articles
+                     WHERE channel_id = {row}.channel_id)
+    WHERE channel_id = {row}.channel_id
+        AND ({row}.word_count <= min_words OR {row}.word_count >= max_words);
+    """
+
+
+CHANNEL_SUMMARY_INSERT_TRIGGER = "articles_channel_summaries_insert"
+CHANNEL_SUMMARY_TRIGGERS = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {CHANNEL_SUMMARY_INSERT_TRIGGER}
+    AFTER INSERT ON articles BEGIN {_add_to_summary_sql("NEW", SQLITE_UTC_NOW)} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS articles_channel_summaries_delete
+    AFTER DELETE ON articles BEGIN {_remove_from_summary_sql("OLD")} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS articles_channel_summaries_update
+    AFTER UPDATE OF channel_id, word_count ON articles BEGIN
+    {_remove_from_summary_sql("OLD")} {_add_to_summary_sql("NEW", MOVED_AT)} END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS channels_channel_summaries_delete
+    AFTER DELETE ON channels BEGIN
+    DELETE FROM channel_summaries WHERE channel_id = OLD.id;
+    END
+    """,
+)
+
+# fills the summaries of a database whose articles predate the table
+BACKFILL_CHANNEL_SUMMARIES = """
+INSERT INTO channel_summaries (channel_id, article_count, word_total, min_words,
+                               max_words)
+SELECT channel_id, COUNT(*), COALESCE(SUM(word_count), 0), MIN(word_count),
+       MAX(word_count)
+FROM articles
+WHERE channel_id IS NOT NULL AND NOT EXISTS (SELECT 1 FROM channel_summaries)
+GROUP BY channel_id
+"""
+
+# adds the articles with ids above :after_id to the summaries in one
+# statement, for bulk inserts that run without the insert trigger
+ADD_NEW_ARTICLES_TO_CHANNEL_SUMMARIES = f"""
+INSERT INTO channel_summaries (channel_id, article_count, word_total, min_words,
+                               max_words, last_added_at)
+SELECT channel_id, COUNT(*), COALESCE(SUM(word_count), 0), MIN(word_count),
+       MAX(word_count), {SQLITE_UTC_NOW}
+FROM articles
+WHERE id > :after_id AND channel_id IS NOT NULL
+GROUP BY channel_id
+ON CONFLICT (channel_id) DO UPDATE SET
+    article_count = article_count + excluded.article_count,
+    word_total = word_total + excluded.word_total,
+    min_words = CASE WHEN min_words IS NULL OR excluded.min_words < min_words
+                THEN excluded.min_words ELSE min_words END,
+    max_words = CASE WHEN max_words IS NULL OR excluded.max_words > max_words
+                THEN excluded.max_words ELSE max_words END,
+    last_added_at = excluded.last_added_at
+"""
+
+# per-row insert triggers that bulk inserts drop while they write a batch:
+# (trigger name, statement recreating it, statement catching up on the batch)
+BULK_INSERT_TRIGGERS = (
+    (
+        WORD_COUNT_BIN_INSERT_TRIGGER,
+        WORD_COUNT_BIN_TRIGGERS[0],
+        ADD_NEW_ARTICLES_TO_WORD_COUNT_BINS,
+    ),
+    (
+        CHANNEL_SUMMARY_INSERT_TRIGGER,
+        CHANNEL_SUMMARY_TRIGGERS[0],
+        ADD_NEW_ARTICLES_TO_CHANNEL_SUMMARIES,
+    ),
+)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def create_channel_summary_triggers(target, connection, **kw):
+    for trigger in CHANNEL_SUMMARY_TRIGGERS:
+        connection.execute(DDL(trigger))
+    connection.execute(DDL(BACKFILL_CHANNEL_SUMMARIES))
+
+
+# external content FTS5 index: the text is stored once in article_texts and
+# the index only keeps the tokens, the triggers keep both in sync
+ARTICLE_TEXTS_FTS = "article_texts_fts"
+CREATE_ARTICLE_TEXTS_FTS = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {ARTICLE_TEXTS_FTS} USING fts5(
+    content, content='article_texts', content_rowid='article_id',
+    tokenize='porter unicode61 remove_diacritics 2'
+)
+"""
+ARTICLE_TEXT_TRIGGERS = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS article_texts_fts_insert
+    AFTER INSERT ON article_texts BEGIN
+    INSERT INTO {ARTICLE_TEXTS_FTS} (rowid, content)
+    VALUES (NEW.article_id, NEW.content);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS article_texts_fts_delete
+    AFTER DELETE ON article_texts BEGIN
+    INSERT INTO {ARTICLE_TEXTS_FTS} ({ARTICLE_TEXTS_FTS}, rowid, content)
+    VALUES ('delete', OLD.article_id, OLD.content);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS article_texts_fts_update
+    AFTER UPDATE ON article_texts BEGIN
+    INSERT INTO {ARTICLE_TEXTS_FTS} ({ARTICLE_TEXTS_FTS}, rowid, content)
+    VALUES ('delete', OLD.article_id, OLD.content);
+    INSERT INTO {ARTICLE_TEXTS_FTS} (rowid, content)
+    VALUES (NEW.article_id, NEW.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS articles_texts_delete
+    AFTER DELETE ON articles BEGIN
+    DELETE FROM article_texts WHERE article_id = OLD.id;
+    END
+    """,
+)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def create_article_texts_fts(target, connection, **kw):
+    connection.execute(DDL(CREATE_ARTICLE_TEXTS_FTS))
+    for trigger in ARTICLE_TEXT_TRIGGERS:
+        connection.execute(DDL(trigger))
+
+
+@event.listens_for(Base.metadata, "before_drop")
+def drop_article_texts_fts(target, connection, **kw):
+    # not part of the metadata, it would outlive the text it indexes
+    connection.execute(DDL(f"DROP TABLE IF EXISTS {ARTICLE_TEXTS_FTS}"))
@@ -0,0 +1,99 @@
+import logging
+import threading
+from typing import Dict, List, Optional
+
+from app.metrics import current_request_sql
+from app.schemas import SQLStatementStats
+
+logger = logging.getLogger(__name__)
+
+# distinct statements tracked, later ones are only logged when slow
+MAX_TRACKED_STATEMENTS = 1000
+MAX_LOGGED_PARAMETERS = 500
+
+
+def full_scan(plan: List[str]) -> bool:
+    # SCAN walks a whole table or index (in its order), SEARCH seeks a range
+    return any(
+        step.startswith("SCAN ") and step != "SCAN CONSTANT ROW" for step in plan
+    )
+
+
+class SQLDiagnostics:
+    """Opt-in statement statistics and slow-query log for the SQLite engines.
+
+    Every statement is aggregated by its SQL text. Statements slower than
+    `slow_query_seconds` are logged together with their parameters, the route
+    of the request that ran them and SQLite's `EXPLAIN QUERY PLAN`, which is
+    also kept for the top-N listing.
+    """
+
+    def __init__(self, enabled: bool, slow_query_seconds: float):
+        self.enabled = enabled
+        self.slow_query_seconds = slow_query_seconds
+        self._statements: Dict[str, SQLStatementStats] = dict()
+        self._lock = threading.Lock()
+
+    def observe(
+        self, connection, statement: str, parameters, executemany: bool, seconds: float
+    ):
+        request_sql = current_request_sql.get()
+        route = f"{request_sql.method} {request_sql.route}" if request_sql else None
+        slow = seconds >= self.slow_query_seconds
+        plan = None
+        if slow and not executemany:
+            plan = self._explain(connection, statement, parameters)
+        with self._lock:
+            stats = self._statements.get(statement)
+            if stats is None and len(self._statements) < MAX_TRACKED_STATEMENTS:
+                stats = SQLStatementStats(statement=statement)
+                self._statements[statement] = stats
+            if stats is not None:
+                stats.calls += 1
+                stats.total_ms += seconds * 1000
+                stats.max_ms = max(stats.max_ms, seconds * 1000)
+                if slow:
+                    stats.slow_calls += 1
+                    stats.last_slow_route = route
+                if plan is not None:
+                    stats.plan = plan
+                    stats.full_scan = full_scan(plan)
+        if slow:
+            logger.warning(
+                "Slow SQL statement (%.1f ms%s) on %s: %s parameters=%s plan=%s",
+                seconds * 1000,
+                ", full table scan" if plan and full_scan(plan) else "",
+                route or "no request",
+                statement,
+                repr(parameters)[:MAX_LOGGED_PARAMETERS],
+                plan,
+            )
+
+    @staticmethod
+    def _explain(connection, statement: str, parameters) -> Optional[List[str]]:
+        # a separate DBAPI cursor, so the plan query bypasses the engine hooks
+        cursor = connection.connection.cursor()
+        try:
+            cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            return [row[3] for row in cursor.fetchall()]
+        except Exception:
+            logger.exception("Could not explain %s", statement)
+            return None
+        finally:
+            cursor.close()
+
+    def top_statements(self, limit: int) -> List[SQLStatementStats]:
+        with self._lock:
+            statements = sorted(
+                self._statements.values(),
+                key=lambda stats: stats.total_ms,
+                reverse=True,
+            )
+            top = [stats.copy() for stats in statements[:limit]]
+        for stats in top:
+            stats.mean_ms = stats.total_ms / stats.calls
+        return top
+
+    def clear(self):
+        with self._lock:
+            self._statements.clear()
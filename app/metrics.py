@@ -0,0 +1,149 @@
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+UNMATCHED_ROUTE = "unmatched"
+SQL_STATEMENT_BUCKETS = (0, 1, 2, 3, 4, 5, 8, 13, 21, 34, 55, 89)
+
+# own registry, so only what the app records is exposed at /metrics
+registry = CollectorRegistry()
+
+http_requests = Counter(
+    "http_requests_total",
+    "Requests served, by route template and status code",
+    ["method", "route", "status"],
+    registry=registry,
+)
+http_request_duration = Histogram(
+    "http_request_duration_seconds",
+    "Time until the last byte of the response was sent",
+    ["method", "route"],
+    registry=registry,
+)
+http_requests_in_progress = Gauge(
+    "http_requests_in_progress",
+    "Requests currently being served",
+    ["method", "route"],
+    registry=registry,
+)
+http_request_sql_statements = Histogram(
+    "http_request_sql_statements",
+    "SQL statements executed while serving one request",
+    ["method", "route"],
+    buckets=SQL_STATEMENT_BUCKETS,
+    registry=registry,
+)
+http_request_sql_duration = Histogram(
+    "http_request_sql_duration_seconds",
+    "Time spent in SQL statements while serving one request",
+    ["method", "route"],
+    registry=registry,
+)
+sql_statements = Counter(
+    "sql_statements_total",
+    "SQL statements executed by the process, requests and workers alike",
+    registry=registry,
+)
+sql_duration = Counter(
+    "sql_duration_seconds_total",
+    "Time spent in SQL statements by the process",
+    registry=registry,
+)
+ingestion_fetch_duration = Histogram(
+    "ingestion_fetch_duration_seconds",
+    "Time to fetch, count and store one article, by job outcome",
+    ["outcome"],
+    registry=registry,
+)
+ingestion_jobs = Counter(
+    "ingestion_jobs_total",
+    "Ingestion attempts by result: done, retried or failed",
+    ["result"],
+    registry=registry,
+)
+ingestion_queue_depth = Gauge(
+    "ingestion_queue_depth",
+    "Ingestion jobs pending or running, read from the database on scrape",
+    registry=registry,
+)
+
+
+class RequestSQL:
+    __slots__ = ("method", "route", "statements", "seconds")
+
+    def __init__(self, method: str, route: str):
+        self.method = method
+        self.route = route
+        self.statements = 0
+        self.seconds = 0.0
+
+
+# statements of the request being served, None outside of a request
+current_request_sql: ContextVar[Optional[RequestSQL]] = ContextVar(
+    "current_request_sql", default=None
+)
+
+
+def record_sql(seconds: float):
+    """Called by the engine hooks for every executed statement."""
+    sql_statements.inc()
+    sql_duration.inc(seconds)
+    request_sql = current_request_sql.get()
+    if request_sql is not None:
+        request_sql.statements += 1
+        request_sql.seconds += seconds
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording the HTTP and per-request SQL metrics.
+
+    Requests are labelled with the route template (`/articles/{article_id}`)
+    rather than the raw path, so the number of series stays bounded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    def _route(self, scope: Scope) -> str:
+        for route in scope["app"].router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+        return UNMATCHED_ROUTE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        route = self._route(scope)
+        status = 500
+        request_sql = RequestSQL(method, route)
+        token = current_request_sql.set(request_sql)
+        in_progress = http_requests_in_progress.labels(method, route)
+        in_progress.inc()
+        started = time.perf_counter()
+
+        async def send_with_status(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_progress.dec()
+            current_request_sql.reset(token)
+            http_request_duration.labels(method, route).observe(
+                time.perf_counter() - started
+            )
+            http_requests.labels(method, route, str(status)).inc()
+            http_request_sql_statements.labels(method, route).observe(
+                request_sql.statements
+            )
+            http_request_sql_duration.labels(method, route).observe(request_sql.seconds)
@@ -0,0 +1,109 @@
+"""Schema changes for databases created by earlier versions of the app.
+
+`Base.metadata.create_all` only creates missing tables, new columns and
+indexes of existing tables are added here. `PRAGMA user_version` counts the
+steps applied so far. Every step runs in one immediate transaction, so
+workers starting together apply it once. Each step also handles a database
+that create_all has just built in its latest form.
+"""
+
+import logging
+from typing import Callable, List, Set
+
+from sqlalchemy.engine import Engine
+
+from app.articles.urls import url_hash
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_BATCH_SIZE = 10000
+
+
+def _columns(cursor, table: str) -> Set[str]:
+    return {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+
+
+def _backfill_url_hashes(cursor, table: str, unique: bool) -> int:
+    """Hash the URLs of `table`, return how many rows were left without one.
+
+    With `unique`, only the oldest row of URLs that turn out to be
+    duplicates once canonicalized gets the hash, the index could not be
+    created otherwise and rows are never deleted by a migration.
+    """
+    seen = set()
+    if unique:
+        hashed = cursor.execute(
+            f"SELECT url_hash FROM {table} WHERE url_hash IS NOT NULL"
+        )
+        seen = {row[0] for row in hashed}
+    rows = cursor.execute(
+        f"SELECT id, url FROM {table} WHERE url_hash IS NULL ORDER BY id"
+    ).fetchall()
+    updates = list()
+    duplicates = 0
+    for row_id, url in rows:
+        row_hash = url_hash(url or "")
+        if unique:
+            if row_hash in seen:
+                duplicates += 1
+                continue
+            seen.add(row_hash)
+        updates.append((row_hash, row_id))
+    for start in range(0, len(updates), BACKFILL_BATCH_SIZE):
+        cursor.executemany(
+            f"UPDATE {table} SET url_hash = ? WHERE id = ?",
+            updates[start : start + BACKFILL_BATCH_SIZE],
+        )
+    return duplicates
+
+
+def add_url_hashes(cursor):
+    # duplicates are found on the hash of the canonical URL instead of a
+    # unique index on the raw URL string
+    for table, unique in (("articles", True), ("ingestion_jobs", False)):
+        if "url_hash" not in _columns(cursor, table):
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN url_hash INTEGER")
+        duplicates = _backfill_url_hashes(cursor, table, unique)
+        if duplicates:
+            logger.warning(
+                "%s %s duplicate an older row once canonicalized and keep no "
+                "URL hash",
+                duplicates,
+                table,
+            )
+        cursor.execute(
+            f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS "
+            f"ix_{table}_url_hash ON {table} (url_hash)"
+        )
+        cursor.execute(f"DROP INDEX IF EXISTS ix_{table}_url")
+
+
+def add_channel_word_count_index(cursor):
+    # lets the channel summary triggers find a channel's bounds with a seek
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS ix_articles_channel_word_count "
+        "ON articles (channel_id, word_count)"
+    )
+
+
+MIGRATIONS: List[Callable] = [add_url_hashes, add_channel_word_count_index]
+
+
+def migrate(db_engine: Engine):
+    """Apply the steps that `db_engine`'s database has not seen yet."""
+    # a raw DBAPI connection, so no statement commits the transaction early
+    connection = db_engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        version = cursor.execute("PRAGMA user_version").fetchone()[0]
+        for number, step in enumerate(MIGRATIONS[version:], start=version + 1):
+            logger.info("Applying migration %s: %s", number, step.__name__)
+            step(cursor)
+            cursor.execute(f"PRAGMA user_version = {number}")
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
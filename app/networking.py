@@ -3,6 +3,9 @@ from fastapi import FastAPI
 from app import __version__
 from app.channels.router import channels_router
 from app.articles.router import articles_router
+from app.articles.ingestion import ingestion_pool
+from app.database import async_engine
+from app.metrics import MetricsMiddleware
 from app.router import api_router
 from app.const import ARTICLE_PREFIX, CHANNEL_PREFIX
 
@@ -12,7 +15,24 @@ app = FastAPI(
     description="Application API for Qvik Backend challenge",
 )
 
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(api_router)
 app.include_router(articles_router, prefix=ARTICLE_PREFIX, tags=["Articles"])
 app.include_router(channels_router, prefix=CHANNEL_PREFIX, tags=["Channels"])
+
+
+@app.on_event("startup")
+def start_ingestion():
+    # resumes whatever was left queued by a previous run
+    ingestion_pool.start()
+
+
+@app.on_event("shutdown")
+def stop_ingestion():
+    ingestion_pool.stop()
+
+
+@app.on_event("shutdown")
+async def close_async_engine():
+    await async_engine.dispose()
@@ -0,0 +1,81 @@
+import base64
+import binascii
+from typing import Optional, Sequence, Tuple
+from fastapi import status
+from fastapi.exceptions import HTTPException
+
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class CursorException(HTTPException):
+    pass
+
+
+def _encode(value: str) -> str:
+    return base64.urlsafe_b64encode(value.encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> str:
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        return base64.urlsafe_b64decode(cursor + padding).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        raise CursorException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid cursor"
+        )
+
+
+# Cursors are opaque to clients, they only wrap the id of the last row
+# of the previous page so the next page can seek past it on the primary key
+# index instead of counting rows with OFFSET.
+def encode_cursor(last_id: int) -> str:
+    return _encode(str(last_id))
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    if cursor is None:
+        return None
+    try:
+        return int(_decode(cursor))
+    except ValueError:
+        raise CursorException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid cursor"
+        )
+
+
+# Search results are ordered by rank, their cursors also carry the rank of
+# the last row. repr() round-trips floats exactly, so the next page seeks
+# past the very same value.
+def encode_search_cursor(rank: float, last_id: int) -> str:
+    return _encode(f"{rank!r}:{last_id}")
+
+
+def decode_search_cursor(cursor: Optional[str]) -> Optional[Tuple[float, int]]:
+    if cursor is None:
+        return None
+    try:
+        rank, last_id = _decode(cursor).split(":")
+        return float(rank), int(last_id)
+    except ValueError:
+        raise CursorException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid cursor"
+        )
+
+
+def next_cursor(items: Sequence, limit: Optional[int]) -> Optional[str]:
+    # a full page means there might be more rows after it
+    if limit is None or len(items) < limit:
+        return None
+    last_item = items[-1]
+    # pages are either API models or plain rows from the fast list path
+    if isinstance(last_item, dict):
+        return encode_cursor(last_item["id"])
+    return encode_cursor(last_item.id)
+
+
+def next_search_cursor(rows: Sequence[dict], limit: int) -> Optional[str]:
+    if len(rows) < limit:
+        return None
+    return encode_search_cursor(rows[-1]["rank"], rows[-1]["id"])
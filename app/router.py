@@ -1,13 +1,22 @@
-from fastapi import APIRouter
+from typing import List
+from fastapi import APIRouter, Query, Response
+from prometheus_client import CONTENT_TYPE_LATEST
 
 from app.database import Base, engine
-from app.schemas import Message
-from app.samples import sample_index_message
-from app.service import get_sample_index
+from app.migrations import migrate
+from app.schemas import Message, SQLStatementStats
+from app.samples import (
+    sample_404,
+    sample_index_message,
+    sample_metrics,
+    sample_top_statements,
+)
+from app.service import get_metrics, get_sample_index, get_top_statements
 
 api_router = APIRouter()
 
 Base.metadata.create_all(bind=engine)
+migrate(engine)
 
 
 @api_router.get(
@@ -23,3 +32,38 @@ Base.metadata.create_all(bind=engine)
 )
 def index() -> Message:
     return get_sample_index()
+
+
+@api_router.get(
+    "/metrics",
+    tags=["Metrics"],
+    response_class=Response,
+    responses={
+        200: {
+            "description": "Request, SQL and ingestion metrics in Prometheus format",
+            "content": {CONTENT_TYPE_LATEST: {"example": sample_metrics}},
+        }
+    },
+)
+def metrics() -> Response:
+    return Response(get_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+
+@api_router.get(
+    "/debug/sql",
+    tags=["Debug"],
+    responses={
+        200: {
+            "model": List[SQLStatementStats],
+            "description": "Statements with the highest total time, "
+            "only served when SQL_DIAGNOSTICS is enabled",
+            "content": {"application/json": {"example": sample_top_statements}},
+        },
+        404: {
+            "description": "SQL diagnostics are disabled",
+            "content": {"application/json": {"example": sample_404}},
+        },
+    },
+)
+def top_statements(limit: int = Query(10, ge=1, le=100)) -> List[SQLStatementStats]:
+    return get_top_statements(limit=limit)
@@ -1,5 +1,32 @@
 sample_index_message = {"message": "Some message"}
 
+sample_top_statements = [
+    {
+        "statement": "SELECT articles.id, articles.url, articles.channel_id, "
+        "articles.word_count FROM articles WHERE articles.word_count >= ? "
+        "AND articles.word_count <= ? ORDER BY articles.id LIMIT ? OFFSET ?",
+        "calls": 120,
+        "total_ms": 5400.0,
+        "mean_ms": 45.0,
+        "max_ms": 180.2,
+        "slow_calls": 8,
+        "last_slow_route": "GET /articles/",
+        "plan": ["SCAN articles"],
+        "full_scan": True,
+    }
+]
+
+sample_metrics = """# HELP http_requests_total Requests served, by route template and status code
+# TYPE http_requests_total counter
+http_requests_total{method="GET",route="/articles/{article_id}",status="200"} 42.0
+# HELP http_request_sql_statements SQL statements executed while serving one request
+# TYPE http_request_sql_statements histogram
+http_request_sql_statements_bucket{le="1.0",method="GET",route="/articles/{article_id}"} 42.0
+# HELP ingestion_queue_depth Ingestion jobs pending or running, read from the database on scrape
+# TYPE ingestion_queue_depth gauge
+ingestion_queue_depth 3.0
+"""
+
 sample_channel = {"id": 1, "name": "Science"}
 
 sample_channel_list = [
@@ -8,6 +35,31 @@ sample_channel_list = [
     {"id": 3, "name": "Romance"},
 ]
 
+sample_channel_summary = {
+    "id": 1,
+    "name": "Science",
+    "article_count": 2,
+    "total_words": 400,
+    "avg_words": 200.0,
+    "min_words": 150,
+    "max_words": 250,
+    "last_added_at": "2021-10-06T14:02:11",
+}
+
+sample_channel_summaries = [
+    sample_channel_summary,
+    {
+        "id": 2,
+        "name": "Fiction",
+        "article_count": 0,
+        "total_words": 0,
+        "avg_words": None,
+        "min_words": None,
+        "max_words": None,
+        "last_added_at": None,
+    },
+]
+
 sample_404 = {"detail": "Not found"}
 
 sample_422 = {
@@ -42,7 +94,90 @@ sample_article_list = [
     },
 ]
 
-sample_bckgrnd = "Article will be fetched and created in the background"
+sample_search_results = [
+    {
+        "id": 2,
+        "url": "http://example.com/article2.html",
+        "word_count": 250,
+        "channel_id": 1,
+        "rank": -4.21,
+        "snippet": "…the <b>election</b> results were announced on Sunday…",
+    },
+    {
+        "id": 1,
+        "url": "http://example.com/article1.html",
+        "word_count": 150,
+        "channel_id": 1,
+        "rank": -1.87,
+        "snippet": "…a second <b>election</b> round is expected…",
+    },
+]
+
+sample_articles_deleted = {"deleted": 1200}
+
+sample_articles_moved = {"moved": 850}
+
+sample_stats = {
+    "count": 2,
+    "min_words": 150,
+    "max_words": 250,
+    "mean_words": 200.0,
+    "percentiles": {"p50": 150.0, "p90": 246.0, "p95": 248.0, "p99": 250.0},
+    "buckets": [
+        {"min_words": 0, "max_words": 100, "count": 0},
+        {"min_words": 101, "max_words": 500, "count": 2},
+        {"min_words": 501, "max_words": None, "count": 0},
+    ],
+    "channels": [{"channel_id": 1, "count": 2}],
+}
+
+sample_export_ndjson = (
+    '{"id": 1, "url": "http://example.com/article1.html", "channel_id": 1, "word_count": 150}\n'
+    '{"id": 2, "url": "http://example.com/article2.html", "channel_id": 1, "word_count": 250}\n'
+)
+
+sample_export_csv = (
+    "id,url,channel_id,word_count\r\n"
+    "1,http://example.com/article1.html,1,150\r\n"
+    "2,http://example.com/article2.html,1,250\r\n"
+)
+
+sample_job = {
+    "id": 1,
+    "url": "http://example.com/article1.html",
+    "channel_id": 1,
+    "status": "pending",
+    "attempts": 0,
+    "last_error": None,
+    "article_id": None,
+}
+
+sample_batch_result = [
+    {
+        "url": "http://example.com/article1.html",
+        "channel_id": 1,
+        "status": "accepted",
+        "job_id": 1,
+    },
+    {
+        "url": "http://example.com/article2.html",
+        "channel_id": 1,
+        "status": "duplicate",
+        "job_id": None,
+    },
+    {
+        "url": "http://example.com/article3",
+        "channel_id": 1,
+        "status": "not_html",
+        "job_id": None,
+    },
+    {
+        "url": "http://example.com/article4.html",
+        "channel_id": 9,
+        "status": "channel_not_found",
+        "job_id": None,
+    },
+]
 
 sample_urls = [
     "https://edition.cnn.com/2020/09/21/us/arctic-sea-ice-shrunk-minimum-extent-2020-scn-trnd/index.html",
@@ -1,3 +1,6 @@
+from datetime import datetime
+from enum import Enum
+from typing import Dict, List, Optional
 from pydantic import BaseModel
 from pydantic.networks import HttpUrl
 
@@ -17,19 +20,136 @@ class Channel(ChannelCreate):
         orm_mode = True
 
 
-class ArticleCreate(BaseModel):
+class ChannelSummary(Channel):
+    article_count: int = 0
+    total_words: int = 0
+    avg_words: Optional[float] = None
+    min_words: Optional[int] = None
+    max_words: Optional[int] = None
+    # UTC, when an article was last stored in or moved to the channel
+    last_added_at: Optional[datetime] = None
+
+
+class ExtractionMode(str, Enum):
+    newspaper = "newspaper"
+    streaming = "streaming"
+
+
+class ArticleBase(BaseModel):
     url: HttpUrl
     channel_id: int
 
 
+class ArticleCreate(ArticleBase):
+    extraction_mode: Optional[ExtractionMode] = None
+
+
 class ArticleUpdate(BaseModel):
     id: int
     channel_name: str
 
 
-class Article(ArticleCreate):
+class Article(ArticleBase):
     id: int
     word_count: int
 
     class Config:
         orm_mode = True
+
+
+class ArticleSearchHit(Article):
+    # BM25 score as computed by FTS5, lower is a better match
+    rank: float
+    # matching passage, the matched terms wrapped in <b></b>
+    snippet: str
+
+
+class ArticlesDeleted(BaseModel):
+    deleted: int
+
+
+class ArticlesMove(BaseModel):
+    target_channel_id: int
+    # either the ids of the articles to move or filters selecting them
+    ids: Optional[List[int]] = None
+    channel_id: Optional[int] = None
+    min_words: Optional[int] = None
+    max_words: Optional[int] = None
+
+
+class ArticlesMoved(BaseModel):
+    moved: int
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+class JobStatus(str, Enum):
+    pending = "pending"
+    running = "running"
+    done = "done"
+    failed = "failed"
+
+
+class IngestionJob(BaseModel):
+    id: int
+    url: str
+    channel_id: int
+    status: JobStatus
+    attempts: int
+    last_error: Optional[str] = None
+    article_id: Optional[int] = None
+
+    class Config:
+        orm_mode = True
+
+
+class BatchItemStatus(str, Enum):
+    accepted = "accepted"
+    duplicate = "duplicate"
+    channel_not_found = "channel_not_found"
+    not_html = "not_html"
+
+
+class ArticleBatchItem(BaseModel):
+    url: str
+    channel_id: int
+    status: BatchItemStatus
+    job_id: Optional[int] = None
+
+
+class WordCountBucket(BaseModel):
+    min_words: int
+    max_words: Optional[int] = None
+    count: int
+
+
+class ChannelArticleCount(BaseModel):
+    channel_id: int
+    count: int
+
+
+class ArticleStats(BaseModel):
+    count: int
+    min_words: Optional[int] = None
+    max_words: Optional[int] = None
+    mean_words: Optional[float] = None
+    # approximated from the word count bins, keyed "p50", "p90"...
+    percentiles: Dict[str, float]
+    buckets: List[WordCountBucket]
+    channels: List[ChannelArticleCount]
+
+
+class SQLStatementStats(BaseModel):
+    statement: str
+    calls: int = 0
+    total_ms: float = 0.0
+    mean_ms: float = 0.0
+    max_ms: float = 0.0
+    slow_calls: int = 0
+    last_slow_route: Optional[str] = None
+    # EXPLAIN QUERY PLAN of the last slow execution
+    plan: Optional[List[str]] = None
+    full_scan: bool = False
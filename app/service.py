@@ -1,5 +1,29 @@
-from app.schemas import Message
+from typing import List
+from fastapi import status
+from fastapi.exceptions import HTTPException
+from prometheus_client import generate_latest
+
+from app.database import sql_diagnostics
+from app.metrics import registry
+from app.schemas import Message, SQLStatementStats
+
+
+class DiagnosticsException(HTTPException):
+    pass
 
 
 def get_sample_index() -> Message:
     return Message(message="Nothing to see here :eyes:")
+
+
+def get_metrics() -> bytes:
+    return generate_latest(registry)
+
+
+def get_top_statements(limit: int) -> List[SQLStatementStats]:
+    # dev only, behaves as if the route did not exist unless enabled
+    if not sql_diagnostics.enabled:
+        raise DiagnosticsException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Not Found"
+        )
+    return sql_diagnostics.top_statements(limit)
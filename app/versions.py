@@ -0,0 +1,62 @@
+import hashlib
+from typing import Dict, Optional, Sequence
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.session import Session
+
+from app.db_models import DataVersion
+
+ARTICLES = "articles"
+CHANNELS = "channels"
+
+
+def bump_version(db_session: Session, *tables: str):
+    """Mark `tables` as changed, call it before committing the write."""
+    for table in tables:
+        db_session.execute(
+            insert(DataVersion)
+            .values(table_name=table, version=1)
+            .on_conflict_do_update(
+                index_elements=[DataVersion.table_name],
+                set_={"version": DataVersion.version + 1},
+            )
+        )
+
+
+def get_versions(db_session: Session, tables: Sequence[str]) -> Dict[str, int]:
+    rows = db_session.query(DataVersion.table_name, DataVersion.version).filter(
+        DataVersion.table_name.in_(tables)
+    )
+    versions = {table: 0 for table in tables}
+    versions.update({row.table_name: row.version for row in rows})
+    return versions
+
+
+def list_etag(db_session: Session, tables: Sequence[str], **params) -> str:
+    # read the versions before the data, a write in between can only make the
+    # body newer than its tag, which costs one extra full response at most
+    versions = get_versions(db_session, tables)
+    key = repr((sorted(versions.items()), sorted(params.items())))
+    return f'W/"{hashlib.sha1(key.encode()).hexdigest()}"'
+
+
+async def list_etag_async(
+    db_session: AsyncSession, tables: Sequence[str], **params
+) -> str:
+    return await db_session.run_sync(list_etag, tables, **params)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # weak comparison, as required for If-None-Match
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
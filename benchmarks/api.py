@@ -0,0 +1,339 @@
+"""Latency and throughput of every article and channel route.
+
+Seeds a database through `benchmarks.dataset`, then drives each route of
+`app/articles/router.py` and `app/channels/router.py` in-process through the
+ASGI interface, with `--concurrency` requests in flight at any time. Article
+fetching is stubbed, so the run is fully offline. Results are printed (and
+optionally written) as JSON to compare runs between commits:
+
+    python -m benchmarks.api --articles 100000 --channels 20 --concurrency 32
+    python -m benchmarks.api --articles 1000 --scenarios articles.get channels.list
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional
+from urllib.parse import urlencode
+
+# the app reads its settings on first import, so the benchmark database has to
+# be chosen before anything below imports it
+BENCHMARK_DIRECTORY = tempfile.mkdtemp(prefix="benchmark-api-")
+DATABASE_URL = f"sqlite:///{os.path.join(BENCHMARK_DIRECTORY, 'bench.db')}"
+os.environ["DATABASE_URL"] = DATABASE_URL
+os.environ["PAGE_CACHE_DIR"] = ""
+
+from app.articles import service as ArticlesService  # noqa: E402
+from app.articles.ingestion import ingestion_pool  # noqa: E402
+from app.articles.utils import ArticleContent  # noqa: E402
+from app.database import async_engine  # noqa: E402
+from app.networking import app  # noqa: E402
+from app.pagination import encode_cursor  # noqa: E402
+from benchmarks.dataset import (  # noqa: E402
+    article_url,
+    channel_name,
+    seed_database,
+)
+
+STUB_WORD_COUNT = 500
+# exports of big datasets take far longer than a page, run fewer of them
+EXPORT_REQUEST_SHARE = 20
+
+
+class Request(NamedTuple):
+    method: str
+    path: str
+    body: Optional[object] = None
+
+
+class Scenario(NamedTuple):
+    name: str
+    # builds the n-th request of the scenario
+    build: Callable[[int, random.Random], Request]
+    requests_share: int = 1
+
+
+def scenarios(articles: int, channels: int) -> List[Scenario]:
+    def any_article(rng: random.Random) -> int:
+        return rng.randint(1, articles)
+
+    def any_channel(rng: random.Random) -> int:
+        return rng.randint(1, channels)
+
+    def query(path: str, **params) -> str:
+        return f"{path}?{urlencode(params)}"
+
+    return [
+        Scenario(
+            "articles.list",
+            lambda n, rng: Request(
+                "GET",
+                query(
+                    "/articles/",
+                    min_words=rng.choice((0, 100, 500)),
+                    limit=100,
+                    after=encode_cursor(any_article(rng)),
+                ),
+            ),
+        ),
+        Scenario("articles.stats", lambda n, rng: Request("GET", "/articles/stats")),
+        Scenario(
+            "articles.export",
+            lambda n, rng: Request(
+                "GET",
+                query(
+                    "/articles/export",
+                    format=rng.choice(("ndjson", "csv")),
+                    channel_id=any_channel(rng),
+                ),
+            ),
+            requests_share=EXPORT_REQUEST_SHARE,
+        ),
+        Scenario(
+            "articles.get",
+            lambda n, rng: Request("GET", f"/articles/{any_article(rng)}"),
+        ),
+        Scenario("channels.list", lambda n, rng: Request("GET", "/channels/")),
+        Scenario(
+            "channels.get",
+            lambda n, rng: Request("GET", f"/channels/{any_channel(rng)}"),
+        ),
+        Scenario(
+            "channels.articles",
+            lambda n, rng: Request(
+                "GET", query(f"/channels/{any_channel(rng)}/articles", limit=100)
+            ),
+        ),
+        Scenario(
+            "articles.create",
+            lambda n, rng: Request(
+                "POST",
+                "/articles/",
+                dict(url=article_url(f"new-{n}"), channel_id=any_channel(rng)),
+            ),
+        ),
+        Scenario(
+            "articles.batch",
+            lambda n, rng: Request(
+                "POST",
+                "/articles/batch",
+                [
+                    dict(url=article_url(f"batch-{n}-{i}"), channel_id=any_channel(rng))
+                    for i in range(50)
+                ],
+            ),
+        ),
+        Scenario(
+            "articles.job",
+            lambda n, rng: Request("GET", f"/articles/jobs/{n + 1}"),
+        ),
+        Scenario(
+            "articles.update",
+            lambda n, rng: Request(
+                "PUT",
+                "/articles/",
+                dict(id=any_article(rng), channel_name=channel_name(any_channel(rng))),
+            ),
+        ),
+        Scenario(
+            "articles.delete",
+            # newest first, every request deletes a different article
+            lambda n, rng: Request("DELETE", f"/articles/{articles - n}"),
+        ),
+        Scenario(
+            "channels.create",
+            lambda n, rng: Request("POST", "/channels/", dict(name=f"bench-{n}")),
+        ),
+        Scenario(
+            "channels.update",
+            lambda n, rng: Request(
+                "PUT", "/channels/", dict(id=channels + n + 1, name=f"renamed-{n}")
+            ),
+        ),
+        Scenario(
+            "channels.delete",
+            lambda n, rng: Request("DELETE", f"/channels/{channels + n + 1}"),
+        ),
+    ]
+
+
+def fetch_article_url(article_url, mode=None) -> ArticleContent:
+    return ArticleContent(STUB_WORD_COUNT, "")
+
+
+async def call(request: Request) -> int:
+    """Send one request through the ASGI interface and return its status."""
+    path, _, query_string = request.path.partition("?")
+    body = b"" if request.body is None else json.dumps(request.body).encode()
+    scope = dict(
+        type="http",
+        asgi=dict(version="3.0"),
+        http_version="1.1",
+        method=request.method,
+        scheme="http",
+        path=path,
+        raw_path=path.encode(),
+        query_string=query_string.encode(),
+        root_path="",
+        headers=[
+            (b"host", b"benchmark"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+        client=("127.0.0.1", 0),
+        server=("benchmark", 80),
+    )
+    done = asyncio.Event()
+    sent_body = False
+    status = 0
+
+    async def receive():
+        nonlocal sent_body
+        if not sent_body:
+            sent_body = True
+            return dict(type="http.request", body=body, more_body=False)
+        # streaming responses listen for a disconnect until they are done
+        await done.wait()
+        return dict(type="http.disconnect")
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif not message.get("more_body", False):
+            done.set()
+
+    await app(scope, receive, send)
+    done.set()
+    return status
+
+
+def percentile(latencies: List[float], value: int) -> Optional[float]:
+    if not latencies:
+        return None
+    index = min(len(latencies) - 1, int(value / 100 * len(latencies)))
+    return round(latencies[index] * 1000, 2)
+
+
+async def run_scenario(
+    scenario: Scenario, requests: int, concurrency: int, seed: int
+) -> Dict:
+    rng = random.Random(f"{seed}-{scenario.name}")
+    batch = [scenario.build(n, rng) for n in range(requests)]
+    latencies: List[float] = list()
+    statuses: Dict[int, int] = dict()
+    pending = iter(batch)
+
+    async def worker():
+        for request in pending:
+            started = time.perf_counter()
+            status = await call(request)
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return dict(
+        scenario=scenario.name,
+        requests=len(latencies),
+        errors=sum(count for status, count in statuses.items() if status >= 400),
+        statuses={str(status): count for status, count in sorted(statuses.items())},
+        requests_per_second=round(len(latencies) / elapsed, 1),
+        p50_ms=percentile(latencies, 50),
+        p95_ms=percentile(latencies, 95),
+        p99_ms=percentile(latencies, 99),
+    )
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args) -> Dict:
+    # stubbed where the ingestion workers look it up, nothing leaves the host
+    ArticlesService.fetch_article_url = fetch_article_url
+    loop = asyncio.get_running_loop()
+    results = list()
+    try:
+        for scenario in scenarios(args.articles, args.channels):
+            if args.scenarios and scenario.name not in args.scenarios:
+                continue
+            requests = max(1, args.requests // scenario.requests_share)
+            results.append(
+                await run_scenario(scenario, requests, args.concurrency, args.seed)
+            )
+            # let queued fetches finish so they do not slow the next scenario
+            await loop.run_in_executor(None, ingestion_pool.drain)
+    finally:
+        ingestion_pool.stop()
+        await async_engine.dispose()
+    return dict(
+        meta=dict(
+            commit=git_commit(),
+            articles=args.articles,
+            channels=args.channels,
+            concurrency=args.concurrency,
+            requests=args.requests,
+            seed=args.seed,
+            python=platform.python_version(),
+            sqlite=sqlite3.sqlite_version,
+        ),
+        results=results,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", type=int, default=1000)
+    parser.add_argument("--channels", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--scenarios", nargs="*", help="only run these scenarios")
+    parser.add_argument("--output", help="also write the JSON report here")
+    args = parser.parse_args()
+    if args.requests >= args.articles:
+        sys.exit("--requests must be smaller than --articles, deletes need rows")
+
+    try:
+        seeding_started = time.perf_counter()
+        seed_database(
+            DATABASE_URL,
+            args.articles,
+            channels=args.channels,
+            scratch_channels=args.requests,
+            seed=args.seed,
+        )
+        seeding_seconds = time.perf_counter() - seeding_started
+        report = asyncio.run(run(args))
+    finally:
+        shutil.rmtree(BENCHMARK_DIRECTORY, ignore_errors=True)
+    report["meta"]["seeding_seconds"] = round(seeding_seconds, 2)
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as report_file:
+            report_file.write(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""Load test of the async request path against the previous sync one.
+
+Starts uvicorn on a seeded temporary database twice: once with the API as
+shipped (async routes on an AsyncSession) and once with `sync_app` below,
+which serves the same read endpoints the way they used to be served, sync
+routes on the threadpool with a sync Session. Each run keeps `--clients`
+keep-alive connections busy for `--seconds` and reports throughput and
+latency percentiles.
+
+    python -m benchmarks.async_load --clients 1000 --seconds 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from fastapi import Depends, FastAPI
+from sqlalchemy.orm.session import Session
+
+from app.articles import service as ArticlesService
+from app.channels import service as ChannelsService
+from app.database import get_db_session
+from app.schemas import Article, Channel
+from benchmarks.dataset import seed_database
+
+APPS = {
+    "sync": "benchmarks.async_load:sync_app",
+    "async": "app.networking:app",
+}
+# the sync path ran without a connection pool: on FastAPI 0.68 the teardown of
+# sync yield dependencies also needs a threadpool slot, so threads blocked on
+# pool checkout wait for sessions that can no longer be closed
+MODE_ENV = {
+    "sync": dict(DB_POOL_SIZE="0"),
+    "async": dict(),
+}
+REQUEST_TIMEOUT = 30
+
+sync_app = FastAPI()
+
+
+@sync_app.get("/articles/{article_id}")
+def get_article(article_id: int, db: Session = Depends(get_db_session)) -> Article:
+    return ArticlesService.get_article_by_id(db_session=db, article_id=article_id)
+
+
+@sync_app.get("/articles/")
+def get_articles(
+    min_words: Optional[int] = None, db: Session = Depends(get_db_session)
+) -> List[Article]:
+    return ArticlesService.get_articles(db_session=db, min_words=min_words, limit=20)
+
+
+@sync_app.get("/channels/")
+def get_channels(db: Session = Depends(get_db_session)) -> List[Channel]:
+    return ChannelsService.get_all_channels(db_session=db)
+
+
+def request_paths(articles: int):
+    while True:
+        yield random.choice(
+            (
+                f"/articles/{random.randint(1, articles)}",
+                f"/articles/?min_words={random.randint(0, 1500)}&limit=20",
+                "/channels/",
+            )
+        )
+
+
+async def client(port: int, deadline: float, articles: int, latencies, errors):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    paths = request_paths(articles)
+    try:
+        while time.monotonic() < deadline:
+            started = time.monotonic()
+            writer.write(
+                f"GET {next(paths)} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode()
+            )
+            head = await asyncio.wait_for(
+                reader.readuntil(b"\r\n\r\n"), REQUEST_TIMEOUT
+            )
+            length = 0
+            for line in head.decode("latin-1").split("\r\n"):
+                if line.lower().startswith("content-length:"):
+                    length = int(line.split(":", 1)[1])
+            await reader.readexactly(length)
+            if not head.startswith(b"HTTP/1.1 200"):
+                errors.append(head.split(b"\r\n", 1)[0])
+            latencies.append(time.monotonic() - started)
+    finally:
+        writer.close()
+
+
+async def load(port: int, clients: int, seconds: float, articles: int) -> Dict:
+    latencies: List[float] = list()
+    errors: List[bytes] = list()
+    deadline = time.monotonic() + seconds
+    results = await asyncio.gather(
+        *(client(port, deadline, articles, latencies, errors) for _ in range(clients)),
+        return_exceptions=True,
+    )
+    failed_clients = sum(isinstance(result, Exception) for result in results)
+    latencies.sort()
+
+    def percentile(value: int) -> Optional[float]:
+        if not latencies:
+            return None
+        index = min(len(latencies) - 1, int(value / 100 * len(latencies)))
+        return round(latencies[index] * 1000, 1)
+
+    return dict(
+        requests_per_second=round(len(latencies) / seconds, 1),
+        p50_ms=percentile(50),
+        p99_ms=percentile(99),
+        errors=len(errors),
+        failed_clients=failed_clients,
+    )
+
+
+async def wait_until_ready(port: int, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError(f"uvicorn did not start on port {port}")
+
+
+def run(mode: str, url: str, args) -> Dict:
+    port = args.port
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            APPS[mode],
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+            "--backlog",
+            str(max(2048, args.clients)),
+        ],
+        env=dict(os.environ, DATABASE_URL=url, **MODE_ENV[mode]),
+    )
+    try:
+        asyncio.run(wait_until_ready(port))
+        result = asyncio.run(load(port, args.clients, args.seconds, args.articles))
+    finally:
+        server.terminate()
+        server.wait()
+    return dict(mode=mode, clients=args.clients, **result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--articles", type=int, default=10000)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        seed_database(url, args.articles)
+        for mode in APPS:
+            print(json.dumps(run(mode, url, args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Deterministic datasets for the benchmarks, built on the app's own schema."""
+
+import itertools
+import random
+from typing import List, Union
+
+from app.const import SEARCH_STOPWORDS
+from app.database import Base, create_db_engine
+from app.db_models import Article, ArticleText, Channel
+
+INSERT_BATCH_SIZE = 10000
+VOCABULARY_SIZE = 50000
+
+
+def channel_name(index: int) -> str:
+    return f"channel-{index}"
+
+
+def article_url(index: Union[int, str]) -> str:
+    return f"https://news.example.com/seed/{index}.html"
+
+
+def vocabulary() -> List[str]:
+    """Words by descending frequency, the stopwords are the most frequent."""
+    return sorted(SEARCH_STOPWORDS) + [
+        f"term{rank}" for rank in range(VOCABULARY_SIZE - len(SEARCH_STOPWORDS))
+    ]
+
+
+def seed_database(
+    url: str,
+    articles: int,
+    channels: int = 10,
+    scratch_channels: int = 0,
+    seed: int = 0,
+    text_words: int = 0,
+):
+    """Create the schema at `url` and fill it with generated rows.
+
+    Articles get ids 1..`articles` and are spread round-robin over channels
+    1..`channels`. Empty channels named `scratch-<n>` come after those, so
+    benchmarks can rename and delete them without touching any article.
+    With `text_words`, every article also gets a text of that many words
+    drawn from `vocabulary()` with Zipf frequencies, like natural language.
+    The same `seed` always produces the same rows.
+    """
+    rng = random.Random(seed)
+    words = vocabulary()
+    cumulative_weights = list(
+        itertools.accumulate(1 / rank for rank in range(1, len(words) + 1))
+    )
+    db_engine = create_db_engine(url, profile="performance")
+    # creates the word count triggers as well, so they are timed while seeding
+    Base.metadata.create_all(bind=db_engine)
+    with db_engine.begin() as connection:
+        connection.execute(
+            Channel.__table__.insert(),
+            [dict(name=channel_name(i)) for i in range(1, channels + 1)]
+            + [dict(name=f"scratch-{i}") for i in range(1, scratch_channels + 1)],
+        )
+        for start in range(1, articles + 1, INSERT_BATCH_SIZE):
+            stop = min(start + INSERT_BATCH_SIZE, articles + 1)
+            connection.execute(
+                Article.__table__.insert(),
+                [
+                    dict(
+                        url=article_url(i),
+                        # long tail like real articles, most around 400 words
+                        word_count=int(rng.lognormvariate(6, 0.8)),
+                        channel_id=(i - 1) % channels + 1,
+                    )
+                    for i in range(start, stop)
+                ],
+            )
+            if text_words:
+                connection.execute(
+                    ArticleText.__table__.insert(),
+                    [
+                        dict(
+                            article_id=i,
+                            content=" ".join(
+                                rng.choices(
+                                    words, cum_weights=cumulative_weights, k=text_words
+                                )
+                            ),
+                        )
+                        for i in range(start, stop)
+                    ],
+                )
+    db_engine.dispose()
@@ -0,0 +1,98 @@
+"""Latency of the full-text search at a given corpus size.
+
+Seeds a temporary database with `--articles` texts of `--words` words each,
+drawn with Zipf frequencies from `benchmarks.dataset.vocabulary()`, then runs
+`search_articles` for words of decreasing frequency, word pairs, filters and
+a second page, and prints the median and worst latency of each as JSON:
+
+    python -m benchmarks.search --articles 1000000 --words 200
+"""
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+from typing import Dict, List
+
+from sqlalchemy.orm import sessionmaker
+
+from app.articles.service import search_articles
+from app.database import create_db_engine
+from benchmarks.dataset import seed_database, vocabulary
+
+
+def queries(words: List[str]) -> Dict[str, Dict]:
+    # vocabulary() starts with the stopwords, content words follow by rank
+    content = words[words.index("term0") :]
+    return {
+        "stopword only": dict(text_query="the"),
+        "word rank 1": dict(text_query=content[0]),
+        "word rank 10": dict(text_query=content[9]),
+        "word rank 100": dict(text_query=content[99]),
+        "word rank 1000": dict(text_query=content[999]),
+        "word rank 10000": dict(text_query=content[9999]),
+        "stopword + rank 100": dict(text_query=f"the {content[99]}"),
+        "rank 10 + rank 100": dict(text_query=f"{content[9]} {content[99]}"),
+        "rank 100 + rank 1000": dict(text_query=f"{content[99]} {content[999]}"),
+        "prefix": dict(text_query=f"{content[999][:-1]}*"),
+        "rank 100, channel": dict(text_query=content[99], channel_id=1),
+        "rank 100, min_words": dict(text_query=content[99], min_words=500),
+    }
+
+
+def time_query(db_session, repeat: int, **params) -> Dict:
+    latencies = list()
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = search_articles(db_session, **params)
+        latencies.append(time.perf_counter() - started)
+    result = dict(
+        p50_ms=round(statistics.median(latencies) * 1000, 2),
+        max_ms=round(max(latencies) * 1000, 2),
+        rows=len(rows),
+    )
+    if rows:
+        started = time.perf_counter()
+        search_articles(
+            db_session, after=(rows[-1]["rank"], rows[-1]["id"]), **params
+        )
+        result["next_page_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", type=int, default=100000)
+    parser.add_argument("--words", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        started = time.perf_counter()
+        seed_database(url, args.articles, text_words=args.words)
+        seeding_seconds = time.perf_counter() - started
+        db_engine = create_db_engine(url, profile="performance")
+        db_session = sessionmaker(bind=db_engine)()
+        results = {
+            name: time_query(db_session, args.repeat, **params)
+            for name, params in queries(vocabulary()).items()
+        }
+        db_session.close()
+        db_engine.dispose()
+    print(
+        json.dumps(
+            dict(
+                articles=args.articles,
+                words=args.words,
+                seeding_seconds=round(seeding_seconds, 1),
+                results=results,
+            ),
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Time to query and serialize an article list, per-row models vs fast rows.
+
+The "models" path is what the list endpoints used to do: ORM objects copied
+into `Article` models, which FastAPI then runs through `jsonable_encoder` and
+the stdlib JSON encoder. The "rows" path is the current one: column tuples
+turned into dicts and rendered by `ORJSONResponse`.
+
+    python -m benchmarks.serialization --rows 10000 100000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from sqlalchemy.orm import sessionmaker
+
+from app.articles import service as ArticlesService
+from app.database import create_db_engine
+from app.db_models import Article as DbArticle
+from app.schemas import Article as APIArticle
+from benchmarks.dataset import seed_database
+
+
+def models_path(db_session, limit: int) -> bytes:
+    db_articles = db_session.query(DbArticle).order_by(DbArticle.id).limit(limit)
+    articles = [
+        APIArticle(
+            id=db_article.id,
+            url=db_article.url,
+            channel_id=db_article.channel_id,
+            word_count=db_article.word_count,
+        )
+        for db_article in db_articles
+    ]
+    return JSONResponse(jsonable_encoder(articles)).body
+
+
+def rows_path(db_session, limit: int) -> bytes:
+    rows = ArticlesService.get_article_rows(db_session, limit=limit)
+    return ORJSONResponse(rows).body
+
+
+def best_of(repeat: int, path, db_session, limit: int) -> float:
+    timings = list()
+    for _ in range(repeat):
+        db_session.expunge_all()
+        started = time.perf_counter()
+        path(db_session, limit)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        seed_database(url, max(args.rows))
+        db_engine = create_db_engine(url, profile="performance")
+        with sessionmaker(bind=db_engine)() as db_session:
+            # both paths must produce the same document
+            assert json.loads(models_path(db_session, 100)) == json.loads(
+                rows_path(db_session, 100)
+            )
+            for rows in args.rows:
+                models = best_of(args.repeat, models_path, db_session, rows)
+                fast = best_of(args.repeat, rows_path, db_session, rows)
+                print(
+                    json.dumps(
+                        dict(
+                            rows=rows,
+                            models_seconds=round(models, 4),
+                            rows_seconds=round(fast, 4),
+                            speedup=round(models / fast, 1),
+                        )
+                    )
+                )
+        db_engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Concurrent read/write throughput of the SQLite storage profiles.
+
+Seeds a temporary database with articles, then runs reader and writer
+processes against it for a fixed time, once with SQLite's defaults and no
+connection pool (the previous setup) and once per configured profile.
+
+    python -m benchmarks.sqlite_profile --readers 4 --writers 2 --seconds 5
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from typing import Dict
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.database import create_db_engine
+from app.db_models import Article
+from benchmarks.dataset import seed_database
+
+SETUPS = {
+    "baseline": dict(profile="default", pool_size=0),
+    "performance": dict(profile="performance", pool_size=4),
+}
+
+
+def worker(role: str, index: int, url: str, setup: Dict, seconds: float, results):
+    db_engine = create_db_engine(url, **setup)
+    make_session = sessionmaker(bind=db_engine)
+    operations = errors = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        try:
+            with make_session() as db_session:
+                if role == "reader":
+                    min_words = random.randint(0, 1500)
+                    db_session.query(Article).filter(
+                        Article.word_count >= min_words
+                    ).order_by(Article.id).limit(100).all()
+                else:
+                    db_session.add(
+                        Article(
+                            url=f"https://example.com/{index}/{operations}.html",
+                            word_count=random.randint(1, 2000),
+                            channel_id=random.randint(1, 10),
+                        )
+                    )
+                    db_session.commit()
+            operations += 1
+        except OperationalError:
+            # "database is locked", the failure mode the profile addresses
+            errors += 1
+    db_engine.dispose()
+    results.put((role, operations, errors))
+
+
+def run(name: str, setup: Dict, args) -> Dict:
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        seed_database(url, args.articles)
+        results = multiprocessing.Queue()
+        roles = ["reader"] * args.readers + ["writer"] * args.writers
+        processes = [
+            multiprocessing.Process(
+                target=worker, args=(role, i, url, setup, args.seconds, results)
+            )
+            for i, role in enumerate(roles)
+        ]
+        for process in processes:
+            process.start()
+        totals = dict(reader=[0, 0], writer=[0, 0])
+        for _ in processes:
+            role, operations, errors = results.get()
+            totals[role][0] += operations
+            totals[role][1] += errors
+        for process in processes:
+            process.join()
+    return dict(
+        setup=name,
+        **setup,
+        reads_per_second=round(totals["reader"][0] / args.seconds, 1),
+        writes_per_second=round(totals["writer"][0] / args.seconds, 1),
+        lock_errors=totals["reader"][1] + totals["writer"][1],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--articles", type=int, default=10000)
+    args = parser.parse_args()
+    for name, setup in SETUPS.items():
+        print(json.dumps(run(name, setup, args)))
+
+
+if __name__ == "__main__":
+    main()
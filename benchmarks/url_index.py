@@ -0,0 +1,101 @@
+"""Size and lookup time of the duplicate URL index, before and after hashing.
+
+Fills a temporary database with `--articles` URLs shaped like the CNN
+articles the app stores (about 100 bytes each), then measures the unique
+index on the URL hash against the unique index on the raw URL that it
+replaced, recreated for the comparison, with SQLite's `dbstat` table:
+
+    python -m benchmarks.url_index --articles 1000000
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from typing import Dict
+
+from app.articles.urls import url_hash
+from benchmarks.dataset import INSERT_BATCH_SIZE, seed_database
+
+OLD_INDEX_SQL = "CREATE UNIQUE INDEX ix_articles_url ON articles (url)"
+INDEX_SIZE_SQL = "SELECT SUM(pgsize) FROM dbstat WHERE name = ?"
+SECTIONS = ("us", "world", "politics", "business", "health", "tech", "sport")
+
+
+def cnn_url(rng: random.Random, index: int) -> str:
+    slug = "-".join(
+        rng.choice(("brian", "storm", "vote", "ice", "market", "cup"))
+        for _ in range(rng.randint(4, 9))
+    )
+    return (
+        f"https://edition.cnn.com/{2015 + index % 7}/{index % 12 + 1:02}/"
+        f"{index % 28 + 1:02}/{rng.choice(SECTIONS)}/{slug}-{index}/index.html"
+    )
+
+
+def lookup_us(connection, sql: str, parameters, repeat: int) -> float:
+    started = time.perf_counter()
+    for value in parameters[:repeat]:
+        connection.execute(sql, (value,)).fetchone()
+    return round((time.perf_counter() - started) / repeat * 1e6, 2)
+
+
+def index_report(connection, name: str, sql: str, parameters) -> Dict:
+    return dict(
+        bytes=connection.execute(INDEX_SIZE_SQL, (name,)).fetchone()[0],
+        lookup_us=lookup_us(connection, sql, parameters, repeat=10000),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", type=int, default=100000)
+    args = parser.parse_args()
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.db")
+        seed_database(f"sqlite:///{path}", 0)
+        connection = sqlite3.connect(path)
+        urls = [cnn_url(rng, i) for i in range(args.articles)]
+        for start in range(0, args.articles, INSERT_BATCH_SIZE):
+            connection.executemany(
+                "INSERT INTO articles (url, url_hash, word_count, channel_id) "
+                "VALUES (?, ?, 400, 1)",
+                [
+                    (url, url_hash(url))
+                    for url in urls[start : start + INSERT_BATCH_SIZE]
+                ],
+            )
+        connection.commit()
+        started = time.perf_counter()
+        connection.execute(OLD_INDEX_SQL)
+        old_index_seconds = time.perf_counter() - started
+        probes = rng.sample(urls, min(len(urls), 10000))
+        report = dict(
+            articles=args.articles,
+            mean_url_bytes=round(sum(map(len, urls)) / len(urls), 1),
+            url_index=dict(
+                index_report(
+                    connection,
+                    "ix_articles_url",
+                    "SELECT 1 FROM articles WHERE url = ?",
+                    probes,
+                ),
+                build_seconds=round(old_index_seconds, 2),
+            ),
+            url_hash_index=index_report(
+                connection,
+                "ix_articles_url_hash",
+                "SELECT 1 FROM articles WHERE url_hash = ?",
+                [url_hash(url) for url in probes],
+            ),
+        )
+        connection.close()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
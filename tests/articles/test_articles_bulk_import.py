@@ -0,0 +1,110 @@
+import json
+
+from app.articles import service as ArticlesService
+from app.articles.bulk_import import bulk_import, import_format_of, read_rows
+from app.channels import service as ChannelsService
+from app.db_models import Article as DbArticle
+from app.schemas import ExportFormat
+from app.versions import ARTICLES, CHANNELS, get_versions
+from tests.conftest import test_session, close_session
+
+CSV_ROWS = """url,word_count,channel_name
+http://example.com/0.html,40,DummyChannel
+http://example.com/1.html,120,DummyChannel
+http://example.com/2.html,700,NewChannel
+http://example.com/1.html,120,DummyChannel
+http://example.com/stored.html,10,DummyChannel
+http://example.com/page,10,DummyChannel
+http://example.com/3.html,many,DummyChannel
+http://example.com/4.htm,510,NewChannel
+"""
+
+
+def test_bulk_import_csv(clean_state, tmp_path):
+    import_path = tmp_path / "articles.csv"
+    import_path.write_text(CSV_ROWS)
+    assert import_format_of(str(import_path)) == ExportFormat.csv
+    db_session = test_session()
+    ChannelsService.create_channel(
+        db_session=db_session, new_channel_name="DummyChannel"
+    )
+    db_session.add(
+        DbArticle(url="http://example.com/stored.html", channel_id=1, word_count=10)
+    )
+    db_session.commit()
+    versions = get_versions(db_session, (ARTICLES, CHANNELS))
+    progress = list()
+
+    counts = bulk_import(
+        db_session,
+        read_rows(str(import_path), ExportFormat.csv),
+        create_channels=True,
+        chunk_size=1,
+        commit_every=2,
+        progress=lambda counts: progress.append(counts.inserted),
+    )
+    assert (counts.read, counts.inserted, counts.existing, counts.invalid) == (
+        8,
+        4,
+        2,
+        2,
+    )
+    assert counts.channels_created == 1
+    assert progress == [2, 4, 4]
+    assert get_versions(db_session, (ARTICLES, CHANNELS)) == {
+        table: version + 2 for table, version in versions.items()
+    }
+    assert [
+        (article.url, article.word_count, article.channel_id)
+        for article in ArticlesService.get_articles(db_session=db_session)
+    ] == [
+        ("http://example.com/stored.html", 10, 1),
+        ("http://example.com/0.html", 40, 1),
+        ("http://example.com/1.html", 120, 1),
+        ("http://example.com/2.html", 700, 2),
+        ("http://example.com/4.htm", 510, 2),
+    ]
+
+    # the word count bins and channel summaries follow the import and the
+    # triggers are back in place
+    stats = ArticlesService.get_article_stats(db_session=db_session)
+    assert [bucket.count for bucket in stats.buckets] == [2, 1, 2]
+    assert [(c.channel_id, c.count) for c in stats.channels] == [(1, 3), (2, 2)]
+    summary = ChannelsService.get_channel_summary(db_session=db_session, channel_id=2)
+    assert (summary.article_count, summary.min_words, summary.max_words) == (
+        2,
+        510,
+        700,
+    )
+    assert summary.last_added_at is not None
+    db_session.add(
+        DbArticle(url="http://example.com/5.html", channel_id=2, word_count=5)
+    )
+    db_session.commit()
+    stats = ArticlesService.get_article_stats(db_session=db_session)
+    assert [bucket.count for bucket in stats.buckets] == [3, 1, 2]
+    summary = ChannelsService.get_channel_summary(db_session=db_session, channel_id=2)
+    assert (summary.article_count, summary.min_words) == (3, 5)
+    close_session(db_session)
+
+
+def test_bulk_import_reads_exports(tmp_path):
+    db_session = test_session()
+    export_path = tmp_path / "articles.jsonl"
+    export_path.write_text("".join(ArticlesService.export_articles(db_session)))
+    exported = ArticlesService.get_articles(db_session=db_session)
+
+    rows = list(read_rows(str(export_path), import_format_of(str(export_path))))
+    # everything is stored already, new URLs on unknown channels are invalid
+    counts = bulk_import(db_session, iter(rows))
+    assert (counts.inserted, counts.existing, counts.invalid) == (0, len(exported), 0)
+    new_rows = [
+        dict(url="http://example.com/new.html", word_count=1, channel_id=2),
+        dict(url="http://example.com/lost.html", word_count=1, channel_id=9),
+        dict(url="http://example.com/named.html", word_count=1, channel_name="Nope"),
+    ]
+    export_path.write_text("\n".join(json.dumps(row) for row in new_rows))
+    counts = bulk_import(db_session, read_rows(str(export_path), ExportFormat.ndjson))
+    assert (counts.inserted, counts.existing, counts.invalid) == (1, 0, 2)
+    assert len(ArticlesService.get_articles(db_session=db_session)) == len(exported) + 1
+    close_session(db_session)
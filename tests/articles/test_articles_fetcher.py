@@ -0,0 +1,47 @@
+import time
+import pytest
+
+from app.articles.fetcher import FetchException, HostLimiter, PooledFetcher
+
+
+def make_fetcher(**overrides) -> PooledFetcher:
+    settings = dict(
+        pool_hosts=4,
+        per_host_concurrency=2,
+        per_host_rate=0,
+        per_host_burst=1,
+        connect_timeout=1,
+        read_timeout=1,
+        user_agent="tests",
+    )
+    settings.update(overrides)
+    return PooledFetcher(**settings)
+
+
+def test_fetch_reuses_connection(page_server):
+    page_server.pages["/a.html"] = "<p>hello</p>"
+    fetcher = make_fetcher()
+    for _ in range(3):
+        assert fetcher.get(page_server.url("/a.html")) == b"<p>hello</p>"
+    assert len(page_server.requests) == 3
+    assert len({request[1] for request in page_server.requests}) == 1
+
+
+def test_fetch_error_status(page_server):
+    with pytest.raises(FetchException):
+        make_fetcher().get(page_server.url("/missing.html"))
+
+
+def test_fetch_invalid_url():
+    with pytest.raises(FetchException):
+        make_fetcher().get("random.com.url")
+
+
+def test_host_rate_limit():
+    limiter = HostLimiter(concurrency=1, rate=20, burst=1)
+    start = time.monotonic()
+    for _ in range(3):
+        with limiter.slot():
+            pass
+    # the first request uses the burst token, the next two wait 1/20s each
+    assert time.monotonic() - start >= 0.09
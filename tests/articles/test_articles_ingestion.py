@@ -0,0 +1,163 @@
+from datetime import datetime, timedelta
+from http import HTTPStatus
+from fastapi.testclient import TestClient
+
+from app import metrics
+from app.articles import service as ArticlesService
+from app.articles.ingestion import ingestion_pool
+from app.articles.utils import ArticleContent
+from app.db_models import IngestionJob as DbIngestionJob
+from tests.conftest import test_session, close_session
+
+
+def test_ingest_article(app_client: TestClient, clean_state, monkeypatch):
+    monkeypatch.setattr(
+        ArticlesService,
+        "fetch_article_url",
+        lambda article_url, mode=None: ArticleContent(42, ""),
+    )
+    app_client.post("/channels/", json={"name": "DummyChannel"})
+    response = app_client.post(
+        "/articles/", json={"url": "http://example.com/a.html", "channel_id": 1}
+    )
+    assert response.status_code == HTTPStatus.OK
+    job = response.json()
+    assert job["status"] == "pending"
+    assert ingestion_pool.drain()
+    response = app_client.get(f"/articles/jobs/{job['id']}")
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        "id": job["id"],
+        "url": "http://example.com/a.html",
+        "channel_id": 1,
+        "status": "done",
+        "attempts": 1,
+        "last_error": None,
+        "article_id": 1,
+    }
+    assert app_client.get("/articles/1").json()["word_count"] == 42
+
+
+def test_ingest_article_retries_then_fails(app_client: TestClient, monkeypatch):
+    def failing_fetch(article_url: str, mode=None) -> ArticleContent:
+        raise ArticlesService.ThirdPartyArticleException()
+
+    monkeypatch.setattr(ArticlesService, "fetch_article_url", failing_fetch)
+    monkeypatch.setattr(ingestion_pool, "backoff_seconds", 0)
+
+    def jobs_total(result: str) -> float:
+        return (
+            metrics.registry.get_sample_value(
+                "ingestion_jobs_total", {"result": result}
+            )
+            or 0
+        )
+
+    retried, failed = jobs_total("retried"), jobs_total("failed")
+    response = app_client.post(
+        "/articles/", json={"url": "http://example.com/b.html", "channel_id": 1}
+    )
+    assert ingestion_pool.drain()
+    assert jobs_total("retried") == retried + ingestion_pool.max_attempts - 1
+    assert jobs_total("failed") == failed + 1
+    job = app_client.get(f"/articles/jobs/{response.json()['id']}").json()
+    assert job["status"] == "failed"
+    assert job["attempts"] == ingestion_pool.max_attempts
+    assert job["last_error"] == "Invalid article URL"
+    assert job["article_id"] is None
+
+
+def test_ingest_duplicate_article_fails(app_client: TestClient, monkeypatch):
+    monkeypatch.setattr(
+        ArticlesService,
+        "fetch_article_url",
+        lambda article_url, mode=None: ArticleContent(1, ""),
+    )
+    db_session = test_session()
+    db_job = DbIngestionJob(url="http://example.com/a.html", channel_id=1)
+    db_session.add(db_job)
+    db_session.commit()
+    ingestion_pool.wake()
+    assert ingestion_pool.drain()
+    db_session.refresh(db_job)
+    assert db_job.status == "failed"
+    assert db_job.attempts == 1
+    close_session(db_session)
+
+
+def test_expired_lease_is_reclaimed(monkeypatch):
+    monkeypatch.setattr(
+        ArticlesService,
+        "fetch_article_url",
+        lambda article_url, mode=None: ArticleContent(7, ""),
+    )
+    db_session = test_session()
+    db_job = DbIngestionJob(
+        url="http://example.com/c.html",
+        channel_id=1,
+        status="running",
+        attempts=1,
+        locked_until=datetime.utcnow() - timedelta(seconds=1),
+    )
+    db_session.add(db_job)
+    db_session.commit()
+    ingestion_pool.wake()
+    assert ingestion_pool.drain()
+    db_session.refresh(db_job)
+    assert db_job.status == "done"
+    assert db_job.attempts == 2
+    close_session(db_session)
+
+
+def test_get_invalid_job(app_client: TestClient):
+    response = app_client.get("/articles/jobs/999")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json() == {"detail": "Job not found"}
+
+
+def test_ingest_batch(app_client: TestClient, clean_state, monkeypatch):
+    monkeypatch.setattr(
+        ArticlesService,
+        "fetch_article_url",
+        lambda article_url, mode=None: ArticleContent(5, ""),
+    )
+    app_client.post("/channels/", json={"name": "DummyChannel"})
+    app_client.post(
+        "/articles/", json={"url": "http://example.com/a.html", "channel_id": 1}
+    )
+    assert ingestion_pool.drain()
+    response = app_client.post(
+        "/articles/batch",
+        json=[
+            {"url": "http://example.com/a.html", "channel_id": 1},
+            {"url": "http://example.com/b.html", "channel_id": 1},
+            {"url": "https://www.example.com/b.html?utm_source=x", "channel_id": 1},
+            {"url": "http://example.com/c", "channel_id": 1},
+            {"url": "http://example.com/d.htm", "channel_id": 9},
+            {"url": "http://example.com/e.htm", "channel_id": 1},
+        ],
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert [item["status"] for item in response.json()] == [
+        "duplicate",
+        "accepted",
+        "duplicate",
+        "not_html",
+        "channel_not_found",
+        "accepted",
+    ]
+    assert [item["job_id"] for item in response.json()] == [
+        None,
+        2,
+        None,
+        None,
+        None,
+        3,
+    ]
+    assert ingestion_pool.drain()
+    assert len(app_client.get("/articles/").json()) == 3
+
+
+def test_ingest_batch_size(app_client: TestClient):
+    response = app_client.post("/articles/batch", json=[])
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
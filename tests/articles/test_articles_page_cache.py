@@ -0,0 +1,85 @@
+from app.articles.fetcher import PooledFetcher
+from app.articles.page_cache import PageCache, normalize_url
+
+
+def make_fetcher(page_cache: PageCache) -> PooledFetcher:
+    return PooledFetcher(
+        pool_hosts=4,
+        per_host_concurrency=2,
+        per_host_rate=0,
+        per_host_burst=1,
+        connect_timeout=1,
+        read_timeout=1,
+        user_agent="tests",
+        page_cache=page_cache,
+    )
+
+
+def test_normalize_url():
+    assert (
+        normalize_url("HTTP://Example.COM:80/a.html?x=1#comments")
+        == "http://example.com/a.html?x=1"
+    )
+    assert normalize_url("https://example.com") == "https://example.com/"
+    assert PageCache.key("https://example.com:443/") == PageCache.key(
+        "https://EXAMPLE.com"
+    )
+
+
+def test_revalidated_page_is_served_from_cache(page_server, tmp_path):
+    page_server.pages["/a.html"] = "<p>first version</p>"
+    page_server.etags["/a.html"] = '"v1"'
+    page_cache = PageCache(directory=str(tmp_path), max_bytes=1024 * 1024)
+    fetcher = make_fetcher(page_cache)
+
+    assert fetcher.get(page_server.url("/a.html")) == b"<p>first version</p>"
+    assert fetcher.get(page_server.url("/a.html#top")) == b"<p>first version</p>"
+    assert [request[2] for request in page_server.requests] == [None, '"v1"']
+    assert page_cache.stats() == dict(hits=1, misses=1, stores=1, evictions=0)
+
+    page_server.pages["/a.html"] = "<p>second version</p>"
+    page_server.etags["/a.html"] = '"v2"'
+    assert fetcher.get(page_server.url("/a.html")) == b"<p>second version</p>"
+    assert fetcher.get(page_server.url("/a.html")) == b"<p>second version</p>"
+    assert page_cache.stats() == dict(hits=2, misses=2, stores=2, evictions=0)
+
+
+def test_pages_without_validators_are_not_stored(page_server, tmp_path):
+    page_server.pages["/a.html"] = "<p>no etag</p>"
+    page_cache = PageCache(directory=str(tmp_path), max_bytes=1024 * 1024)
+    fetcher = make_fetcher(page_cache)
+    fetcher.get(page_server.url("/a.html"))
+    fetcher.get(page_server.url("/a.html"))
+    assert page_cache.stats() == dict(hits=0, misses=2, stores=0, evictions=0)
+
+
+def test_least_recently_used_pages_are_evicted(tmp_path):
+    page_cache = PageCache(directory=str(tmp_path), max_bytes=40)
+    for name in ("a", "b", "c"):
+        body = [f"<p>{name * 40}</p>".encode()]
+        url = f"http://example.com/{name}.html"
+        list(
+            page_cache.store(url, body, etag=name, last_modified=None, encoding="utf-8")
+        )
+    assert page_cache.lookup("http://example.com/a.html") is None
+    assert page_cache.lookup("http://example.com/c.html").etag == "c"
+    assert page_cache.lookup("http://example.com/b.html").etag == "b"
+    assert page_cache.evictions == 1
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_interrupted_download_is_not_stored(tmp_path):
+    def broken_body():
+        yield b"<p>partial"
+        raise IOError("connection reset")
+
+    page_cache = PageCache(directory=str(tmp_path), max_bytes=1024)
+    chunks = page_cache.store(
+        "http://example.com/a.html", broken_body(), "x", None, "utf-8"
+    )
+    try:
+        list(chunks)
+    except IOError:
+        pass
+    assert page_cache.lookup("http://example.com/a.html") is None
+    assert not list(tmp_path.glob("*.tmp"))
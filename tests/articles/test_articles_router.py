@@ -1,7 +1,12 @@
+import csv
+import json
 from http import HTTPStatus
 from fastapi.testclient import TestClient
 
+from app.articles.ingestion import ingestion_pool
+from app.db_models import Article as DbArticle, ArticleText as DbArticleText
 from app.samples import sample_urls
+from tests.conftest import test_session, close_session
 
 
 def test_create_article(app_client: TestClient, clean_state):
@@ -12,7 +17,8 @@ def test_create_article(app_client: TestClient, clean_state):
     json_data = {"url": sample_urls[0], "channel_id": "1"}
     response = app_client.post("/articles/", json=json_data)
     assert response.status_code == HTTPStatus.OK
-    assert response.json() == "Article will be fetched and created in the background"
+    assert response.json()["status"] == "pending"
+    assert ingestion_pool.drain()
     article = app_client.get("/articles/1")
     assert article.json() == {
         "id": 1,
@@ -25,6 +31,7 @@ def test_create_article(app_client: TestClient, clean_state):
 def test_get_articles(app_client: TestClient):
     json_data = {"url": sample_urls[1], "channel_id": 1}
     app_client.post("/articles/", json=json_data)
+    assert ingestion_pool.drain()
     response = app_client.get("/articles/")
     assert len(response.json()) == 2
     assert response.json() == [
@@ -59,3 +66,153 @@ def test_delete_article(app_client: TestClient):
     app_client.delete("/articles/2")
     response = app_client.get("/articles/2")
     assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_delete_articles(app_client: TestClient, clean_state):
+    app_client.post("/channels/", json={"name": "DummyChannel"})
+    db_session = test_session()
+    for i in range(4):
+        db_session.add(
+            DbArticle(
+                url=f"http://example.com/{i}.html", channel_id=1, word_count=100 * i
+            )
+        )
+    db_session.commit()
+    close_session(db_session)
+    response = app_client.delete("/articles/", params={"min_words": 150})
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {"deleted": 2}
+    assert [article["id"] for article in app_client.get("/articles/").json()] == [
+        1,
+        2,
+    ]
+    response = app_client.delete("/articles/")
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_move_articles(app_client: TestClient, clean_state):
+    app_client.post("/channels/", json={"name": "DummyChannel"})
+    app_client.post("/channels/", json={"name": "DummyChannel2"})
+    db_session = test_session()
+    for i in range(4):
+        db_session.add(
+            DbArticle(
+                url=f"http://example.com/{i}.html", channel_id=1, word_count=100 * i
+            )
+        )
+    db_session.commit()
+    close_session(db_session)
+    response = app_client.post(
+        "/articles/move", json={"target_channel_id": 2, "ids": [1, 2]}
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {"moved": 2}
+    response = app_client.post(
+        "/articles/move",
+        json={"target_channel_id": 2, "channel_id": 1, "min_words": 300},
+    )
+    assert response.json() == {"moved": 1}
+    articles = app_client.get("/channels/2/articles").json()
+    assert [article["id"] for article in articles] == [1, 2, 4]
+    response = app_client.post("/articles/move", json={"target_channel_id": 5})
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_export_articles(app_client: TestClient, clean_state):
+    app_client.post("/channels/", json={"name": "DummyChannel"})
+    app_client.post("/channels/", json={"name": "DummyChannel2"})
+    db_session = test_session()
+    for i in range(4):
+        db_session.add(
+            DbArticle(
+                url=f"http://example.com/{i}.html",
+                channel_id=1 + i % 2,
+                word_count=100 * i,
+            )
+        )
+    db_session.commit()
+    close_session(db_session)
+
+    response = app_client.get("/articles/export")
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == [1, 2, 3, 4]
+    assert rows[0] == {
+        "id": 1,
+        "url": "http://example.com/0.html",
+        "channel_id": 1,
+        "word_count": 0,
+    }
+
+    response = app_client.get(
+        "/articles/export", params={"format": "csv", "channel_id": 2, "min_words": 200}
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["content-type"].startswith("text/csv")
+    assert list(csv.reader(response.text.splitlines())) == [
+        ["id", "url", "channel_id", "word_count"],
+        ["4", "http://example.com/3.html", "2", "300"],
+    ]
+
+
+def test_article_list_etags(app_client: TestClient):
+    etag = app_client.get("/articles/").headers["ETag"]
+    assert app_client.get("/articles/", params={"limit": 5}).headers["ETag"] != etag
+    response = app_client.get("/articles/", headers={"If-None-Match": etag})
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    app_client.delete("/articles/1")
+    response = app_client.get("/articles/", headers={"If-None-Match": etag})
+    assert response.status_code == HTTPStatus.OK
+    assert [article["id"] for article in response.json()] == [2, 3, 4]
+
+
+def test_article_stats(app_client: TestClient):
+    response = app_client.get("/articles/stats")
+    assert response.status_code == HTTPStatus.OK
+    stats = response.json()
+    assert stats["count"] == 3
+    assert stats["buckets"] == [
+        {"min_words": 0, "max_words": 100, "count": 1},
+        {"min_words": 101, "max_words": 500, "count": 2},
+        {"min_words": 501, "max_words": None, "count": 0},
+    ]
+    assert stats["channels"] == [
+        {"channel_id": 1, "count": 1},
+        {"channel_id": 2, "count": 2},
+    ]
+
+
+def test_search_articles(app_client: TestClient, clean_state):
+    app_client.post("/channels/", json={"name": "DummyChannel"})
+    db_session = test_session()
+    texts = ("Storm hits the coast", "Storm warnings, storm damage", "Sunny day")
+    for i, text in enumerate(texts):
+        db_session.add(
+            DbArticle(url=f"http://example.com/{i}.html", channel_id=1, word_count=3)
+        )
+        db_session.add(DbArticleText(article_id=i + 1, content=text))
+    db_session.commit()
+    close_session(db_session)
+
+    response = app_client.get("/articles/search", params={"q": "storm", "limit": 1})
+    assert response.status_code == HTTPStatus.OK
+    [hit] = response.json()
+    assert hit["id"] == 2
+    assert hit["snippet"] == "<b>Storm</b> warnings, <b>storm</b> damage"
+    response = app_client.get(
+        "/articles/search",
+        params={"q": "storm", "limit": 1, "after": response.headers["X-Next-Cursor"]},
+    )
+    assert [hit["id"] for hit in response.json()] == [1]
+    assert "X-Next-Cursor" in response.headers
+    response = app_client.get(
+        "/articles/search",
+        params={"q": "storm", "after": response.headers["X-Next-Cursor"]},
+    )
+    assert response.json() == []
+    assert "X-Next-Cursor" not in response.headers
+
+    for params in ({"q": "?!"}, {"q": "storm", "after": "not-a-cursor"}, {}):
+        response = app_client.get("/articles/search", params=params)
+        assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
@@ -1,10 +1,15 @@
+import asyncio
 import pytest
 from http import HTTPStatus
 
 from app.articles import service as ArticlesService
+from app.articles.utils import ArticleContent
 from app.channels import service as ChannelsService
+from app.database import AsyncSessionLocal
+from app.db_models import Article as DbArticle
 from app.samples import sample_urls
-from app.schemas import Article
+from app.schemas import Article, ArticleSearchHit
+from app.versions import ARTICLES, get_versions
 from tests.conftest import test_session, close_session
 
 
@@ -158,3 +163,345 @@ def test_validate_article_already_exists():
     assert exc.value.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
     assert exc.value.detail == "Article URL already exists"
     close_session(db_session)
+
+
+def test_validate_article_variant_already_exists(clean_state):
+    db_session = test_session()
+    ChannelsService.create_channel(
+        db_session=db_session, new_channel_name="DummyChannel"
+    )
+    db_session.add(DbArticle(url=sample_urls[1], channel_id=1, word_count=10))
+    db_session.commit()
+    with pytest.raises(ArticlesService.ArticleException) as exc:
+        ArticlesService.validate_article_and_channel(
+            db_session=db_session,
+            article_url=sample_urls[1].replace("https://", "http://www.")
+            + "?utm_source=twitter#comments",
+            channel_id=1,
+        )
+    assert exc.value.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert exc.value.detail == "Article URL already exists"
+    close_session(db_session)
+
+
+def test_get_articles_paginated(clean_state):
+    db_session = test_session()
+    channel = ChannelsService.create_channel(
+        db_session=db_session, new_channel_name="DummyChannel"
+    )
+    for i in range(5):
+        db_session.add(
+            DbArticle(
+                url=f"http://example.com/{i}.html",
+                channel_id=channel.id,
+                word_count=100 * i,
+            )
+        )
+    db_session.commit()
+    first_page = ArticlesService.get_articles(db_session=db_session, limit=2)
+    assert [article.id for article in first_page] == [1, 2]
+    second_page = ArticlesService.get_articles(
+        db_session=db_session, limit=2, after=first_page[-1].id
+    )
+    assert [article.id for article in second_page] == [3, 4]
+    filtered_page = ArticlesService.get_articles(
+        db_session=db_session, min_words=100, limit=2, after=3
+    )
+    assert [article.id for article in filtered_page] == [4, 5]
+    close_session(db_session)
+
+
+def test_get_article_rows():
+    db_session = test_session()
+    rows = ArticlesService.get_article_rows(db_session=db_session, after=3)
+    assert rows == [
+        dict(id=4, url="http://example.com/3.html", channel_id=1, word_count=300),
+        dict(id=5, url="http://example.com/4.html", channel_id=1, word_count=400),
+    ]
+    assert [Article(**row) for row in rows] == ArticlesService.get_articles(
+        db_session=db_session, after=3
+    )
+    close_session(db_session)
+
+
+def test_export_articles_batches(monkeypatch):
+    monkeypatch.setattr(ArticlesService, "EXPORT_BATCH_SIZE", 2)
+    db_session = test_session()
+    chunks = list(ArticlesService.export_articles(db_session=db_session))
+    assert [len(chunk.splitlines()) for chunk in chunks] == [2, 2, 1]
+    close_session(db_session)
+
+
+def test_export_articles_async_matches_sync(monkeypatch):
+    monkeypatch.setattr(ArticlesService, "EXPORT_BATCH_SIZE", 2)
+    db_session = test_session()
+    expected = "".join(ArticlesService.export_articles(db_session=db_session))
+    close_session(db_session)
+
+    async def export():
+        async with AsyncSessionLocal() as async_session:
+            return [
+                chunk
+                async for chunk in ArticlesService.export_articles_async(
+                    db_session=async_session
+                )
+            ]
+
+    chunks = asyncio.run(export())
+    assert [len(chunk.splitlines()) for chunk in chunks] == [2, 2, 1]
+    assert "".join(chunks) == expected
+
+
+def test_cached_article_follows_updates():
+    db_session = test_session()
+    ChannelsService.create_channel(
+        db_session=db_session, new_channel_name="DummyChannel2"
+    )
+    assert ArticlesService.get_article_by_id(db_session, article_id=1).channel_id == 1
+    hits = ArticlesService.article_cache.hits
+    assert ArticlesService.get_article_by_id(db_session, article_id=1).channel_id == 1
+    assert ArticlesService.article_cache.hits == hits + 1
+    ArticlesService.update_article(
+        db_session=db_session, article_id=1, new_channel_name="DummyChannel2"
+    )
+    assert ArticlesService.get_article_by_id(db_session, article_id=1).channel_id == 2
+    ArticlesService.delete_article_by_id(db_session=db_session, article_id=1)
+    with pytest.raises(ArticlesService.ArticleException):
+        ArticlesService.get_article_by_id(db_session, article_id=1)
+    close_session(db_session)
+
+
+def test_article_stats(clean_state):
+    db_session = test_session()
+    stats = ArticlesService.get_article_stats(db_session=db_session)
+    assert stats.count == 0
+    assert stats.percentiles == {}
+    assert [bucket.count for bucket in stats.buckets] == [0, 0, 0]
+
+    for name in ("DummyChannel", "DummyChannel2"):
+        ChannelsService.create_channel(db_session=db_session, new_channel_name=name)
+    word_counts = [0, 40, 100, 101, 250, 499, 500, 501, 1200, 30000]
+    for i, word_count in enumerate(word_counts):
+        db_session.add(
+            DbArticle(
+                url=f"http://example.com/{i}.html",
+                channel_id=1 + i % 2,
+                word_count=word_count,
+            )
+        )
+    db_session.commit()
+    stats = ArticlesService.get_article_stats(db_session=db_session)
+    assert stats.count == 10
+    assert (stats.min_words, stats.max_words) == (0, 30000)
+    assert stats.mean_words == sum(word_counts) / 10
+    assert [bucket.count for bucket in stats.buckets] == [3, 4, 3]
+    assert [(c.channel_id, c.count) for c in stats.channels] == [(1, 5), (2, 5)]
+    assert 250 <= stats.percentiles["p50"] <= 499
+    assert stats.percentiles["p99"] <= 30000
+
+    ArticlesService.update_article(
+        db_session=db_session, article_id=1, new_channel_name="DummyChannel2"
+    )
+    ArticlesService.delete_article_by_id(db_session=db_session, article_id=10)
+    stats = ArticlesService.get_article_stats(db_session=db_session)
+    assert stats.count == 9
+    assert stats.max_words == 1200
+    assert [bucket.count for bucket in stats.buckets] == [3, 4, 2]
+    assert [(c.channel_id, c.count) for c in stats.channels] == [(1, 4), (2, 5)]
+    close_session(db_session)
+
+
+def test_article_write_path_round_trips(sql_statements):
+    db_session = test_session()
+    ArticlesService.validate_article_and_channel(
+        db_session=db_session, article_url="http://example.com/new.html", channel_id=1
+    )
+    assert len(sql_statements) == 1
+    assert " IS " not in sql_statements[0]
+
+    sql_statements.clear()
+    article = ArticlesService.update_article(
+        db_session=db_session, article_id=2, new_channel_name="DummyChannel2"
+    )
+    assert article.channel_id == 2
+    # the UPDATE itself and the data version bump
+    assert len(sql_statements) == 2
+
+    sql_statements.clear()
+    with pytest.raises(ArticlesService.ArticleException):
+        ArticlesService.update_article(
+            db_session=db_session, article_id=2, new_channel_name="CoolChannel"
+        )
+    assert len(sql_statements) == 1
+    close_session(db_session)
+
+
+def test_delete_articles(clean_state):
+    db_session = test_session()
+    for name in ("DummyChannel", "DummyChannel2"):
+        ChannelsService.create_channel(db_session=db_session, new_channel_name=name)
+    for i in range(10):
+        db_session.add(
+            DbArticle(
+                url=f"http://example.com/{i}.html",
+                channel_id=1 + i % 2,
+                word_count=100 * i,
+            )
+        )
+    db_session.commit()
+    # cached before the delete, must not be served after it
+    ArticlesService.get_article_by_id(db_session=db_session, article_id=5)
+    version = get_versions(db_session, (ARTICLES,))[ARTICLES]
+
+    deleted = ArticlesService.delete_articles(
+        db_session=db_session, channel_id=1, min_words=300, chunk_size=2
+    )
+    assert deleted == 3
+    # one transaction per chunk
+    assert get_versions(db_session, (ARTICLES,))[ARTICLES] == version + 2
+    rows = ArticlesService.get_article_rows(db_session=db_session)
+    assert [row["id"] for row in rows] == [1, 2, 3, 4, 6, 8, 10]
+    with pytest.raises(ArticlesService.ArticleException):
+        ArticlesService.get_article_by_id(db_session=db_session, article_id=5)
+    stats = ArticlesService.get_article_stats(db_session=db_session)
+    assert stats.count == 7
+    assert [(c.channel_id, c.count) for c in stats.channels] == [(1, 2), (2, 5)]
+
+    assert ArticlesService.delete_articles(db_session=db_session, max_words=50) == 1
+    assert ArticlesService.delete_articles(db_session=db_session, channel_id=9) == 0
+    with pytest.raises(ArticlesService.ArticleException) as exc:
+        ArticlesService.delete_articles(db_session=db_session)
+    assert exc.value.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert exc.value.detail == "At least one filter is required"
+    close_session(db_session)
+
+
+def test_move_articles(clean_state, sql_statements):
+    db_session = test_session()
+    for name in ("DummyChannel", "DummyChannel2", "DummyChannel3"):
+        ChannelsService.create_channel(db_session=db_session, new_channel_name=name)
+    for i in range(10):
+        db_session.add(
+            DbArticle(
+                url=f"http://example.com/{i}.html",
+                channel_id=1 + i % 2,
+                word_count=100 * i,
+            )
+        )
+    db_session.commit()
+    ArticlesService.get_article_by_id(db_session=db_session, article_id=3)
+    version = get_versions(db_session, (ARTICLES,))[ARTICLES]
+
+    sql_statements.clear()
+    moved = ArticlesService.move_articles(
+        db_session=db_session,
+        target_channel_id=3,
+        channel_id=1,
+        max_words=600,
+        chunk_size=2,
+    )
+    assert moved == 4
+    # version bump, channel check, then a bound and an UPDATE per chunk, the
+    # third chunk finds no bound and moves whatever is left
+    assert len(sql_statements) == 2 + 3 * 2
+    assert get_versions(db_session, (ARTICLES,))[ARTICLES] == version + 1
+    rows = ArticlesService.get_article_rows(db_session=db_session)
+    assert [row["id"] for row in rows if row["channel_id"] == 3] == [1, 3, 5, 7]
+    assert ArticlesService.get_article_by_id(db_session, article_id=3).channel_id == 3
+
+    moved = ArticlesService.move_articles(
+        db_session=db_session, target_channel_id=2, article_ids=[1, 2, 3, 99]
+    )
+    # article 2 is in channel 2 already
+    assert moved == 2
+    stats = ArticlesService.get_article_stats(db_session=db_session)
+    assert [(c.channel_id, c.count) for c in stats.channels] == [
+        (1, 1),
+        (2, 7),
+        (3, 2),
+    ]
+
+    with pytest.raises(ArticlesService.ArticleException) as exc:
+        ArticlesService.move_articles(
+            db_session=db_session, target_channel_id=9, article_ids=[1]
+        )
+    assert exc.value.status_code == HTTPStatus.NOT_FOUND
+    with pytest.raises(ArticlesService.ArticleException) as exc:
+        ArticlesService.move_articles(db_session=db_session, target_channel_id=2)
+    assert exc.value.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    close_session(db_session)
+
+
+SEARCH_TEXTS = (
+    "The council approved new cycling lanes after a long debate.",
+    "Cycling races in the mountains, cyclists climb for hours.",
+    "The election results: the council majority changed.",
+    "Cycling, cycling and more cycling: the city loves bikes.",
+)
+
+
+def test_search_articles(clean_state, monkeypatch):
+    texts = iter(SEARCH_TEXTS)
+
+    def fetch_article_url(article_url: str, mode=None) -> ArticleContent:
+        text = next(texts)
+        return ArticleContent(len(text.split()), text)
+
+    monkeypatch.setattr(ArticlesService, "fetch_article_url", fetch_article_url)
+    db_session = test_session()
+    for name in ("DummyChannel", "DummyChannel2"):
+        ChannelsService.create_channel(db_session=db_session, new_channel_name=name)
+    for i in range(len(SEARCH_TEXTS)):
+        ArticlesService.create_article(
+            db_session=db_session,
+            article_url=f"http://example.com/{'a' * i}.html",
+            channel_id=1 + i % 2,
+        )
+
+    hits = ArticlesService.search_articles(db_session, "cycling")
+    # porter stemming matches "cyclists", the densest text ranks first
+    assert [hit["id"] for hit in hits] == [4, 2, 1]
+    assert hits[0]["rank"] <= hits[1]["rank"] <= hits[2]["rank"]
+    assert "<b>cycling</b>" in hits[0]["snippet"].lower()
+    assert set(hits[0]) == set(ArticleSearchHit.__fields__)
+
+    council_hits = ArticlesService.search_articles(db_session, "the council")
+    assert sorted(hit["id"] for hit in council_hits) == [1, 3]
+    assert ArticlesService.search_articles(db_session, "council bikes") == []
+    assert [
+        hit["id"] for hit in ArticlesService.search_articles(db_session, "elect*")
+    ] == [3]
+    assert [
+        hit["id"]
+        for hit in ArticlesService.search_articles(db_session, "cycling", channel_id=2)
+    ] == [4, 2]
+    assert [
+        hit["id"]
+        for hit in ArticlesService.search_articles(db_session, "cycling", min_words=10)
+    ] == [1]
+    # keyset pages over (rank, id) add up to the full result
+    first_page = ArticlesService.search_articles(db_session, "cycling", limit=2)
+    second_page = ArticlesService.search_articles(
+        db_session,
+        "cycling",
+        limit=2,
+        after=(first_page[-1]["rank"], first_page[-1]["id"]),
+    )
+    assert first_page + second_page == hits
+
+    ArticlesService.delete_article_by_id(db_session=db_session, article_id=4)
+    assert [
+        hit["id"] for hit in ArticlesService.search_articles(db_session, "cycling")
+    ] == [2, 1]
+    close_session(db_session)
+
+
+def test_search_query():
+    assert ArticlesService.search_query('The "council" NEAR bike*') == (
+        '"council" "near" "bike"*'
+    )
+    # only stopwords are kept when nothing else is left
+    assert ArticlesService.search_query("to be or not") == '"to" "be" "or" "not"'
+    with pytest.raises(ArticlesService.ArticleException) as exc:
+        ArticlesService.search_query("?!")
+    assert exc.value.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
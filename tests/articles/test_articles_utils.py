@@ -0,0 +1,68 @@
+from pathlib import Path
+import pytest
+
+from app.articles.utils import (
+    count_words_newspaper,
+    count_words_streaming,
+    extract_streaming,
+    fetch_article_url,
+    strip_tags,
+)
+from app.schemas import ExtractionMode
+
+FIXTURES = sorted((Path(__file__).parent / "fixtures").glob("*.html"))
+
+
+def chunked(data: bytes, size: int):
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+def test_strip_tags():
+    assert strip_tags("<p>Hello <b>world</b></p>") == "Hello world"
+
+
+@pytest.mark.parametrize("fixture", FIXTURES, ids=lambda path: path.stem)
+def test_streaming_matches_newspaper(fixture: Path):
+    html = fixture.read_bytes()
+    newspaper_count = count_words_newspaper("http://example.com/a.html", html)
+    streaming_count = count_words_streaming(chunked(html, 1024))
+    assert abs(streaming_count - newspaper_count) <= 0.1 * newspaper_count
+
+
+@pytest.mark.parametrize("fixture", FIXTURES, ids=lambda path: path.stem)
+def test_streaming_ignores_chunk_boundaries(fixture: Path):
+    html = fixture.read_bytes()
+    expected = count_words_streaming([html])
+    for size in (1, 7, 64):
+        assert count_words_streaming(chunked(html, size)) == expected
+
+
+def test_streaming_counts_paragraph_words_only():
+    html = (
+        "<nav><p>Skip me</p></nav><p>One two <a href='#'>thr</a>ee.</p>"
+        "<p>Four<br>five</p><div>not counted</div><script>var x = 1;</script>"
+    )
+    assert count_words_streaming([html.encode()]) == 5
+
+
+def test_streaming_keeps_counted_text():
+    html = (
+        "<nav><p>Skip me</p></nav><p>One two <a href='#'>thr</a>ee.</p>"
+        "<p>Four<br>five</p><div>not counted</div>"
+    )
+    content = extract_streaming(chunked(html.encode(), 3))
+    assert content.word_count == 5
+    assert content.text == "One two three.\nFour\nfive"
+
+
+def test_streaming_multibyte_split():
+    html = "<p>café naïve</p>".encode()
+    assert count_words_streaming(chunked(html, 1)) == 2
+
+
+@pytest.mark.parametrize("mode", list(ExtractionMode))
+def test_fetch_article_url(page_server, mode: ExtractionMode):
+    page_server.pages["/story.html"] = FIXTURES[0].read_text()
+    content = fetch_article_url(page_server.url("/story.html"), mode=mode)
+    assert content.word_count > 200
+    assert len(content.text.split()) >= content.word_count
@@ -1,7 +1,11 @@
 from http import HTTPStatus
 from fastapi.testclient import TestClient
 
+from app.articles.ingestion import ingestion_pool
+from app.db_models import Article as DbArticle
+from app.pagination import NEXT_CURSOR_HEADER
 from app.samples import sample_urls
+from tests.conftest import test_session, close_session
 
 
 def test_create_channel(app_client: TestClient, clean_state):
@@ -25,7 +29,16 @@ def test_get_all_channels(app_client: TestClient):
 def test_get_channel_id(app_client: TestClient):
     response = app_client.get("/channels/1")
     assert response.status_code == HTTPStatus.OK
-    assert response.json() == {"id": 1, "name": "DummyChannel"}
+    assert response.json() == {
+        "id": 1,
+        "name": "DummyChannel",
+        "article_count": 0,
+        "total_words": 0,
+        "avg_words": None,
+        "min_words": None,
+        "max_words": None,
+        "last_added_at": None,
+    }
 
 
 def test_update_channel(app_client: TestClient):
@@ -46,6 +59,7 @@ def test_get_channel_articles(app_client: TestClient):
     app_client.post("/articles/", json=json_data)
     json_data = {"url": sample_urls[1], "channel_id": 1}
     app_client.post("/articles/", json=json_data)
+    assert ingestion_pool.drain()
     response = app_client.get("/channels/1/articles/")
     assert response.status_code == HTTPStatus.OK
     assert response.json() == [
@@ -62,3 +76,79 @@ def test_get_channel_articles(app_client: TestClient):
             "word_count": 139,
         },
     ]
+
+
+def test_get_channel_articles_paginated(app_client: TestClient, clean_state):
+    app_client.post("/channels/", json={"name": "DummyChannel"})
+    app_client.post("/channels/", json={"name": "DummyChannel2"})
+    db_session = test_session()
+    for i in range(3):
+        for channel_id in (1, 2):
+            db_session.add(
+                DbArticle(
+                    url=f"http://example.com/{channel_id}/{i}.html",
+                    channel_id=channel_id,
+                    word_count=10,
+                )
+            )
+    db_session.commit()
+    close_session(db_session)
+    response = app_client.get("/channels/1/articles/", params={"limit": 2})
+    assert response.status_code == HTTPStatus.OK
+    assert [article["id"] for article in response.json()] == [1, 3]
+    cursor = response.headers[NEXT_CURSOR_HEADER]
+    response = app_client.get(
+        "/channels/1/articles/", params={"limit": 2, "after": cursor}
+    )
+    assert [article["id"] for article in response.json()] == [5]
+    assert NEXT_CURSOR_HEADER not in response.headers
+    response = app_client.get("/channels/1/articles/", params={"after": "???"})
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_list_etags(app_client: TestClient, clean_state):
+    app_client.post("/channels/", json={"name": "DummyChannel"})
+    response = app_client.get("/channels/")
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"')
+    response = app_client.get("/channels/", headers={"If-None-Match": etag})
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+    articles_etag = app_client.get("/channels/1/articles/").headers["ETag"]
+    app_client.put("/channels/", json={"id": 1, "name": "Renamed"})
+    response = app_client.get("/channels/", headers={"If-None-Match": etag})
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == [{"id": 1, "name": "Renamed"}]
+    assert response.headers["ETag"] != etag
+    response = app_client.get(
+        "/channels/1/articles/", headers={"If-None-Match": articles_etag}
+    )
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_get_channel_summaries(app_client: TestClient, clean_state):
+    app_client.post("/channels/", json={"name": "DummyChannel"})
+    app_client.post("/channels/", json={"name": "DummyChannel2"})
+    db_session = test_session()
+    for i in range(3):
+        db_session.add(
+            DbArticle(
+                url=f"http://example.com/{i}.html", channel_id=1, word_count=100 * i
+            )
+        )
+    db_session.commit()
+    close_session(db_session)
+    response = app_client.get("/channels/summary")
+    assert response.status_code == HTTPStatus.OK
+    summaries = response.json()
+    assert [summary["article_count"] for summary in summaries] == [3, 0]
+    assert summaries[0]["avg_words"] == 100.0
+    assert summaries[0]["last_added_at"]
+    assert summaries[1]["last_added_at"] is None
+    response = app_client.get("/channels/1")
+    assert response.json() == summaries[0]
+    etag = app_client.get("/channels/summary").headers["ETag"]
+    response = app_client.get("/channels/summary", headers={"If-None-Match": etag})
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
@@ -3,6 +3,7 @@ from http import HTTPStatus
 
 from app.articles import service as ArticlesService
 from app.channels import service as ChannelsService
+from app.db_models import Article as DbArticle
 from app.samples import sample_urls
 from app.schemas import Article, Channel
 from tests.conftest import test_session, close_session
@@ -42,6 +43,10 @@ def test_get_all_channels():
         Channel(id=1, name="DummyChannel"),
         Channel(id=2, name="DummyChannel2"),
     ]
+    assert ChannelsService.get_channel_rows(db_session=db_session) == [
+        dict(id=1, name="DummyChannel"),
+        dict(id=2, name="DummyChannel2"),
+    ]
     close_session(db_session)
 
 
@@ -131,3 +136,94 @@ def test_get_invalid_channel_articles():
     assert exc.value.status_code == HTTPStatus.NOT_FOUND
     assert exc.value.detail == "Channel not found"
     close_session(db_session)
+
+
+def test_delete_channel_with_articles(clean_state):
+    db_session = test_session()
+    for name in ("DummyChannel", "DummyChannel2", "DummyChannel3"):
+        ChannelsService.create_channel(db_session=db_session, new_channel_name=name)
+    for i in range(9):
+        db_session.add(
+            DbArticle(
+                url=f"http://example.com/{i}.html",
+                channel_id=1 + i % 3,
+                word_count=10,
+            )
+        )
+    db_session.commit()
+
+    ChannelsService.delete_channel_by_id(
+        db_session=db_session, channel_id=1, move_to=2, chunk_size=2
+    )
+    articles = ChannelsService.get_channel_articles(db_session=db_session, channel_id=2)
+    assert [article.id for article in articles] == [1, 2, 4, 5, 7, 8]
+    ChannelsService.delete_channel_by_id(
+        db_session=db_session, channel_id=2, chunk_size=4
+    )
+    rows = ArticlesService.get_article_rows(db_session=db_session)
+    assert [row["id"] for row in rows] == [3, 6, 9]
+    assert [channel.id for channel in ChannelsService.get_all_channels(db_session)] == [
+        3
+    ]
+    stats = ArticlesService.get_article_stats(db_session=db_session)
+    assert [(c.channel_id, c.count) for c in stats.channels] == [(3, 3)]
+    close_session(db_session)
+
+
+def test_delete_channel_invalid_move_to():
+    db_session = test_session()
+    with pytest.raises(ChannelsService.ChannelException) as exc:
+        ChannelsService.delete_channel_by_id(
+            db_session=db_session, channel_id=3, move_to=3
+        )
+    assert exc.value.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    with pytest.raises(ChannelsService.ChannelException) as exc:
+        ChannelsService.delete_channel_by_id(
+            db_session=db_session, channel_id=3, move_to=1
+        )
+    assert exc.value.status_code == HTTPStatus.NOT_FOUND
+    assert exc.value.detail == "Target channel not found"
+    assert ChannelsService.get_channel_by_id(db_session=db_session, channel_id=3)
+    close_session(db_session)
+
+
+def test_channel_summaries(clean_state, sql_statements):
+    db_session = test_session()
+    for name in ("DummyChannel", "DummyChannel2", "DummyChannel3"):
+        ChannelsService.create_channel(db_session=db_session, new_channel_name=name)
+    for i, word_count in enumerate([40, 100, 300, 700, 1000]):
+        db_session.add(
+            DbArticle(
+                url=f"http://example.com/{i}.html",
+                channel_id=1 + i % 2,
+                word_count=word_count,
+            )
+        )
+    db_session.commit()
+    summary = ChannelsService.get_channel_summary(db_session=db_session, channel_id=1)
+    assert (summary.article_count, summary.total_words) == (3, 1340)
+    assert (summary.min_words, summary.max_words) == (40, 1000)
+    assert summary.avg_words == 1340 / 3
+    assert summary.last_added_at is not None
+
+    # the shortest article moves and the longest is deleted, the bounds of
+    # both channels follow
+    ArticlesService.update_article(
+        db_session=db_session, article_id=1, new_channel_name="DummyChannel2"
+    )
+    ArticlesService.delete_article_by_id(db_session=db_session, article_id=5)
+    sql_statements.clear()
+    summaries = ChannelsService.get_channel_summary_rows(db_session=db_session)
+    assert len(sql_statements) == 1
+    assert "articles" not in sql_statements[0].split("FROM")[1]
+    assert [
+        (row["id"], row["article_count"], row["min_words"], row["max_words"])
+        for row in summaries
+    ] == [(1, 1, 300, 300), (2, 3, 40, 700), (3, 0, None, None)]
+
+    ChannelsService.delete_channel_by_id(db_session=db_session, channel_id=2)
+    summaries = ChannelsService.get_channel_summary_rows(db_session=db_session)
+    assert [row["id"] for row in summaries] == [1, 3]
+    with pytest.raises(ChannelsService.ChannelException):
+        ChannelsService.get_channel_summary(db_session=db_session, channel_id=2)
+    close_session(db_session)
@@ -1,6 +1,12 @@
+import threading
 import pytest
+from sqlalchemy import event
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from fastapi.testclient import TestClient
 
+from app.articles.service import article_cache
+from app.channels.service import channel_cache
 from app.database import Base, engine, SessionLocal, Session
 from app.networking import app
 
@@ -15,6 +21,70 @@ def app_client() -> TestClient:
 def clean_state():
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    article_cache.clear()
+    channel_cache.clear()
+
+
+@pytest.fixture
+def sql_statements():
+    # every statement sent to the database while the test runs
+    statements = list()
+
+    def record(connection, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    # keep-alive, so tests can check that client connections are reused
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.requests.append(
+            (self.path, self.client_address[1], self.headers.get("If-None-Match"))
+        )
+        page = self.server.pages.get(self.path)
+        if page is None:
+            self.send_response(HTTPStatus.NOT_FOUND)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        etag = self.server.etags.get(self.path)
+        if etag and self.headers.get("If-None-Match") == etag:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = page.encode()
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def page_server() -> ThreadingHTTPServer:
+    # local stand-in for news sites, serves `pages` by path
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+    server.pages = dict()
+    server.etags = dict()
+    server.requests = list()
+    server.url = lambda path: f"http://127.0.0.1:{server.server_port}{path}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
 
 
 # These are created to be called by pytest only
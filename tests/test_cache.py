@@ -0,0 +1,40 @@
+import time
+
+from app.cache import LRUCache
+
+
+def test_cache_hit_and_miss():
+    cache = LRUCache(max_size=2, ttl_seconds=60)
+    assert cache.get(1) is None
+    cache.set(1, "one")
+    assert cache.get(1) == "one"
+    assert cache.stats() == dict(size=1, hits=1, misses=1, hit_ratio=0.5)
+
+
+def test_cache_evicts_least_recently_used():
+    cache = LRUCache(max_size=2, ttl_seconds=60)
+    cache.set(1, "one")
+    cache.set(2, "two")
+    cache.get(1)
+    cache.set(3, "three")
+    assert cache.get(2) is None
+    assert cache.get(1) == "one"
+    assert cache.get(3) == "three"
+
+
+def test_cache_expires_entries():
+    cache = LRUCache(max_size=2, ttl_seconds=0.01)
+    cache.set(1, "one")
+    time.sleep(0.02)
+    assert cache.get(1) is None
+    assert cache.stats()["size"] == 0
+
+
+def test_cache_invalidate_and_disable():
+    cache = LRUCache(max_size=2, ttl_seconds=60)
+    cache.set(1, "one")
+    cache.invalidate(1)
+    assert cache.get(1) is None
+    disabled = LRUCache(max_size=0, ttl_seconds=60)
+    disabled.set(1, "one")
+    assert disabled.get(1) is None
@@ -1,5 +1,68 @@
-from app.database import get_db_session
+import asyncio
+import pytest
+from sqlalchemy.pool import NullPool, QueuePool
+
+from app.database import (
+    async_url,
+    create_async_db_engine,
+    create_db_engine,
+    get_db_session,
+    sqlite_pragmas,
+)
 
 
 def test_get_db_session(clean_state):
     assert get_db_session()
+
+
+def test_performance_profile_pragmas(tmp_path):
+    db_engine = create_db_engine(
+        f"sqlite:///{tmp_path / 'profile.db'}", profile="performance", pool_size=2
+    )
+    with db_engine.connect() as connection:
+        pragma = lambda name: connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+        assert pragma("journal_mode") == "wal"
+        assert pragma("synchronous") == 1
+        assert pragma("cache_size") == -65536
+        assert pragma("temp_store") == 2
+        assert pragma("busy_timeout") == 5000
+        assert pragma("foreign_keys") == 1
+    assert isinstance(db_engine.pool, QueuePool)
+    assert db_engine.pool.size() == 2
+
+
+def test_default_profile_overrides(tmp_path):
+    db_engine = create_db_engine(
+        f"sqlite:///{tmp_path / 'default.db'}",
+        pragma_overrides=dict(busy_timeout="1234"),
+    )
+    with db_engine.connect() as connection:
+        pragma = lambda name: connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+        assert pragma("journal_mode") == "delete"
+        assert pragma("busy_timeout") == 1234
+        assert pragma("foreign_keys") == 1
+    assert isinstance(db_engine.pool, NullPool)
+
+
+def test_sqlite_pragmas_unknown_profile():
+    with pytest.raises(KeyError):
+        sqlite_pragmas("turbo")
+
+
+def test_async_url():
+    assert async_url("sqlite:///./sql_app.db") == "sqlite+aiosqlite:///./sql_app.db"
+
+
+def test_async_engine_profile(tmp_path):
+    async def read_pragmas():
+        db_engine = create_async_db_engine(
+            f"sqlite:///{tmp_path / 'async.db'}", profile="performance", pool_size=2
+        )
+        async with db_engine.connect() as connection:
+            journal_mode = await connection.exec_driver_sql("PRAGMA journal_mode")
+            foreign_keys = await connection.exec_driver_sql("PRAGMA foreign_keys")
+            pragmas = journal_mode.scalar(), foreign_keys.scalar()
+        await db_engine.dispose()
+        return pragmas
+
+    assert asyncio.run(read_pragmas()) == ("wal", 1)
@@ -0,0 +1,71 @@
+import logging
+import pytest
+from sqlalchemy import text
+
+from app.database import create_db_engine, sql_diagnostics
+from app.diagnostics import full_scan
+from app.metrics import RequestSQL, current_request_sql
+
+
+@pytest.fixture
+def diagnostics(monkeypatch):
+    monkeypatch.setattr(sql_diagnostics, "enabled", True)
+    monkeypatch.setattr(sql_diagnostics, "slow_query_seconds", 0)
+    sql_diagnostics.clear()
+    yield sql_diagnostics
+    sql_diagnostics.clear()
+
+
+def test_full_scan():
+    assert full_scan(["SCAN articles"])
+    assert full_scan(["SCAN articles USING INDEX ix_articles_word_count"])
+    assert not full_scan(["SEARCH articles USING INTEGER PRIMARY KEY (rowid=?)"])
+    assert not full_scan(["SCAN CONSTANT ROW"])
+
+
+def test_slow_statement_logged_with_plan(tmp_path, diagnostics, caplog):
+    db_engine = create_db_engine(f"sqlite:///{tmp_path / 'diagnostics.db'}")
+    with db_engine.begin() as connection:
+        connection.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, n INT)"))
+        token = current_request_sql.set(RequestSQL("GET", "/items/"))
+        try:
+            with caplog.at_level(logging.WARNING, logger="app.diagnostics"):
+                for _ in range(2):
+                    connection.execute(
+                        text("SELECT id FROM items WHERE n > :n"), dict(n=3)
+                    )
+        finally:
+            current_request_sql.reset(token)
+
+    statement = "SELECT id FROM items WHERE n > ?"
+    messages = [
+        record.getMessage() for record in caplog.records if statement in record.message
+    ]
+    assert len(messages) == 2
+    assert "full table scan" in messages[0]
+    assert "on GET /items/" in messages[0]
+    assert "parameters=(3,)" in messages[0]
+
+    top = {stats.statement: stats for stats in diagnostics.top_statements(limit=10)}
+    stats = top[statement]
+    assert stats.calls == stats.slow_calls == 2
+    assert stats.plan == ["SCAN items"]
+    assert stats.full_scan
+    assert stats.last_slow_route == "GET /items/"
+    assert stats.mean_ms == stats.total_ms / 2
+    db_engine.dispose()
+
+
+def test_top_statements_ordered_and_limited(tmp_path, diagnostics, monkeypatch):
+    monkeypatch.setattr(sql_diagnostics, "slow_query_seconds", 60)
+    db_engine = create_db_engine(f"sqlite:///{tmp_path / 'diagnostics.db'}")
+    with db_engine.connect() as connection:
+        for _ in range(50):
+            connection.execute(text("SELECT 1"))
+        connection.execute(text("SELECT 2"))
+    top = diagnostics.top_statements(limit=1)
+    assert len(top) == 1
+    assert top[0].statement == "SELECT 1"
+    # fast statements are counted but never explained
+    assert top[0].plan is None
+    db_engine.dispose()
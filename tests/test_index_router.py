@@ -1,8 +1,58 @@
 from http import HTTPStatus
 from fastapi.testclient import TestClient
 
+from app.database import sql_diagnostics
+
 
 def test_index(app_client: TestClient):
     response = app_client.get("/")
     assert response.status_code == HTTPStatus.OK
     assert response.json() == {"message": "Nothing to see here :eyes:"}
+
+
+def test_metrics(app_client: TestClient):
+    app_client.get("/channels/")
+    app_client.get("/channels/123456")
+    response = app_client.get("/metrics")
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["content-type"].startswith("text/plain")
+    samples = {
+        line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1])
+        for line in response.text.splitlines()
+        if line and not line.startswith("#")
+    }
+    assert (
+        samples['http_requests_total{method="GET",route="/channels/",status="200"}']
+        >= 1
+    )
+    # labelled with the route template, not the requested path
+    assert (
+        samples[
+            'http_requests_total{method="GET",route="/channels/{channel_id}",'
+            'status="404"}'
+        ]
+        >= 1
+    )
+    assert (
+        samples['http_request_sql_statements_sum{method="GET",route="/channels/"}'] >= 1
+    )
+    assert samples["sql_statements_total"] >= 1
+    assert samples["ingestion_queue_depth"] >= 0
+    assert samples['http_requests_in_progress{method="GET",route="/metrics"}'] == 1
+
+
+def test_debug_sql_disabled(app_client: TestClient, monkeypatch):
+    monkeypatch.setattr(sql_diagnostics, "enabled", False)
+    assert app_client.get("/debug/sql").status_code == HTTPStatus.NOT_FOUND
+
+
+def test_debug_sql(app_client: TestClient, monkeypatch):
+    monkeypatch.setattr(sql_diagnostics, "enabled", True)
+    sql_diagnostics.clear()
+    app_client.get("/channels/")
+    response = app_client.get("/debug/sql", params={"limit": 5})
+    assert response.status_code == HTTPStatus.OK
+    statements = [stats["statement"] for stats in response.json()]
+    assert 0 < len(statements) <= 5
+    assert any("FROM channels" in statement for statement in statements)
+    sql_diagnostics.clear()
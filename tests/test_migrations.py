@@ -0,0 +1,71 @@
+import sqlite3
+
+from app.articles.urls import url_hash
+from app.database import create_db_engine
+from app.migrations import MIGRATIONS, migrate
+
+# the tables as created before URL hashes existed
+OLD_SCHEMA = """
+CREATE TABLE channels (id INTEGER PRIMARY KEY, name VARCHAR UNIQUE);
+CREATE TABLE articles (
+    id INTEGER PRIMARY KEY, url VARCHAR, word_count INTEGER, channel_id INTEGER
+);
+CREATE UNIQUE INDEX ix_articles_url ON articles (url);
+CREATE TABLE ingestion_jobs (
+    id INTEGER PRIMARY KEY, url VARCHAR NOT NULL, channel_id INTEGER
+);
+CREATE INDEX ix_ingestion_jobs_url ON ingestion_jobs (url);
+"""
+
+
+def indexes(connection, table):
+    return {row[1]: row[2] for row in connection.execute(f"PRAGMA index_list({table})")}
+
+
+def test_migrate_adds_url_hashes(tmp_path):
+    path = tmp_path / "old.db"
+    connection = sqlite3.connect(path)
+    connection.executescript(OLD_SCHEMA)
+    connection.executemany(
+        "INSERT INTO articles (url, word_count, channel_id) VALUES (?, 10, 1)",
+        [
+            ("http://example.com/a.html",),
+            ("http://example.com/b.html",),
+            ("https://www.example.com/a.html?utm_source=x",),
+        ],
+    )
+    connection.execute(
+        "INSERT INTO ingestion_jobs (url, channel_id) "
+        "VALUES ('http://example.com/a.html', 1)"
+    )
+    connection.commit()
+
+    db_engine = create_db_engine(f"sqlite:///{path}")
+    migrate(db_engine)
+
+    rows = connection.execute("SELECT url, url_hash FROM articles ORDER BY id")
+    assert list(rows) == [
+        ("http://example.com/a.html", url_hash("http://example.com/a.html")),
+        ("http://example.com/b.html", url_hash("http://example.com/b.html")),
+        # the later duplicate keeps its row but not the unique hash
+        ("https://www.example.com/a.html?utm_source=x", None),
+    ]
+    assert connection.execute("SELECT url_hash FROM ingestion_jobs").fetchone() == (
+        url_hash("http://example.com/a.html"),
+    )
+    assert indexes(connection, "articles") == {
+        "ix_articles_url_hash": 1,
+        "ix_articles_channel_word_count": 0,
+    }
+    assert indexes(connection, "ingestion_jobs") == {"ix_ingestion_jobs_url_hash": 0}
+    assert connection.execute("PRAGMA user_version").fetchone() == (len(MIGRATIONS),)
+
+    # applied steps are not repeated
+    connection.execute("UPDATE articles SET url_hash = NULL WHERE id = 2")
+    connection.commit()
+    migrate(db_engine)
+    assert connection.execute(
+        "SELECT url_hash FROM articles WHERE id = 2"
+    ).fetchone() == (None,)
+    connection.close()
+    db_engine.dispose()
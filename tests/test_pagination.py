@@ -0,0 +1,32 @@
+import pytest
+from http import HTTPStatus
+
+from app.pagination import CursorException, decode_cursor, encode_cursor, next_cursor
+from app.schemas import Article
+
+
+def test_cursor_roundtrip():
+    assert decode_cursor(encode_cursor(42)) == 42
+    assert decode_cursor(None) is None
+
+
+def test_invalid_cursor():
+    with pytest.raises(CursorException) as exc:
+        decode_cursor("not a cursor!")
+    assert exc.value.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert exc.value.detail == "Invalid cursor"
+
+
+def test_next_cursor():
+    articles = [
+        Article(id=1, url="http://example.com/a.html", channel_id=1, word_count=1),
+        Article(id=7, url="http://example.com/b.html", channel_id=1, word_count=1),
+    ]
+    assert decode_cursor(next_cursor(articles, 2)) == 7
+    assert next_cursor(articles, 3) is None
+    assert next_cursor(articles, None) is None
+
+
+def test_next_cursor_rows():
+    rows = [dict(id=3, url="http://example.com/a.html", channel_id=1, word_count=1)]
+    assert decode_cursor(next_cursor(rows, 1)) == 3
@@ -0,0 +1,24 @@
+from app.versions import ARTICLES, CHANNELS, bump_version, etag_matches, get_versions
+from tests.conftest import test_session, close_session
+
+
+def test_bump_version(clean_state):
+    db_session = test_session()
+    assert get_versions(db_session, (ARTICLES, CHANNELS)) == {ARTICLES: 0, CHANNELS: 0}
+    bump_version(db_session, ARTICLES)
+    bump_version(db_session, ARTICLES, CHANNELS)
+    db_session.commit()
+    assert get_versions(db_session, (ARTICLES, CHANNELS)) == {ARTICLES: 2, CHANNELS: 1}
+    bump_version(db_session, CHANNELS)
+    db_session.rollback()
+    assert get_versions(db_session, (CHANNELS,)) == {CHANNELS: 1}
+    close_session(db_session)
+
+
+def test_etag_matches():
+    assert etag_matches('W/"abc"', 'W/"abc"')
+    assert etag_matches('"abc"', 'W/"abc"')
+    assert etag_matches('"xyz", W/"abc"', 'W/"abc"')
+    assert etag_matches("*", 'W/"abc"')
+    assert not etag_matches(None, 'W/"abc"')
+    assert not etag_matches('W/"abd"', 'W/"abc"')